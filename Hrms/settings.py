@@ -50,21 +50,27 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Straight after SecurityMiddleware, so static files skip the rest of the stack
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    # Outside everything below, so their queries and time are included
+    'employees.middleware.RequestMetricsMiddleware',
+    # Outside the session, CSRF and messages middleware, so it sees the cookies they set
+    # and never lets a shared cache store a response that carries one
+    'employees.middleware.CachePolicyMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'employees.middleware.NoCacheMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
 ]
 
 ROOT_URLCONF = 'Hrms.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates that also times rendering for RequestMetricsMiddleware
+        'BACKEND': 'employees.request_metrics.TimedDjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -167,8 +173,104 @@ LOGOUT_REDIRECT_URL = 'login'
 # Hrms/settings.py
 
 # Can go right after STATIC_ROOT
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Hashed file names let WhiteNoise serve them with "max-age=315360000, immutable";
+# files requested by their plain name are revalidated after WHITENOISE_MAX_AGE.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
+WHITENOISE_MAX_AGE = config("WHITENOISE_MAX_AGE", default=3600, cast=int)
+
+# See employees/middleware.py for the rule format; these override the defaults there
+# CACHE_POLICY_RULES = [...]
+CACHE_POLICY_DEFAULT = "private, no-store"
 #Api key 
 from decouple import config
 
-HUGGINGFACE_API_KEY = config("HUGGINGFACE_API_KEY")
+# Only needed to download private or gated models from the Hugging Face hub
+HUGGINGFACE_API_KEY = config("HUGGINGFACE_API_KEY", default="")
+
+# Resume screening embeddings
+# Use "employees.embeddings.HashingBackend" in tests to skip the model download
+RESUME_EMBEDDING_BACKEND = config("RESUME_EMBEDDING_BACKEND", default="employees.embeddings.MiniLMBackend")
+RESUME_EMBEDDING_MODEL = config("RESUME_EMBEDDING_MODEL", default="sentence-transformers/all-MiniLM-L6-v2")
+RESUME_EMBEDDING_BATCH_SIZE = config("RESUME_EMBEDDING_BATCH_SIZE", default=16, cast=int)
+
+# Bulk screening: how many resumes one upload may contain and how many PDFs are parsed at once
+RESUME_BATCH_MAX_FILES = config("RESUME_BATCH_MAX_FILES", default=50, cast=int)
+RESUME_SCREENING_WORKERS = config("RESUME_SCREENING_WORKERS", default=4, cast=int)
+
+# PDF text extraction limits. Pages past RESUME_MAX_PAGES are ignored and extraction stops
+# once RESUME_TEXT_MAX_CHARS have been read. Set RESUME_PDF_PROCESSES > 0 to split documents
+# of RESUME_PARALLEL_PAGE_THRESHOLD pages or more across that many extraction processes.
+RESUME_MAX_BYTES = config("RESUME_MAX_BYTES", default=10 * 1024 * 1024, cast=int)
+RESUME_MAX_PAGES = config("RESUME_MAX_PAGES", default=30, cast=int)
+RESUME_TEXT_MAX_CHARS = config("RESUME_TEXT_MAX_CHARS", default=20000, cast=int)
+RESUME_PDF_PROCESSES = config("RESUME_PDF_PROCESSES", default=0, cast=int)
+RESUME_PARALLEL_PAGE_THRESHOLD = config("RESUME_PARALLEL_PAGE_THRESHOLD", default=16, cast=int)
+
+# Load and warm the AI models when gunicorn starts instead of on the first request
+# (see gunicorn.conf.py). /health/ready/ reports 503 until the worker is warmed up.
+AI_PRELOAD_MODELS = config("AI_PRELOAD_MODELS", default=False, cast=bool)
+
+# HR assistant retrieval index, written by `python manage.py build_kb_index`.
+# Workers load it on first use instead of embedding the knowledge base themselves.
+HR_KB_INDEX_PATH = config("HR_KB_INDEX_PATH", default=os.path.join(BASE_DIR, "kb_index.npz"))
+# Policies are edited in the admin; each worker checks the knowledge-base version this often (seconds)
+HR_KB_CHECK_INTERVAL = config("HR_KB_CHECK_INTERVAL", default=5, cast=float)
+
+# HR assistant answer cache (per worker): LRU size, time-to-live in seconds, and how close
+# (cosine similarity) a reworded question must be to reuse a cached answer
+HR_CHATBOT_CACHE_MAX_ENTRIES = config("HR_CHATBOT_CACHE_MAX_ENTRIES", default=512, cast=int)
+HR_CHATBOT_CACHE_TTL = config("HR_CHATBOT_CACHE_TTL", default=3600, cast=int)
+HR_CHATBOT_CACHE_SIMILARITY = config("HR_CHATBOT_CACHE_SIMILARITY", default=0.92, cast=float)
+
+# Background jobs are run by `python manage.py run_jobs`. JOBS_RUN_INLINE runs them
+# inside the request instead, for local development without a worker.
+JOBS_RUN_INLINE = config("JOBS_RUN_INLINE", default=False, cast=bool)
+# A job still Running after a worker restart is retried until it has been
+# started this many times, then marked Failed (it probably killed the worker).
+JOBS_MAX_ATTEMPTS = config("JOBS_MAX_ATTEMPTS", default=3, cast=int)
+
+# Caches
+# "resume_screening" holds extracted resume text and embeddings keyed by content hash.
+# LocMemCache evicts least-recently-used entries past MAX_ENTRIES; point it at
+# django.core.cache.backends.filebased.FileBasedCache to keep it on local disk instead.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "resume_screening": {
+        "BACKEND": config("RESUME_CACHE_BACKEND", default="django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": config("RESUME_CACHE_LOCATION", default="resume-screening"),
+        "TIMEOUT": None,
+        "OPTIONS": {
+            "MAX_ENTRIES": config("RESUME_CACHE_MAX_ENTRIES", default=5000, cast=int),
+        },
+    },
+    # Dashboard fragments. Every process must share this cache: invalidations
+    # made by one (a gunicorn worker, `run_jobs`, a management command) only
+    # reach the others through it. The default is the database (`migrate`
+    # creates the table, see employees/apps.py); Redis is faster, e.g.
+    #   DASHBOARD_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+    #   DASHBOARD_CACHE_LOCATION=redis://127.0.0.1:6379/1
+    # Only with DEBUG on does it default to a per-process cache, and
+    # `manage.py check --deploy` warns if one is configured (employees.W001).
+    "dashboard": {
+        "BACKEND": config(
+            "DASHBOARD_CACHE_BACKEND",
+            default="django.core.cache.backends.locmem.LocMemCache" if DEBUG
+            else "django.core.cache.backends.db.DatabaseCache",
+        ),
+        "LOCATION": config("DASHBOARD_CACHE_LOCATION", default="dashboard" if DEBUG else "dashboard_cache"),
+        "TIMEOUT": config("DASHBOARD_CACHE_TTL", default=300, cast=int),
+        "OPTIONS": {
+            "MAX_ENTRIES": config("DASHBOARD_CACHE_MAX_ENTRIES", default=10000, cast=int),
+        },
+    },
+}
+
+# Bulk employee import (employees/importer.py). Passwords in the file are hashed
+# with PBKDF2 (~0.5 s each) across this many processes; 0 or 1 hashes in-process.
+EMPLOYEE_IMPORT_PROCESSES = config("EMPLOYEE_IMPORT_PROCESSES", default=os.cpu_count() or 1, cast=int)
+EMPLOYEE_IMPORT_BATCH_SIZE = config("EMPLOYEE_IMPORT_BATCH_SIZE", default=1000, cast=int)
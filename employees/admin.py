@@ -7,8 +7,11 @@ admin.site.register(Payroll)
 '''
 
 from django.contrib import admin
-from .models import EmployeeProfile, Attendance, Payroll
-from django.contrib import admin
+from .models import EmployeeProfile, Attendance, Payroll, PayrollAdjustment, BackgroundJob, PolicyDocument
+from .payroll import PayrollError, run_payroll
+from .directory import matching, search_terms
+from django.contrib import admin, messages
+from django.utils import timezone
 from django.contrib.auth.admin import UserAdmin
 from users.models import CustomUser
 
@@ -18,6 +21,27 @@ class EmployeeProfileAdmin(admin.ModelAdmin):
     list_display = ('user', 'department', 'salary', 'performance_score')  # Columns to show
     search_fields = ('user__username', 'department')  # Search by username or department
     list_filter = ('department',)  # Filter by department
+    actions = ['run_payroll_this_month']
+
+    def get_search_results(self, request, queryset, search_term):
+        # Prefix search on the directory's token index instead of icontains scans
+        if not search_terms(search_term):
+            return super().get_search_results(request, queryset, search_term)
+        return matching(search_term, queryset), False
+
+    @admin.action(description="Run this month's payroll for the selected employees")
+    def run_payroll_this_month(self, request, queryset):
+        month = timezone.localdate().replace(day=1)
+        try:
+            summary = run_payroll(month, employee_ids=list(queryset.values_list('id', flat=True)), replace=True)
+        except PayrollError as e:
+            self.message_user(request, str(e), messages.ERROR)
+            return
+        self.message_user(
+            request,
+            f"Payroll for {summary['month']} generated for {summary['employees']} employee(s), net {summary['net']:.2f}.",
+            messages.SUCCESS,
+        )
 
 # Attendance admin
 @admin.register(Attendance)
@@ -31,4 +55,29 @@ class AttendanceAdmin(admin.ModelAdmin):
 class PayrollAdmin(admin.ModelAdmin):
     list_display = ('employee', 'month', 'base_salary', 'bonus', 'deductions', 'total_salary')
     search_fields = ('employee__user__username',)
+    list_filter = ('month', 'employee__department')
+    list_select_related = ('employee__user',)
+    # total_salary is a stored generated column, so the database sorts on it
+    ordering = ('-month', '-total_salary')
+
+# Payroll adjustment admin
+@admin.register(PayrollAdjustment)
+class PayrollAdjustmentAdmin(admin.ModelAdmin):
+    list_display = ('employee', 'month', 'kind', 'amount', 'note')
+    list_filter = ('kind', 'month')
+    search_fields = ('employee__user__username',)
+
+# Background job admin
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'created_by', 'created_at', 'finished_at', 'attempts')
+    list_filter = ('status', 'kind')
+    readonly_fields = ('payload', 'result', 'error', 'created_at', 'started_at', 'finished_at', 'attempts')
 
+# HR assistant knowledge base admin
+@admin.register(PolicyDocument)
+class PolicyDocumentAdmin(admin.ModelAdmin):
+    list_display = ('title', 'key', 'is_active', 'revision', 'updated_at')
+    list_filter = ('is_active',)
+    search_fields = ('title', 'key')
+    prepopulated_fields = {'key': ('title',)}
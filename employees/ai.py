@@ -1,37 +1,15 @@
-# In Ai.py - A corrected version
+# In Ai.py - resume scoring against a job description
 
-import requests
-from django.conf import settings
+from .embeddings import get_embedding_backend
+from .resume_cache import file_digest, get_embeddings, job_description_digest, normalize_job_description
 
-API_URL = "https://api-inference.huggingface.co/models/sentence-transformers/all-MiniLM-L6-v2"
-HEADERS = {"Authorization": f"Bearer {settings.HUGGINGFACE_API_KEY}"}
 
-def analyze_resume(resume_text, job_description): # Removed default value
-    if not settings.HUGGINGFACE_API_KEY:
-        # It's better to raise an error than return a string
-        raise ValueError("Missing Hugging Face API key. Please add it to settings.py")
+def _to_percentage(score):
+    # Cosine similarity can dip below zero for unrelated texts; clamp for display
+    return round(max(0.0, min(1.0, float(score))) * 100)
 
-    payload = {
-        "inputs": {
-            "source_sentence": job_description,
-            "sentences": [resume_text]
-        }
-    }
-
-    try:
-        response = requests.post(API_URL, headers=HEADERS, json=payload)
-        response.raise_for_status()
-        result = response.json()
-    except requests.exceptions.RequestException as e:
-        raise ConnectionError(f"Error connecting to Hugging Face: {e}")
-
-    if isinstance(result, dict) and "error" in result:
-        raise ValueError(f"API Error: {result['error']}")
-
-    score = result[0] if isinstance(result, list) else 0
-    percentage = round(score * 100) # Use a whole number for score
 
-    # --- THIS IS THE KEY CHANGE ---
+def build_result(percentage):
     # Return a dictionary that matches the keys in your HTML template
     return {
         "score": percentage,
@@ -39,4 +17,34 @@ def analyze_resume(resume_text, job_description): # Removed default value
         "strengths": [], # Return empty lists so the template doesn't break
         "weaknesses": [],
         "interview_questions": []
-    }
\ No newline at end of file
+    }
+
+
+def score_resumes(job_description, resume_texts, resume_digests=None):
+    """
+    Scores many resumes against one job description. Embeddings are cached by
+    content hash, so only resumes and job descriptions not seen before are
+    embedded, in a single batched call, and compared with one matrix-vector
+    product. Returns a list of percentages in the same order as resume_texts.
+    """
+    if not resume_texts:
+        return []
+    if resume_digests is None:
+        resume_digests = [file_digest((text or "").encode()) for text in resume_texts]
+
+    backend = get_embedding_backend()
+    job_vector = get_embeddings(
+        backend, "job", [job_description_digest(job_description)], [normalize_job_description(job_description)]
+    )[0]
+    resume_vectors = get_embeddings(backend, "resume", resume_digests, list(resume_texts))
+    scores = backend.similarity(job_vector, resume_vectors)
+    return [_to_percentage(score) for score in scores]
+
+
+def analyze_resume(resume_text, job_description, resume_digest=None): # Removed default value
+    if not job_description or not job_description.strip():
+        raise ValueError("A job description is required to score a resume.")
+
+    digests = [resume_digest] if resume_digest else None
+    percentage = score_resumes(job_description, [resume_text], digests)[0]
+    return build_result(percentage)
@@ -0,0 +1,156 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+from django.conf import settings
+
+_punctuation_re = re.compile(r"[^\w\s]")
+_whitespace_re = re.compile(r"\s+")
+
+
+def normalize_question(question):
+    """'How many SICK days?' and 'how many sick days' share one cache entry."""
+    text = _punctuation_re.sub(" ", (question or "").lower())
+    return _whitespace_re.sub(" ", text).strip()
+
+
+class _Entry:
+    __slots__ = ("answer", "expires_at", "slot")
+
+    def __init__(self, answer, expires_at, slot):
+        self.answer = answer
+        self.expires_at = expires_at
+        self.slot = slot
+
+
+class AnswerCache:
+    """
+    In-process LRU cache of chatbot answers with a TTL.
+
+    Entries are keyed by the normalized question and are only valid for the
+    knowledge-base version they were answered from; a new version empties the
+    cache. Each entry also keeps its question embedding in a preallocated
+    matrix, so a reworded question can be matched with one matrix-vector
+    product instead of running the QA model again.
+    """
+
+    def __init__(self, max_entries=512, ttl=3600, similarity=0.92):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity = similarity
+        self._lock = threading.Lock()
+        self.clear()
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def clear(self):
+        self._entries = OrderedDict()
+        self._slot_keys = [None] * self.max_entries
+        self._free_slots = list(range(self.max_entries - 1, -1, -1))
+        self._vectors = None
+        self._valid = np.zeros(self.max_entries, dtype=bool)
+        self.version = None
+
+    def _check_version(self, version):
+        if version != self.version:
+            self.clear()
+            self.version = version
+
+    def _drop(self, key):
+        entry = self._entries.pop(key)
+        if entry.slot is not None:
+            self._valid[entry.slot] = False
+            self._slot_keys[entry.slot] = None
+            self._free_slots.append(entry.slot)
+
+    def _alive(self, key, entry):
+        if entry.expires_at < time.monotonic():
+            self._drop(key)
+            return False
+        return True
+
+    def get(self, question, version):
+        """Exact lookup on the normalized question. Returns the answer or None."""
+        key = normalize_question(question)
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is not None and self._alive(key, entry):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.answer
+        return None
+
+    def get_similar(self, vector, version):
+        """Near-duplicate lookup by question embedding. Counts a miss when nothing is close enough."""
+        with self._lock:
+            self._check_version(version)
+            if self._vectors is not None and self._valid.any():
+                scores = self._vectors @ vector
+                scores[~self._valid] = -np.inf
+                slot = int(np.argmax(scores))
+                key = self._slot_keys[slot]
+                if scores[slot] >= self.similarity and self._alive(key, self._entries[key]):
+                    self._entries.move_to_end(key)
+                    self.similar_hits += 1
+                    return self._entries[key].answer
+            self.misses += 1
+        return None
+
+    def put(self, question, answer, version, vector=None):
+        key = normalize_question(question)
+        with self._lock:
+            self._check_version(version)
+            if key in self._entries:
+                self._drop(key)
+            while len(self._entries) >= self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+            slot = None
+            if vector is not None:
+                if self._vectors is None:
+                    self._vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+                slot = self._free_slots.pop()
+                self._vectors[slot] = vector
+                self._valid[slot] = True
+                self._slot_keys[slot] = key
+            self._entries[key] = _Entry(answer, time.monotonic() + self.ttl, slot)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.similar_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "version": self.version,
+                "hits": self.hits,
+                "similar_hits": self.similar_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": round((self.hits + self.similar_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+
+# --- One cache per worker process ---
+
+_answer_cache = None
+_answer_cache_lock = threading.Lock()
+
+
+def get_answer_cache():
+    global _answer_cache
+    if _answer_cache is None:
+        with _answer_cache_lock:
+            if _answer_cache is None:
+                _answer_cache = AnswerCache(
+                    max_entries=getattr(settings, "HR_CHATBOT_CACHE_MAX_ENTRIES", 512),
+                    ttl=getattr(settings, "HR_CHATBOT_CACHE_TTL", 3600),
+                    similarity=getattr(settings, "HR_CHATBOT_CACHE_SIMILARITY", 0.92),
+                )
+    return _answer_cache
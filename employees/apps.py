@@ -1,6 +1,18 @@
 from django.apps import AppConfig
+from django.core.management import call_command
+from django.db.models.signals import post_migrate
+
+
+def create_cache_tables(using, **kwargs):
+    # The dashboard cache lives in the database by default; `migrate` creates its table
+    # so a deploy cannot forget `createcachetable`. Does nothing for other backends.
+    call_command("createcachetable", database=using, verbosity=0)
 
 
 class EmployeesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'employees'
+
+    def ready(self):
+        from . import checks, signals  # noqa: F401
+        post_migrate.connect(create_cache_tables, sender=self)
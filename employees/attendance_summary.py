@@ -0,0 +1,183 @@
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from . import dashboard_cache
+from .models import Attendance, AttendanceDailySummary, AttendanceMonthlySummary
+
+BATCH_SIZE = 1000
+
+COUNT_FIELDS = {
+    AttendanceDailySummary: {"Present": "present", "Absent": "absent"},
+    AttendanceMonthlySummary: {"Present": "present_days", "Absent": "absent_days"},
+}
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def _next_month(day):
+    return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+
+
+def _increment(model, keys, status, delta):
+    """
+    Adds `delta` to the status counter of the row identified by `keys`, creating
+    it first if needed. The insert is INSERT ... ON CONFLICT DO NOTHING (INSERT
+    IGNORE on MySQL) and the increment a single UPDATE ... SET n = n + delta, so
+    concurrent marks never lose a count or trip the unique constraint.
+    """
+    field = COUNT_FIELDS[model][status]
+    model.objects.bulk_create([model(**keys)], ignore_conflicts=True)
+    model.objects.filter(**keys).update(**{field: F(field) + delta})
+
+
+def record_attendance(employee_id, department, day, status, delta=1):
+    """Applies one attendance row (delta=-1 to take one back) to both rollups."""
+    # No savepoint: callers already wrap this together with the attendance INSERT
+    with transaction.atomic(savepoint=False):
+        _increment(AttendanceDailySummary, {"date": day, "department": department or ""}, status, delta)
+        _increment(AttendanceMonthlySummary, {"employee_id": employee_id, "month": month_start(day)}, status, delta)
+
+
+# -------------------
+# Rebuild / reconcile
+# -------------------
+def _expected_daily(first, last):
+    rows = (
+        Attendance.objects.filter(date__gte=first, date__lte=last)
+        .values("date", "employee__department")
+        .annotate(present=Count("id", filter=Q(status="Present")), absent=Count("id", filter=Q(status="Absent")))
+    )
+    return {
+        (row["date"], row["employee__department"] or ""): (row["present"], row["absent"])
+        for row in rows.iterator()
+    }
+
+
+def _expected_monthly(first, last):
+    rows = (
+        Attendance.objects.filter(date__gte=first, date__lte=last)
+        .annotate(month=TruncMonth("date"))
+        .values("employee_id", "month")
+        .annotate(present=Count("id", filter=Q(status="Present")), absent=Count("id", filter=Q(status="Absent")))
+    )
+    return {(row["employee_id"], row["month"]): (row["present"], row["absent"]) for row in rows.iterator()}
+
+
+def _reconcile(model, key_fields, count_fields, expected, stored_qs, fix):
+    # key -> (id, *counts)
+    width = len(key_fields)
+    stored = {
+        values[:width]: values[width:]
+        for values in stored_qs.values_list(*key_fields, "id", *count_fields).iterator()
+    }
+    missing = [key for key in expected if key not in stored]
+    changed = [key for key in expected if key in stored and stored[key][1:] != expected[key]]
+    extra = [stored[key][0] for key in stored if key not in expected]
+
+    if fix:
+        model.objects.bulk_create(
+            [model(**dict(zip(key_fields + count_fields, key + expected[key]))) for key in missing],
+            batch_size=BATCH_SIZE,
+        )
+        rows = []
+        for key in changed:
+            row = model(id=stored[key][0], **dict(zip(key_fields, key)))
+            for field, value in zip(count_fields, expected[key]):
+                setattr(row, field, value)
+            rows.append(row)
+        model.objects.bulk_update(rows, count_fields, batch_size=BATCH_SIZE)
+        model.objects.filter(id__in=extra).delete()
+    return {"missing": len(missing), "changed": len(changed), "extra": len(extra)}
+
+
+def reconcile_summaries(first=None, last=None, fix=True):
+    """
+    Recomputes the rollups from Attendance one month at a time and, with
+    fix=True, rewrites only the rows that drifted (for example after
+    attendance was edited in the admin). Without dates it covers every month
+    that has attendance or a summary row. Returns drift counts per table.
+    """
+    if first is None or last is None:
+        # Span both tables, so summary rows whose attendance was deleted are found too
+        spans = [
+            Attendance.objects.order_by().aggregate(first=Min("date"), last=Max("date")),
+            AttendanceDailySummary.objects.order_by().aggregate(first=Min("date"), last=Max("date")),
+            AttendanceMonthlySummary.objects.order_by().aggregate(first=Min("month"), last=Max("month")),
+        ]
+        firsts = [span["first"] for span in spans if span["first"] is not None]
+        lasts = [span["last"] for span in spans if span["last"] is not None]
+        first = first or min(firsts, default=None)
+        last = last or max(lasts, default=None)
+    totals = {
+        "daily": {"missing": 0, "changed": 0, "extra": 0},
+        "monthly": {"missing": 0, "changed": 0, "extra": 0},
+    }
+    if first is None or last is None:
+        return totals
+
+    # Whole months, so the monthly rows being compared are complete
+    month = month_start(first)
+    while month <= last:
+        month_end = _next_month(month)
+        month_last = month_end - timedelta(days=1)
+        with transaction.atomic():
+            daily = _reconcile(
+                AttendanceDailySummary, ["date", "department"], ["present", "absent"],
+                _expected_daily(month, month_last),
+                AttendanceDailySummary.objects.filter(date__gte=month, date__lte=month_last),
+                fix,
+            )
+            monthly = _reconcile(
+                AttendanceMonthlySummary, ["employee_id", "month"], ["present_days", "absent_days"],
+                _expected_monthly(month, month_last),
+                AttendanceMonthlySummary.objects.filter(month=month),
+                fix,
+            )
+        for name, counts in (("daily", daily), ("monthly", monthly)):
+            for kind, value in counts.items():
+                totals[name][kind] += value
+        month = month_end
+
+    if fix and any(value for counts in totals.values() for value in counts.values()):
+        # The rollups were rewritten in bulk, without signals: drop the cached headcounts and chart
+        dashboard_cache.invalidate_on_commit(dashboard_cache.ATTENDANCE)
+    return totals
+
+
+def rebuild_summaries():
+    """Throws both rollups away and recomputes them from the raw attendance rows."""
+    with transaction.atomic():
+        AttendanceDailySummary.objects.all().delete()
+        AttendanceMonthlySummary.objects.all().delete()
+        return reconcile_summaries()
+
+
+# -------------------
+# Dashboard reads
+# -------------------
+def present_on(day):
+    """Everyone marked present on `day`, summed over a handful of per-department rows."""
+    return AttendanceDailySummary.objects.filter(date=day).aggregate(total=Sum("present"))["total"] or 0
+
+
+def daily_presence(first, last):
+    """{date: present} for each day in [first, last] that has attendance."""
+    return dict(
+        AttendanceDailySummary.objects.filter(date__gte=first, date__lte=last)
+        .values("date").annotate(total=Sum("present")).values_list("date", "total")
+    )
+
+
+def attendance_rate(employee, year=None):
+    """Percentage of recorded days marked present this year, from at most twelve rows."""
+    year = year or date.today().year
+    totals = AttendanceMonthlySummary.objects.filter(
+        employee=employee, month__gte=date(year, 1, 1), month__lte=date(year, 12, 1)
+    ).aggregate(present=Sum("present_days"), absent=Sum("absent_days"))
+    present, absent = totals["present"] or 0, totals["absent"] or 0
+    return round(100 * present / (present + absent), 1) if present + absent else 0.0
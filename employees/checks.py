@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+from .dashboard_cache import CACHE_ALIAS
+
+PER_PROCESS_BACKENDS = (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+
+@register(Tags.caches, deploy=True)
+def check_dashboard_cache_is_shared(app_configs, **kwargs):
+    backend = settings.CACHES.get(CACHE_ALIAS, {}).get("BACKEND", "")
+    if backend in PER_PROCESS_BACKENDS:
+        return [
+            Warning(
+                f"The '{CACHE_ALIAS}' cache uses {backend.rsplit('.', 1)[-1]}, which lives inside each process.",
+                hint=(
+                    "Invalidations from one gunicorn worker, `run_jobs` or a management command never reach the "
+                    "others, which keep serving stale dashboards for up to DASHBOARD_CACHE_TTL. Set "
+                    "DASHBOARD_CACHE_BACKEND/DASHBOARD_CACHE_LOCATION to a shared cache (Redis, Memcached or "
+                    "django.core.cache.backends.db.DatabaseCache)."
+                ),
+                id="employees.W001",
+            )
+        ]
+    return []
@@ -0,0 +1,117 @@
+import threading
+import time
+
+from django.core.cache import caches
+from django.db import transaction
+
+CACHE_ALIAS = "dashboard"
+
+# Invalidation tags. A fragment is stored under a key that embeds the current
+# generation of every tag it depends on, so bumping a tag orphans exactly the
+# fragments built from that data; the orphans simply age out of the cache.
+LEAVE = "leave"
+ATTENDANCE = "attendance"
+PROFILES = "profiles"
+
+
+def employee_tag(employee_id):
+    return f"employee:{employee_id}"
+
+
+def _generation_key(tag):
+    return f"dashboard:gen:{tag}"
+
+
+def _new_generation(cache, key):
+    # Start from the clock rather than 1, so a generation that was evicted and
+    # restarted can never match a fragment stored under its earlier life.
+    # Generations never expire; only the fragments do (the cache TIMEOUT).
+    cache.add(key, time.time_ns(), timeout=None)
+    return cache.get(key)
+
+
+class _Stats:
+    """Hit/miss counters per fragment name, for this worker process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, name, hit):
+        with self._lock:
+            counts = self._counts.setdefault(name, [0, 0])
+            counts[0 if hit else 1] += 1
+
+    def snapshot(self):
+        with self._lock:
+            fragments = {}
+            total_hits = total_lookups = 0
+            for name, (hits, misses) in sorted(self._counts.items()):
+                lookups = hits + misses
+                total_hits += hits
+                total_lookups += lookups
+                fragments[name] = {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+                }
+            return {
+                "hits": total_hits,
+                "misses": total_lookups - total_hits,
+                "hit_ratio": round(total_hits / total_lookups, 4) if total_lookups else 0.0,
+                "fragments": fragments,
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counts = {}
+
+
+_stats = _Stats()
+
+
+def cached_fragment(name, parts, tags, compute):
+    """
+    Returns the dashboard fragment `name` for `parts` (role, department,
+    user, day, ... whatever the data varies by), calling compute() and
+    storing its result on a miss. `tags` are the invalidation tags the
+    fragment depends on; one get_many reads all their generations.
+    """
+    cache = caches[CACHE_ALIAS]
+    keys = [_generation_key(tag) for tag in tags]
+    generations = cache.get_many(keys)
+    stamp = ".".join(
+        str(generations[key] if key in generations else _new_generation(cache, key)) for key in keys
+    )
+    key = ":".join(["dashboard", name, *(str(part) for part in parts), stamp])
+
+    value = cache.get(key)
+    _stats.record(name, value is not None)
+    if value is None:
+        value = compute()
+        cache.set(key, value)
+    return value
+
+
+def invalidate(*tags):
+    """Moves each tag to a new generation, so no fragment built on the old one is read again."""
+    cache = caches[CACHE_ALIAS]
+    for tag in tags:
+        key = _generation_key(tag)
+        try:
+            cache.incr(key)
+        except ValueError:  # never read yet, or evicted
+            _new_generation(cache, key)
+
+
+def invalidate_on_commit(*tags):
+    """
+    invalidate() once the current transaction commits (straight away outside
+    one), so a dashboard rendered meanwhile cannot cache the old rows under
+    the new generation. For writes that send no signals: update(), bulk_create().
+    """
+    transaction.on_commit(lambda: invalidate(*tags))
+
+
+def stats():
+    return _stats.snapshot()
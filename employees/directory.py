@@ -0,0 +1,151 @@
+import re
+import unicodedata
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import EmployeeProfile, EmployeeSearchToken
+from .pagination import KeysetPage
+
+DEFAULT_TYPEAHEAD_LIMIT = 10
+MAX_TYPEAHEAD_LIMIT = 50
+MIN_TERM_LENGTH = 2
+MAX_TERMS = 5
+TOKEN_LENGTH = 100  # EmployeeSearchToken.token max_length
+
+_split_re = re.compile(r"[\W_]+")
+
+
+def normalize_words(text):
+    """
+    'José O'Brien' -> ['jose', 'o', 'brien']: case-folded words with accents
+    removed. Letters of other scripts are kept as they are, so '王小明' is
+    one token and is found by searching '王' or '王小'; names written
+    without spaces can only be found by their beginning.
+    """
+    text = unicodedata.normalize("NFKD", (text or "").casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return [word[:TOKEN_LENGTH] for word in _split_re.split(text) if word]
+
+
+def tokens_for(username, first_name, last_name, email, department):
+    return set(normalize_words(" ".join([username, first_name, last_name, email, department or ""])))
+
+
+# -------------------
+# Index maintenance
+# -------------------
+def reindex(employee_ids=None, batch_size=2000):
+    """
+    Rebuilds the search tokens of the given employees (all when None).
+    Called from the EmployeeProfile/CustomUser save signals, after bulk
+    imports, and by the migration that introduced the table.
+    """
+    profiles = EmployeeProfile.objects.order_by("id")
+    if employee_ids is not None:
+        profiles = profiles.filter(id__in=list(employee_ids))
+    rows = profiles.values_list(
+        "id", "user__username", "user__first_name", "user__last_name", "user__email", "department"
+    )
+    with transaction.atomic():
+        stale = EmployeeSearchToken.objects.all()
+        if employee_ids is not None:
+            stale = stale.filter(employee_id__in=list(employee_ids))
+        stale.delete()
+        batch = []
+        for employee_id, *fields in rows.iterator(chunk_size=batch_size):
+            batch.extend(EmployeeSearchToken(employee_id=employee_id, token=token) for token in tokens_for(*fields))
+            if len(batch) >= batch_size:
+                EmployeeSearchToken.objects.bulk_create(batch)
+                batch = []
+        EmployeeSearchToken.objects.bulk_create(batch)
+
+
+# -------------------
+# Search
+# -------------------
+def _worth_searching(term):
+    # One Latin letter matches a large share of the directory; one CJK character is a surname
+    return len(term) >= MIN_TERM_LENGTH or not term.isascii()
+
+
+def search_terms(query):
+    """The normalized words of a query worth searching for; too-short and surplus words are dropped."""
+    return [term for term in normalize_words(query) if _worth_searching(term)][:MAX_TERMS]
+
+
+def _prefix_range(term):
+    """
+    token >= term AND token < the next string after every term* one. Spelled
+    as a range rather than LIKE 'term%', which SQLite only serves from an
+    index for case-insensitive columns. Tokens are case-folded, so the range
+    means the same under a binary or a case-insensitive collation.
+    """
+    return {"token__gte": term, "token__lt": term[:-1] + chr(ord(term[-1]) + 1)}
+
+
+def matching(query, profiles=None):
+    """
+    Employees with, for every term of the query, a token starting with it;
+    "jo smi" finds John Smith. Each term is one range scan of the token index.
+    A query with nothing worth searching for ("j", "-") matches nobody.
+    """
+    profiles = EmployeeProfile.objects.all() if profiles is None else profiles
+    terms = search_terms(query)
+    if query and not terms:
+        return profiles.none()
+    for term in terms:
+        profiles = profiles.filter(
+            id__in=EmployeeSearchToken.objects.filter(**_prefix_range(term)).values("employee_id")
+        )
+    return profiles
+
+
+def typeahead(query, limit=DEFAULT_TYPEAHEAD_LIMIT):
+    """Up to `limit` matches ordered by username, as plain dicts for JSON."""
+    if not search_terms(query):
+        return []
+    rows = (
+        matching(query)
+        .order_by("user__username")
+        .values("id", "user__username", "user__first_name", "user__last_name", "department")[:limit]
+    )
+    return [
+        {
+            "id": row["id"],
+            "username": row["user__username"],
+            "name": f"{row['user__first_name']} {row['user__last_name']}".strip(),
+            "department": row["department"] or "",
+        }
+        for row in rows
+    ]
+
+
+def directory_page(query="", page_size=None, after=None, before=None):
+    """
+    One page of the directory ordered by username, optionally filtered by
+    `query`. Keyset-paginated on the unique username: `after`/`before` are
+    the usernames on the edges of the current page, so every page is one
+    index seek however deep it is, and no COUNT(*) is needed.
+    """
+    page_size = page_size or getattr(settings, "EMPLOYEE_DIRECTORY_PAGE_SIZE", 50)
+    profiles = matching(query).select_related("user") if query else EmployeeProfile.objects.select_related("user")
+
+    if before:
+        rows = list(profiles.filter(user__username__lt=before).order_by("-user__username")[:page_size + 1])
+        has_previous, has_next = len(rows) > page_size, True
+        rows = rows[:page_size][::-1]
+    else:
+        if after:
+            profiles = profiles.filter(user__username__gt=after)
+        rows = list(profiles.order_by("user__username")[:page_size + 1])
+        has_previous, has_next = bool(after), len(rows) > page_size
+        rows = rows[:page_size]
+
+    if not rows:
+        return KeysetPage([])
+    return KeysetPage(
+        rows,
+        next_cursor=rows[-1].user.username if has_next else None,
+        previous_cursor=rows[0].user.username if has_previous else None,
+    )
@@ -0,0 +1,138 @@
+import hashlib
+import logging
+import re
+import threading
+
+import numpy as np
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = "employees.embeddings.MiniLMBackend"
+DEFAULT_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def _normalize_rows(vectors):
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class BaseEmbeddingBackend:
+    """
+    Turns a list of texts into a (len(texts), dim) float32 matrix of unit vectors,
+    so cosine similarity between two rows is just their dot product.
+    """
+    dimension = None
+    is_loaded = True
+
+    def load(self):
+        """Loads model weights ahead of the first embed() call, if the backend has any."""
+
+    def embed(self, texts):
+        raise NotImplementedError
+
+    def similarity(self, query_vector, matrix):
+        return np.asarray(matrix) @ np.asarray(query_vector)
+
+
+class MiniLMBackend(BaseEmbeddingBackend):
+    """
+    In-process sentence embeddings with all-MiniLM-L6-v2 (mean pooling, like
+    sentence-transformers). The model is loaded on first use and then shared
+    by every request served by this worker.
+    """
+    dimension = 384
+
+    def __init__(self, model_name=None, batch_size=None, max_length=256):
+        self.model_name = model_name or getattr(settings, "RESUME_EMBEDDING_MODEL", DEFAULT_MODEL_NAME)
+        self.batch_size = batch_size or getattr(settings, "RESUME_EMBEDDING_BATCH_SIZE", 16)
+        self.max_length = max_length
+        self._tokenizer = None
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self):
+        return self._model is not None
+
+    def load(self):
+        if self._model is not None:
+            return
+        with self._lock:
+            if self._model is not None:
+                return
+            # Heavy imports stay inside the loader so importing this module is cheap
+            from transformers import AutoModel, AutoTokenizer
+
+            token = getattr(settings, "HUGGINGFACE_API_KEY", None) or None
+            logger.info(f"Loading embedding model {self.model_name}...")
+            tokenizer = AutoTokenizer.from_pretrained(self.model_name, token=token)
+            model = AutoModel.from_pretrained(self.model_name, token=token)
+            model.eval()
+            self._tokenizer = tokenizer
+            self._model = model
+            logger.info("✅ Embedding model loaded successfully.")
+
+    def embed(self, texts):
+        import torch
+
+        self.load()
+        texts = [text or "" for text in texts]
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        chunks = []
+        with torch.inference_mode():
+            for start in range(0, len(texts), self.batch_size):
+                batch = texts[start:start + self.batch_size]
+                encoded = self._tokenizer(
+                    batch,
+                    padding=True,
+                    truncation=True,
+                    max_length=self.max_length,
+                    return_tensors="pt",
+                )
+                token_embeddings = self._model(**encoded).last_hidden_state
+                mask = encoded["attention_mask"].unsqueeze(-1).to(token_embeddings.dtype)
+                pooled = (token_embeddings * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+                chunks.append(pooled.cpu().numpy())
+
+        return _normalize_rows(np.vstack(chunks).astype(np.float32))
+
+
+class HashingBackend(BaseEmbeddingBackend):
+    """
+    Deterministic stand-in for tests and offline development: a hashed
+    bag-of-words vector. Needs no model download and gives identical results
+    in every process.
+    """
+    dimension = 384
+
+    _token_re = re.compile(r"[a-z0-9]+")
+
+    def embed(self, texts):
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in self._token_re.findall((text or "").lower()):
+                digest = hashlib.md5(token.encode()).digest()
+                vectors[row, int.from_bytes(digest[:4], "little") % self.dimension] += 1.0
+        return _normalize_rows(vectors)
+
+
+# --- One backend instance per worker process ---
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_embedding_backend():
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                backend_path = getattr(settings, "RESUME_EMBEDDING_BACKEND", DEFAULT_BACKEND)
+                _backend = import_string(backend_path)()
+    return _backend
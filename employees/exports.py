@@ -0,0 +1,127 @@
+import csv
+import tempfile
+
+from django.http import FileResponse, StreamingHttpResponse
+
+from .pagination import iter_keyset_chunks
+
+CHUNK_SIZE = 2000
+
+# A spreadsheet runs a cell that starts with one of these as a formula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class _Echo:
+    """File-like object for csv.writer that hands each formatted line back instead of storing it."""
+
+    def write(self, value):
+        return value
+
+
+def _cell(value):
+    """
+    Text that a spreadsheet would read as a formula (e.g. a leave reason of
+    "=HYPERLINK(...)") gets a leading apostrophe so it is shown as typed.
+    Numbers and dates are left alone.
+    """
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _safe_row(row):
+    return [_cell(value) for value in row]
+
+
+def _clock(value):
+    return value.strftime("%H:%M") if value else ""
+
+
+# -------------------
+# Datasets: (header, row iterator), read as plain tuples in CHUNK_SIZE seeks
+# -------------------
+def attendance_rows(records):
+    header = ["Date", "Employee", "Department", "Status", "Clock In", "Clock Out", "Hours Worked"]
+    rows = iter_keyset_chunks(records, (
+        "date", "employee__user__username", "employee__department", "status", "check_in", "check_out", "worked_seconds",
+    ), "date", CHUNK_SIZE)
+    return header, (
+        (day, username, department or "", status, _clock(check_in), _clock(check_out), round(seconds / 3600, 2))
+        for day, username, department, status, check_in, check_out, seconds in rows
+    )
+
+
+def leave_rows(leaves):
+    header = ["Employee", "Department", "Type", "Status", "Start", "End", "Days", "Reason", "Requested At"]
+    rows = iter_keyset_chunks(leaves, (
+        "employee__user__username", "employee__department", "leave_type", "status",
+        "start_date", "end_date", "reason", "created_at",
+    ), "start_date", CHUNK_SIZE)
+    return header, (
+        (username, department or "", leave_type, status, start, end, (end - start).days + 1, reason,
+         created_at.strftime("%Y-%m-%d %H:%M"))
+        for username, department, leave_type, status, start, end, reason, created_at in rows
+    )
+
+
+def payroll_rows(payroll):
+    header = ["Employee", "Department", "Month", "Base Salary", "Bonus", "Deductions", "Total Salary"]
+    rows = iter_keyset_chunks(payroll, (
+        "employee__user__username", "employee__department", "month", "base_salary", "bonus", "deductions", "total_salary",
+    ), "month", CHUNK_SIZE)
+    return header, (
+        (username, department or "", f"{month:%Y-%m}", *rest) for username, department, month, *rest in rows
+    )
+
+
+# -------------------
+# Responses
+# -------------------
+def csv_response(filename, header, rows):
+    """
+    Streams the CSV a line at a time: rows are fetched CHUNK_SIZE at a time
+    and nothing larger than one chunk is ever held.
+    """
+    writer = csv.writer(_Echo())
+
+    def lines():
+        yield writer.writerow(_safe_row(header))
+        for row in rows:
+            yield writer.writerow(_safe_row(row))
+
+    response = StreamingHttpResponse(lines(), content_type="text/csv")
+    response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
+    return response
+
+
+def xlsx_response(filename, header, rows):
+    """
+    Writes the workbook with XlsxWriter in constant-memory mode, which
+    flushes each row to a temporary file as soon as the next one starts, then
+    streams that file. An .xlsx is a zip archive, so unlike CSV it cannot be
+    sent before it is complete.
+    """
+    # Imported here so the rest of the app runs without the optional dependency
+    import xlsxwriter
+
+    output = tempfile.TemporaryFile()
+    workbook = xlsxwriter.Workbook(output, {
+        "constant_memory": True,
+        "default_date_format": "yyyy-mm-dd",
+        "remove_timezone": True,
+        "strings_to_formulas": False,
+    })
+    sheet = workbook.add_worksheet(filename[:31])
+    bold = workbook.add_format({"bold": True})
+    sheet.write_row(0, 0, _safe_row(header), bold)
+    for number, row in enumerate(rows, start=1):
+        sheet.write_row(number, 0, _safe_row(row))
+    workbook.close()
+
+    output.seek(0)
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename=f"{filename}.xlsx",
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    )
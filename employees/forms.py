@@ -10,14 +10,59 @@ class ResumeUploadForm(forms.Form):
     resume = forms.FileField()
 
 
+class EmployeeImportForm(forms.Form):
+    file = forms.FileField(help_text="CSV with a header row: username, email, first_name, last_name, role, department, salary, password.")
+
+    def clean_file(self):
+        from django.conf import settings
+
+        upload = self.cleaned_data["file"]
+        max_bytes = getattr(settings, "EMPLOYEE_IMPORT_MAX_BYTES", 5 * 1024 * 1024)
+        if not upload.name.lower().endswith(".csv"):
+            raise forms.ValidationError("Please upload a .csv file.")
+        if upload.size > max_bytes:
+            raise forms.ValidationError(f"The file is larger than {max_bytes // (1024 * 1024)} MB.")
+        return upload
+
+
 from .models import LeaveRequest
+from .leave_ledger import validate_leave_request
 
 class LeaveRequestForm(forms.ModelForm):
     class Meta:
         model = LeaveRequest
-        fields = ["start_date", "end_date", "reason"]
+        fields = ["leave_type", "start_date", "end_date", "reason"]
         widgets = {
             "start_date": forms.DateInput(attrs={"type": "date"}),
             "end_date": forms.DateInput(attrs={"type": "date"}),
             "reason": forms.Textarea(attrs={"rows": 3}),
-        }
\ No newline at end of file
+        }
+
+    def __init__(self, *args, employee=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.employee = employee
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start, end = cleaned_data.get("start_date"), cleaned_data.get("end_date")
+        leave_type = cleaned_data.get("leave_type")
+        if start and end and start > end:
+            raise forms.ValidationError("Start date must be on or before the end date.")
+        if start and end and leave_type and self.employee is not None:
+            validate_leave_request(self.employee, leave_type, start, end, exclude_id=self.instance.pk)
+        return cleaned_data
+
+from .models import Attendance
+
+class AttendanceFilterForm(forms.Form):
+    start_date = forms.DateField(required=False, widget=forms.DateInput(attrs={"type": "date"}))
+    end_date = forms.DateField(required=False, widget=forms.DateInput(attrs={"type": "date"}))
+    department = forms.CharField(required=False, max_length=100)
+    status = forms.ChoiceField(required=False, choices=[("", "All")] + Attendance.STATUS_CHOICES)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start, end = cleaned_data.get("start_date"), cleaned_data.get("end_date")
+        if start and end and start > end:
+            raise forms.ValidationError("Start date must be on or before the end date.")
+        return cleaned_data
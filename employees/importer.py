@@ -0,0 +1,242 @@
+import csv
+import io
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from users.models import CustomUser
+
+from . import dashboard_cache
+from .directory import reindex
+from .jobs import JobError, enqueue
+from .models import EmployeeProfile
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+REQUIRED_COLUMNS = {"username"}
+KNOWN_COLUMNS = {"username", "email", "first_name", "last_name", "role", "department", "salary", "password"}
+PROFILE_ROLES = ("Employee", "Manager")  # the roles users.admin.create_employee_profile gives a profile
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 500
+PASSWORDS_PER_TASK = 25
+
+
+def import_processes():
+    """Processes that hash passwords during an import: EMPLOYEE_IMPORT_PROCESSES, 0 or 1 to hash in-process."""
+    return getattr(settings, "EMPLOYEE_IMPORT_PROCESSES", os.cpu_count() or 1)
+
+
+class EmployeeImportError(ValueError):
+    """The file as a whole cannot be imported (wrong format, missing columns)."""
+
+
+def _hash_batch(passwords):
+    # Also runs in the spawned pool workers, set up from DJANGO_SETTINGS_MODULE by the pool initializer
+    return [make_password(password) for password in passwords]
+
+
+def hash_passwords(passwords, pool=None):
+    """
+    Hashes passwords with the configured hasher, split across `pool` (a
+    process pool) when given. Blank passwords become unusable ones and cost
+    nothing to "hash".
+    """
+    hashed = [make_password(None) if not password else None for password in passwords]
+    todo = [i for i, password in enumerate(passwords) if password]
+    if not todo:
+        return hashed
+
+    if pool is not None and len(todo) > 1:
+        batches = [
+            [passwords[i] for i in todo[start:start + PASSWORDS_PER_TASK]]
+            for start in range(0, len(todo), PASSWORDS_PER_TASK)
+        ]
+        results = [value for batch in pool.map(_hash_batch, batches) for value in batch]
+    else:
+        results = _hash_batch([passwords[i] for i in todo])
+
+    for i, value in zip(todo, results):
+        hashed[i] = value
+    return hashed
+
+
+def _clean_row(row, roles):
+    """Returns (cleaned dict, None) or (None, error message) for one CSV row."""
+    username = (row.get("username") or "").strip()
+    if not username:
+        return None, "username is required."
+    if len(username) > 150:
+        return None, "username is longer than 150 characters."
+
+    email = (row.get("email") or "").strip()
+    if email:
+        try:
+            validate_email(email)
+        except ValidationError:
+            return None, f"'{email}' is not a valid email address."
+
+    role = (row.get("role") or "").strip() or "Employee"
+    if role not in roles:
+        return None, f"role must be one of {', '.join(sorted(roles))}."
+
+    salary = (row.get("salary") or "").strip()
+    try:
+        salary = float(salary) if salary else 0.0
+    except ValueError:
+        return None, f"salary '{salary}' is not a number."
+    if salary < 0:
+        return None, "salary cannot be negative."
+
+    return {
+        "username": username,
+        "email": email,
+        "first_name": (row.get("first_name") or "").strip()[:150],
+        "last_name": (row.get("last_name") or "").strip()[:150],
+        "role": role,
+        "department": (row.get("department") or "").strip()[:100] or None,
+        "salary": salary,
+        "password": row.get("password") or "",
+    }, None
+
+
+def _flush(pending, errors, pool, dry_run):
+    """Checks one batch against existing usernames, then creates its users and profiles."""
+    # Usernames are compared case-insensitively, so "Ana" in the file is refused when "ana" exists
+    taken = set(
+        CustomUser.objects.annotate(username_lower=Lower("username"))
+        .filter(username_lower__in=[row["username"].lower() for _, row in pending])
+        .values_list("username_lower", flat=True)
+    )
+    batch = []
+    for line, row in pending:
+        if row["username"].lower() in taken:
+            errors.append((line, f"username '{row['username']}' already exists."))
+        else:
+            batch.append(row)
+    if dry_run or not batch:
+        return len(batch)
+
+    now = timezone.now()
+    hashed = hash_passwords([row["password"] for row in batch], pool)
+    # bulk_create sends no post_save, so the per-user profile signal does not fire
+    CustomUser.objects.bulk_create([
+        CustomUser(
+            username=row["username"], email=row["email"], first_name=row["first_name"], last_name=row["last_name"],
+            role=row["role"], password=password, date_joined=now,
+        )
+        for row, password in zip(batch, hashed)
+    ])
+    # MySQL does not return primary keys from a bulk INSERT, so read them back by username
+    user_ids = dict(
+        CustomUser.objects.filter(username__in=[row["username"] for row in batch]).values_list("username", "id")
+    )
+    profile_user_ids = [user_ids[row["username"]] for row in batch if row["role"] in PROFILE_ROLES]
+    EmployeeProfile.objects.bulk_create([
+        EmployeeProfile(user_id=user_ids[row["username"]], department=row["department"], salary=row["salary"])
+        for row in batch if row["role"] in PROFILE_ROLES
+    ])
+    # No post_save here either, so add the new profiles to the directory search index directly
+    reindex(list(EmployeeProfile.objects.filter(user_id__in=profile_user_ids).values_list("id", flat=True)))
+    return len(batch)
+
+
+def import_employees(stream, batch_size=None, processes=None, dry_run=False):
+    """
+    Imports users (and, for employees and managers, their profiles) from a
+    CSV text stream with a header row. Rows are validated as they are read
+    and written batch_size at a time, all inside one transaction; invalid
+    rows are skipped and reported, they do not stop the import.
+
+    Returns {"created": n, "rows": n, "errors": [(line, message), ...]}.
+    """
+    batch_size = batch_size or getattr(settings, "EMPLOYEE_IMPORT_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+    reader = csv.DictReader(stream)
+    columns = {name.strip() for name in reader.fieldnames or []}
+    if not columns:
+        raise EmployeeImportError("The file is empty.")
+    missing = REQUIRED_COLUMNS - columns
+    if missing:
+        raise EmployeeImportError(f"Missing column(s): {', '.join(sorted(missing))}.")
+    unknown = columns - KNOWN_COLUMNS
+    if unknown:
+        raise EmployeeImportError(f"Unknown column(s): {', '.join(sorted(unknown))}.")
+
+    processes = processes if processes is not None else import_processes()
+    # Password hashing is deliberately slow (PBKDF2), so it is the one step worth spreading over CPUs.
+    # spawn, not fork: the web worker may already be running threads. Workers start on the
+    # first submitted batch, so a file without passwords never pays for them.
+    pool = (
+        ProcessPoolExecutor(
+            max_workers=processes, mp_context=multiprocessing.get_context("spawn"), initializer=django.setup
+        )
+        if processes > 1 and not dry_run else None
+    )
+
+    roles = {role for role, _ in CustomUser.ROLE_CHOICES}
+    seen = set()
+    errors, pending = [], []
+    created = rows = 0
+    try:
+        with transaction.atomic():
+            for row in reader:
+                rows += 1
+                line = reader.line_num
+                row = {(key or "").strip(): value for key, value in row.items()}
+                cleaned, error = _clean_row(row, roles)
+                if error is None and cleaned["username"].lower() in seen:
+                    error = f"username '{cleaned['username']}' appears more than once in the file."
+                if error:
+                    errors.append((line, error))
+                    continue
+                seen.add(cleaned["username"].lower())
+                pending.append((line, cleaned))
+                if len(pending) >= batch_size:
+                    created += _flush(pending, errors, pool, dry_run)
+                    pending = []
+            if pending:
+                created += _flush(pending, errors, pool, dry_run)
+            if created and not dry_run:
+                # bulk_create sends no post_save; the headcounts on the dashboards changed
+                dashboard_cache.invalidate_on_commit(dashboard_cache.PROFILES)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    errors.sort()
+    logger.info(f"Employee import: {created} of {rows} rows imported, {len(errors)} errors{' (dry run)' if dry_run else ''}.")
+    return {"created": created, "rows": rows, "errors": errors}
+
+
+# -------------------
+# Background job
+# -------------------
+def enqueue_import(user, uploaded_file):
+    return enqueue("employee_import", {}, user=user, attachments=[(uploaded_file.name, uploaded_file.read())])
+
+
+def run_import_job(job):
+    attachment = job.attachments.get()
+    try:
+        stream = io.StringIO(bytes(attachment.data).decode("utf-8-sig"))
+        result = import_employees(stream, processes=import_processes())
+    except UnicodeDecodeError:
+        raise JobError("The file is not UTF-8 encoded CSV.")
+    except EmployeeImportError as e:
+        raise JobError(str(e))
+    return {
+        "created": result["created"],
+        "rows": result["rows"],
+        "error_count": len(result["errors"]),
+        "errors": result["errors"][:MAX_REPORTED_ERRORS],
+    }
@@ -0,0 +1,129 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import BackgroundJob, JobAttachment
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# kind -> dotted path of a callable taking the job and returning a JSON-serializable result
+JOB_HANDLERS = {
+    "resume_screening": "employees.screening.run_screening_job",
+    "employee_import": "employees.importer.run_import_job",
+}
+
+DEFAULT_MAX_ATTEMPTS = 3
+
+
+class JobError(Exception):
+    """Raised by a handler with a message that is safe to show to the user."""
+
+
+def enqueue(kind, payload, user=None, attachments=()):
+    """
+    Stores a job and its files and returns it straight away. A `run_jobs`
+    worker picks it up; with JOBS_RUN_INLINE it runs before this returns.
+    `attachments` is a sequence of (name, bytes) pairs.
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    with transaction.atomic():
+        job = BackgroundJob.objects.create(kind=kind, payload=payload, created_by=user)
+        JobAttachment.objects.bulk_create(
+            [JobAttachment(job=job, name=name, data=data) for name, data in attachments]
+        )
+
+    if getattr(settings, "JOBS_RUN_INLINE", False):
+        claimed = BackgroundJob.objects.filter(id=job.id, status="Queued").update(
+            status="Running", started_at=timezone.now(), attempts=F("attempts") + 1
+        )
+        if claimed:
+            job.refresh_from_db()
+            execute(job)
+    return job
+
+
+def claim_next_job():
+    """
+    Marks the oldest queued job as Running and returns it, or None if the queue is empty.
+    The conditional UPDATE makes the claim safe with several workers on any database.
+    """
+    candidates = BackgroundJob.objects.filter(status="Queued").order_by("id").values_list("id", flat=True)[:10]
+    for job_id in candidates:
+        claimed = BackgroundJob.objects.filter(id=job_id, status="Queued").update(
+            status="Running", started_at=timezone.now(), attempts=F("attempts") + 1
+        )
+        if claimed:
+            return BackgroundJob.objects.get(id=job_id)
+    return None
+
+
+def execute(job):
+    handler = import_string(JOB_HANDLERS[job.kind])
+    try:
+        job.result = handler(job)
+        job.status = "Done"
+    except JobError as e:
+        job.status = "Failed"
+        job.error = str(e)
+    except Exception as e:
+        logger.exception(f"Job {job.id} ({job.kind}) failed: {e}")
+        job.status = "Failed"
+        job.error = "An unexpected error occurred. Please check the logs."
+    job.finished_at = timezone.now()
+    job.save(update_fields=["result", "status", "error", "finished_at"])
+    # The uploaded files are only needed while the job runs
+    job.attachments.all().delete()
+    return job
+
+
+def max_attempts():
+    return getattr(settings, "JOBS_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS)
+
+
+def requeue_stale_jobs(older_than_seconds):
+    """
+    Puts jobs whose worker died mid-run back on the queue, and marks the ones
+    already started JOBS_MAX_ATTEMPTS times Failed instead: a job that keeps
+    killing its worker would otherwise be retried forever.
+    Returns (requeued, failed) counts.
+    """
+    cutoff = timezone.now() - timedelta(seconds=older_than_seconds)
+    stale = BackgroundJob.objects.filter(status="Running", started_at__lt=cutoff)
+    with transaction.atomic():
+        given_up = list(stale.filter(attempts__gte=max_attempts()).values_list("id", flat=True))
+        failed = BackgroundJob.objects.filter(id__in=given_up, status="Running").update(
+            status="Failed",
+            error=f"The job did not finish after {max_attempts()} attempts.",
+            finished_at=timezone.now(),
+        )
+        JobAttachment.objects.filter(job_id__in=given_up).delete()
+        requeued = stale.update(status="Queued")
+    for job_id in given_up:
+        logger.error(f"Job {job_id} did not finish after {max_attempts()} attempts, marked Failed")
+    return requeued, failed
+
+
+def run_worker(poll_interval=1.0, max_jobs=None, once=False):
+    processed = 0
+    while max_jobs is None or processed < max_jobs:
+        # Long-running process: drop connections the database may have timed out
+        close_old_connections()
+        job = claim_next_job()
+        if job is None:
+            if once:
+                break
+            time.sleep(poll_interval)
+            continue
+        logger.info(f"Running job {job.id} ({job.kind})")
+        execute(job)
+        processed += 1
+    return processed
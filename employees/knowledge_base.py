@@ -0,0 +1,188 @@
+import logging
+import os
+import re
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+
+from .embeddings import get_embedding_backend
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+CHUNK_WORDS = 40  # Roughly two policy sentences per passage
+
+_sentence_re = re.compile(r"(?<=[.!?])\s+")
+
+
+def chunk_text(text, max_words=CHUNK_WORDS):
+    """
+    Splits a policy document into passages of whole sentences, about max_words
+    long, so the QA model only ever reads a few short passages.
+    """
+    sentences = [s.strip() for s in _sentence_re.split(" ".join((text or "").split())) if s.strip()]
+    chunks, current, words = [], [], 0
+    for sentence in sentences:
+        length = len(sentence.split())
+        if current and words + length > max_words:
+            chunks.append(" ".join(current))
+            current, words = [], 0
+        current.append(sentence)
+        words += length
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _backend_namespace(backend):
+    return f"{type(backend).__name__}:{getattr(backend, 'model_name', '')}"
+
+
+class KnowledgeIndex:
+    """
+    Embeddings of every knowledge-base passage held in one (passages, dim)
+    NumPy matrix. Retrieval is a single matrix-vector product followed by a
+    partial sort, so it stays cheap however many policies are added.
+
+    Rows are tagged with the key of the document they came from, so editing a
+    policy only re-embeds that policy's passages.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or get_embedding_backend()
+        self.keys = []        # document key of each row
+        self.texts = []       # passage text of each row
+        self.matrix = np.zeros((0, self.backend.dimension or 0), dtype=np.float32)
+        self.revisions = {}   # document key -> PolicyDocument.revision embedded
+        self.version = None   # KnowledgeBaseVersion this index reflects
+
+    def __len__(self):
+        return len(self.texts)
+
+    def remove_documents(self, keys):
+        keys = set(keys)
+        if not keys:
+            return
+        keep = np.array([key not in keys for key in self.keys], dtype=bool)
+        self.matrix = self.matrix[keep]
+        self.keys = [key for key, kept in zip(self.keys, keep) if kept]
+        self.texts = [text for text, kept in zip(self.texts, keep) if kept]
+        for key in keys:
+            self.revisions.pop(key, None)
+
+    def replace_documents(self, documents):
+        """`documents` is a list of (key, revision, body); their passages are embedded in one batch."""
+        self.remove_documents([key for key, _, _ in documents])
+        keys, texts = [], []
+        for key, revision, body in documents:
+            for chunk in chunk_text(body):
+                keys.append(key)
+                texts.append(chunk)
+            self.revisions[key] = revision
+        if texts:
+            self.matrix = np.vstack([self.matrix, self.backend.embed(texts)])
+            self.keys += keys
+            self.texts += texts
+
+    def sync(self, version=None):
+        """Brings the index in line with the active PolicyDocuments, re-embedding only what changed."""
+        from .models import KnowledgeBaseVersion, PolicyDocument
+
+        version = KnowledgeBaseVersion.current() if version is None else version
+        if version == self.version:
+            return False
+
+        current = dict(PolicyDocument.objects.filter(is_active=True).values_list("key", "revision"))
+        self.remove_documents([key for key in self.revisions if key not in current])
+        stale = [key for key, revision in current.items() if self.revisions.get(key) != revision]
+        if stale:
+            self.replace_documents(list(
+                PolicyDocument.objects.filter(key__in=stale).values_list("key", "revision", "body")
+            ))
+            logger.info(f"Re-embedded {len(stale)} knowledge-base document(s).")
+        self.version = version
+        return True
+
+    def embed_question(self, question):
+        return self.backend.embed([question])[0]
+
+    def search(self, question, top_k=3, query=None):
+        """
+        Returns up to top_k (score, key, passage) tuples, best match first.
+        Pass `query` when the question has already been embedded.
+        """
+        if not self.texts:
+            return []
+        if query is None:
+            query = self.embed_question(question)
+        scores = self.backend.similarity(query, self.matrix)
+        top_k = min(top_k, len(scores))
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best])]
+        return [(float(scores[i]), self.keys[i], self.texts[i]) for i in best]
+
+    def save(self, path):
+        np.savez(
+            path,
+            matrix=self.matrix,
+            keys=np.array(self.keys, dtype=str),
+            texts=np.array(self.texts, dtype=str),
+            revision_keys=np.array(list(self.revisions), dtype=str),
+            revision_values=np.array(list(self.revisions.values()), dtype=np.int64),
+            namespace=np.array(_backend_namespace(self.backend)),
+        )
+
+    def load(self, path):
+        """
+        Loads a saved index; returns False if it is missing or was built with
+        another embedding model. A loaded index may be behind the database,
+        sync() then only re-embeds the documents edited since it was saved.
+        """
+        if not os.path.exists(path):
+            return False
+        with np.load(path) as data:
+            if str(data["namespace"]) != _backend_namespace(self.backend):
+                return False
+            self.matrix = data["matrix"].astype(np.float32)
+            self.keys = [str(key) for key in data["keys"]]
+            self.texts = [str(text) for text in data["texts"]]
+            self.revisions = {
+                str(key): int(revision)
+                for key, revision in zip(data["revision_keys"], data["revision_values"])
+            }
+        self.version = None
+        return True
+
+
+# --- One index per worker process ---
+
+_index = None
+_index_lock = threading.Lock()
+_last_checked = None
+
+
+def index_path():
+    return getattr(settings, "HR_KB_INDEX_PATH", os.path.join(settings.BASE_DIR, "kb_index.npz"))
+
+
+def get_index():
+    """
+    Returns this worker's index, loading the file written by
+    `manage.py build_kb_index` on first use. Every HR_KB_CHECK_INTERVAL
+    seconds the knowledge-base version stamp is compared with the index and,
+    if a policy was edited, just that policy is re-embedded.
+    """
+    global _index, _last_checked
+    interval = getattr(settings, "HR_KB_CHECK_INTERVAL", 5)
+    with _index_lock:
+        if _index is None:
+            index = KnowledgeIndex()
+            if index.load(index_path()):
+                logger.info(f"Loaded knowledge-base index with {len(index)} passages.")
+            _index = index
+        if _last_checked is None or time.monotonic() - _last_checked >= interval:
+            _index.sync()
+            _last_checked = time.monotonic()
+    return _index
@@ -0,0 +1,168 @@
+from datetime import date, timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ValidationError
+
+from .models import MAX_LEAVE_DAYS, LeaveRequest
+
+# Days per calendar year for each leave type; types not listed (Unpaid) have no cap
+DEFAULT_ENTITLEMENTS = {"Annual": 20, "Sick": 10}
+
+# Longest single request accepted; the database enforces MAX_LEAVE_DAYS
+DEFAULT_MAX_LEAVE_DAYS = MAX_LEAVE_DAYS
+
+# Requests that hold days: a pending request is reserved until it is decided
+ACTIVE_STATUSES = ("Pending", "Approved")
+
+
+def entitlements():
+    return getattr(settings, "LEAVE_ENTITLEMENTS", DEFAULT_ENTITLEMENTS)
+
+
+def max_leave_days():
+    # The setting can lower the limit, never raise it past what the database accepts
+    return min(getattr(settings, "LEAVE_MAX_DAYS", DEFAULT_MAX_LEAVE_DAYS), MAX_LEAVE_DAYS)
+
+
+def overlapping(queryset, start, end):
+    """
+    Narrows `queryset` to requests that share at least one day with
+    [start, end]. Bounded by MAX_LEAVE_DAYS, which the leave_length_bounded
+    constraint guarantees for every row, not by the (possibly lower) setting.
+    """
+    return queryset.filter(
+        start_date__gte=start - timedelta(days=MAX_LEAVE_DAYS - 1),
+        start_date__lte=end,
+        end_date__gte=start,
+    )
+
+
+def _days_within(start, end, lower, upper):
+    """Number of days of [start, end] that fall inside [lower, upper]."""
+    return max((min(end, upper) - max(start, lower)).days + 1, 0)
+
+
+def _year_bounds(year):
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+# -------------------
+# Balances
+# -------------------
+def leave_balance(employee, year=None):
+    """
+    Used, pending and remaining days per leave type for one calendar year,
+    from a single query. Requests that cross New Year count towards each
+    year only for the days that fall in it.
+    """
+    year = year or date.today().year
+    first, last = _year_bounds(year)
+    rows = overlapping(
+        LeaveRequest.objects.filter(employee=employee, status__in=ACTIVE_STATUSES), first, last
+    ).values_list("leave_type", "status", "start_date", "end_date")
+
+    balance = {
+        leave_type: {"label": label, "entitlement": entitlements().get(leave_type), "used": 0, "pending": 0}
+        for leave_type, label in LeaveRequest.LEAVE_TYPE_CHOICES
+    }
+    for leave_type, status, start, end in rows:
+        bucket = "used" if status == "Approved" else "pending"
+        balance[leave_type][bucket] += _days_within(start, end, first, last)
+
+    for entry in balance.values():
+        if entry["entitlement"] is None:
+            entry["remaining"] = None
+        else:
+            entry["remaining"] = max(entry["entitlement"] - entry["used"] - entry["pending"], 0)
+    return balance
+
+
+# -------------------
+# Validation
+# -------------------
+def validate_leave_request(employee, leave_type, start, end, exclude_id=None):
+    """
+    Raises ValidationError if the request is too long, overlaps one of the
+    employee's pending or approved requests, or needs more days than are
+    left of the entitlement in any year it touches.
+    """
+    length = (end - start).days + 1
+    if length > max_leave_days():
+        raise ValidationError(
+            f"A single leave request can cover at most {max_leave_days()} days; this one covers {length}."
+        )
+
+    active = LeaveRequest.objects.filter(employee=employee, status__in=ACTIVE_STATUSES)
+    if exclude_id is not None:
+        active = active.exclude(id=exclude_id)
+
+    clash = overlapping(active, start, end).order_by("start_date").first()
+    if clash is not None:
+        raise ValidationError(
+            f"These dates overlap your {clash.status.lower()} leave from "
+            f"{clash.start_date:%b %d, %Y} to {clash.end_date:%b %d, %Y}."
+        )
+
+    entitlement = entitlements().get(leave_type)
+    if entitlement is None:
+        return
+    for year in range(start.year, end.year + 1):
+        first, last = _year_bounds(year)
+        requested = _days_within(start, end, first, last)
+        remaining = leave_balance(employee, year)[leave_type]["remaining"]
+        if requested > remaining:
+            raise ValidationError(
+                f"You asked for {requested} day(s) of {leave_type.lower()} leave in {year} "
+                f"but only {remaining} remain."
+            )
+
+
+# -------------------
+# Department coverage
+# -------------------
+def _merge_intervals(rows):
+    """
+    Merges each employee's intervals so one person on two overlapping
+    requests is still counted once. `rows` is (employee_id, start, end).
+    """
+    merged = []
+    for employee_id, start, end in sorted(rows):
+        if merged and merged[-1][0] == employee_id and start <= merged[-1][2] + timedelta(days=1):
+            if end > merged[-1][2]:
+                merged[-1][2] = end
+        else:
+            merged.append([employee_id, start, end])
+    return merged
+
+
+def department_coverage(department, start, end, include_pending=False):
+    """
+    Returns [(day, people_off), ...] for every day in [start, end].
+
+    The candidate intervals come from one bounded range scan (see
+    MAX_LEAVE_DAYS), so the cost grows with the leave taken around the
+    window rather than with the department's whole history. Counting is a
+    sorted sweep: +1 where an interval opens, -1 the day after it closes,
+    then a cumulative sum over the window.
+    """
+    statuses = ACTIVE_STATUSES if include_pending else ("Approved",)
+    rows = overlapping(
+        LeaveRequest.objects.filter(status__in=statuses, employee__department=department), start, end
+    ).values_list("employee_id", "start_date", "end_date")
+
+    days = (end - start).days + 1
+    opens = np.zeros(days + 1, dtype=np.int64)
+    for _, first, last in _merge_intervals(rows):
+        opens[(max(first, start) - start).days] += 1
+        opens[(min(last, end) - start).days + 1] -= 1
+    counts = np.cumsum(opens[:-1])
+    return [(start + timedelta(days=offset), int(count)) for offset, count in enumerate(counts)]
+
+
+def quarter_bounds(day):
+    first_month = 3 * ((day.month - 1) // 3) + 1
+    first = date(day.year, first_month, 1)
+    if first_month == 10:
+        return first, date(day.year, 12, 31)
+    return first, date(day.year, first_month + 3, 1) - timedelta(days=1)
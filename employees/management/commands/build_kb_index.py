@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from employees.knowledge_base import KnowledgeIndex, index_path
+
+
+class Command(BaseCommand):
+    help = "Embeds the HR policy documents and saves the retrieval index so workers can load it at startup."
+
+    def handle(self, *args, **options):
+        index = KnowledgeIndex()
+        index.sync()
+        path = index_path()
+        index.save(path)
+        self.stdout.write(self.style.SUCCESS(
+            f"Saved {len(index)} passages from {len(index.revisions)} documents to {path}."
+        ))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from employees.query_audit import explain, hot_queries
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs EXPLAIN on the queries behind the busiest pages and jobs and flags the ones that read a "
+        "whole table. Works on MySQL and SQLite."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--only", action="append", default=[], help="Only queries whose name contains this (repeatable).")
+        parser.add_argument("--plans", action="store_true", help="Print every plan, not just the flagged ones.")
+        parser.add_argument("--strict", action="store_true", help="Exit with an error if any query does a full table scan (for CI).")
+
+    def handle(self, *args, **options):
+        queries = [
+            (name, queryset) for name, queryset in hot_queries()
+            if not options["only"] or any(part.lower() in name.lower() for part in options["only"])
+        ]
+        if not queries:
+            raise CommandError("No hot query matches --only.")
+
+        flagged = 0
+        self.stdout.write(f"EXPLAIN on {connection.vendor} ({connection.settings_dict['NAME']}):")
+        for name, queryset in queries:
+            plan, full_scans, notes = explain(queryset)
+            if full_scans:
+                flagged += 1
+                self.stdout.write(self.style.WARNING(f"  FULL SCAN  {name}: {', '.join(sorted(set(full_scans)))}"))
+            else:
+                self.stdout.write(f"  ok         {name}")
+            for note in dict.fromkeys(notes):
+                self.stdout.write(f"               {note}")
+            if full_scans or options["plans"]:
+                self.stdout.write("\n".join(f"               | {line}" for line in plan.splitlines()))
+
+        summary = f"{flagged} of {len(queries)} queries read a whole table."
+        if flagged and options["strict"]:
+            raise CommandError(summary)
+        self.stdout.write(self.style.WARNING(summary) if flagged else self.style.SUCCESS(summary))
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from employees.importer import EmployeeImportError, import_employees
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates users and employee profiles from a CSV file with a header row. Columns: username (required), "
+        "email, first_name, last_name, role, department, salary, password."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file to import.")
+        parser.add_argument("--dry-run", action="store_true", help="Validate every row without creating anything.")
+        parser.add_argument("--batch-size", type=int, default=None, help="Rows per INSERT.")
+        parser.add_argument("--processes", type=int, default=None, help="Processes used to hash passwords (default EMPLOYEE_IMPORT_PROCESSES, 0 or 1 for none).")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options["path"], newline="", encoding="utf-8-sig") as stream:
+                result = import_employees(
+                    stream,
+                    batch_size=options["batch_size"],
+                    processes=options["processes"],
+                    dry_run=options["dry_run"],
+                )
+        except (OSError, UnicodeDecodeError, EmployeeImportError) as e:
+            raise CommandError(str(e))
+
+        for line, message in result["errors"]:
+            self.stderr.write(f"Line {line}: {message}")
+        verb = "would be imported" if options["dry_run"] else "imported"
+        style = self.style.WARNING if result["errors"] else self.style.SUCCESS
+        self.stdout.write(style(
+            f"{result['created']} of {result['rows']} row(s) {verb}, {len(result['errors'])} error(s)."
+        ))
@@ -0,0 +1,37 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from employees.attendance_summary import rebuild_summaries, reconcile_summaries
+
+
+class Command(BaseCommand):
+    help = (
+        "Reconciles the attendance rollup tables with the raw attendance rows, rewriting only rows "
+        "that drifted. Use --full to rebuild them from scratch."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Delete both rollups and recompute everything.")
+        parser.add_argument("--check", action="store_true", help="Only report drift; change nothing.")
+        parser.add_argument("--since", type=date.fromisoformat, default=None, help="First day to reconcile (YYYY-MM-DD).")
+        parser.add_argument("--until", type=date.fromisoformat, default=None, help="Last day to reconcile (YYYY-MM-DD).")
+
+    def handle(self, *args, **options):
+        if options["full"]:
+            if options["check"] or options["since"] or options["until"]:
+                raise CommandError("--full rebuilds everything and cannot be combined with --check, --since or --until.")
+            rebuild_summaries()
+            self.stdout.write(self.style.SUCCESS("Rebuilt the attendance summaries."))
+            return
+
+        drift = reconcile_summaries(options["since"], options["until"], fix=not options["check"])
+        for table, counts in drift.items():
+            self.stdout.write(
+                f"{table}: {counts['missing']} missing, {counts['changed']} changed, {counts['extra']} extra"
+            )
+        total = sum(sum(counts.values()) for counts in drift.values())
+        if options["check"]:
+            self.stdout.write(self.style.WARNING(f"{total} row(s) drifted.") if total else self.style.SUCCESS("No drift."))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Reconciled {total} row(s)."))
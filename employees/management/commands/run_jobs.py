@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+
+from employees.jobs import requeue_stale_jobs, run_worker
+
+
+class Command(BaseCommand):
+    help = "Runs queued background jobs (resume screening, ...). Start one or more of these next to the web workers."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit as soon as the queue is empty.")
+        parser.add_argument("--max-jobs", type=int, default=None, help="Exit after running this many jobs.")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument(
+            "--requeue-after",
+            type=int,
+            default=900,
+            help=(
+                "On startup, put jobs that have been Running for this many seconds back on the queue "
+                "(or mark them Failed after JOBS_MAX_ATTEMPTS)."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        requeued, failed = requeue_stale_jobs(options["requeue_after"])
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale job(s).")
+        if failed:
+            self.stdout.write(self.style.WARNING(f"Gave up on {failed} job(s) that did not finish after repeated attempts."))
+
+        processed = run_worker(
+            poll_interval=options["poll_interval"],
+            max_jobs=options["max_jobs"],
+            once=options["once"],
+        )
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} job(s)."))
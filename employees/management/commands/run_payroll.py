@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from employees.payroll import PayrollError, parse_month, run_payroll
+
+
+class Command(BaseCommand):
+    help = "Generates the payroll for every employee for one month (default: the current month)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--month", default=None, help="Pay period as YYYY-MM.")
+        parser.add_argument("--replace", action="store_true", help="Overwrite the month's payroll if it was already run.")
+        parser.add_argument("--batch-size", type=int, default=None, help="Rows per INSERT.")
+
+    def handle(self, *args, **options):
+        try:
+            month = parse_month(options["month"]) if options["month"] else timezone.localdate().replace(day=1)
+            summary = run_payroll(month, replace=options["replace"], batch_size=options["batch_size"])
+        except PayrollError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"Payroll for {summary['month']}: {summary['employees']} employees, "
+            f"gross {summary['gross']:.2f}, deductions {summary['deductions']:.2f}, net {summary['net']:.2f}."
+        ))
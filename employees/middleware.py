@@ -1,10 +1,169 @@
 # employees/middleware.py
+import logging
+import time
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_vary_headers, set_response_etag
 from django.utils.deprecation import MiddlewareMixin
 from django.shortcuts import redirect
 
-class NoCacheMiddleware(MiddlewareMixin):
+from .request_metrics import (
+    DEFAULT_NPLUSONE_THRESHOLD, current_record, finish_request, get_request_stats, instrument_queries, start_request,
+)
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# First matching rule wins. A rule matches on any of:
+#   url_names      - names of the resolved URL pattern
+#   authenticated  - True / False for logged-in / anonymous users
+#   content_types  - prefixes of the response Content-Type
+# and sets `cache_control`; `etag: True` also adds an ETag and answers
+# matching If-None-Match requests with 304 Not Modified.
+# Static files never get here: WhiteNoise serves them first, with
+# immutable caching for the hashed (versioned) file names.
+DEFAULT_CACHE_POLICY_RULES = [
+    {"url_names": ["readiness"], "cache_control": "no-store"},
+    {"authenticated": True, "cache_control": "private, no-store"},
+    {"url_names": ["home"], "authenticated": False, "cache_control": "public, max-age=300", "etag": True},
+]
+DEFAULT_CACHE_POLICY = "private, no-store"
+
+
+def _matches(rule, request, response):
+    if "url_names" in rule:
+        match = getattr(request, "resolver_match", None)
+        if match is None or match.url_name not in rule["url_names"]:
+            return False
+    if "authenticated" in rule:
+        user = getattr(request, "user", None)
+        if bool(user is not None and user.is_authenticated) != rule["authenticated"]:
+            return False
+    if "content_types" in rule:
+        content_type = response.get("Content-Type", "")
+        if not any(content_type.startswith(prefix) for prefix in rule["content_types"]):
+            return False
+    return True
+
+
+def _belongs_to_one_visitor(request, response):
+    """
+    True for a response a shared cache must not replay to anyone else: it
+    sets a cookie (session, CSRF, flash messages) or changed the session.
+    Only reliable above SessionMiddleware and MessageMiddleware, which add
+    their cookies on the way out.
+    """
+    session = getattr(request, "session", None)
+    return bool(
+        response.cookies
+        or request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+        or (session is not None and session.modified)
+    )
+
+
+class CachePolicyMiddleware(MiddlewareMixin):
+    """
+    Sets Cache-Control from CACHE_POLICY_RULES (see DEFAULT_CACHE_POLICY_RULES).
+    Responses that no rule matches get CACHE_POLICY_DEFAULT. A Cache-Control
+    header set by the view itself (e.g. @never_cache) is left alone, and a
+    response is never made shareable if it carries a CSRF token or sets a
+    cookie, since those belong to one visitor. Install it above the session,
+    CSRF and messages middleware so their cookies are already on the
+    response when it looks.
+    """
+
     def process_response(self, request, response):
-        response['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
-        response['Pragma'] = 'no-cache'
-        response['Expires'] = '0'
+        if response.has_header("Cache-Control"):
+            return response
+
+        rules = getattr(settings, "CACHE_POLICY_RULES", DEFAULT_CACHE_POLICY_RULES)
+        rule = next((rule for rule in rules if _matches(rule, request, response)), None)
+        cache_control = rule["cache_control"] if rule else getattr(settings, "CACHE_POLICY_DEFAULT", DEFAULT_CACHE_POLICY)
+
+        if "public" in cache_control and _belongs_to_one_visitor(request, response):
+            cache_control = DEFAULT_CACHE_POLICY
+            rule = None
+
+        response["Cache-Control"] = cache_control
+        if "no-store" in cache_control:
+            response["Pragma"] = "no-cache"
+            response["Expires"] = "0"
+            return response
+
+        # The page differs for logged-in users, so shared caches must key on the session cookie
+        patch_vary_headers(response, ("Cookie",))
+        if (
+            rule and rule.get("etag")
+            and request.method in ("GET", "HEAD")
+            and response.status_code == 200
+            and not response.streaming
+        ):
+            if not response.has_header("ETag"):
+                set_response_etag(response)
+            return get_conditional_response(request, etag=response["ETag"], response=response)
+        return response
+
+
+class RequestMetricsMiddleware:
+    """
+    Records query count, DB time, template render time and total latency
+    per URL name into rolling windows (see employees.request_metrics) and
+    logs a warning when one query shape runs REQUEST_METRICS_NPLUSONE_THRESHOLD
+    or more times in a request, the usual sign of a loop doing a lookup per row.
+
+    Admins (and everyone when DEBUG is on) also get the figures back in a
+    Server-Timing header, which browser dev tools show under Timing.
+
+    A streamed body (the CSV exports) runs most of its queries while the
+    server sends it, so such a request is recorded when the stream ends; its
+    Server-Timing header, sent first, covers only the view.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.threshold = getattr(settings, "REQUEST_METRICS_NPLUSONE_THRESHOLD", DEFAULT_NPLUSONE_THRESHOLD)
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        token = start_request()
+        try:
+            with instrument_queries():
+                response = self.get_response(request)
+            record = current_record()
+        finally:
+            finish_request(token)
+        total = time.perf_counter() - started
+
+        # A file is already complete (and may be sent with sendfile); an async body is left unmeasured
+        if response.streaming and getattr(response, "file_to_stream", None) is None and not response.is_async:
+            response.streaming_content = self._measured_stream(request, response.streaming_content, record, started)
+        else:
+            self._record(request, record, total)
+
+        user = getattr(request, "user", None)
+        if settings.DEBUG or getattr(user, "role", None) == "Admin":
+            response["Server-Timing"] = ", ".join([
+                f'db;dur={record.db_seconds * 1000:.1f};desc="{record.queries} queries"',
+                f"tpl;dur={record.template_seconds * 1000:.1f}",
+                f"total;dur={total * 1000:.1f}",
+            ])
         return response
+
+    def _measured_stream(self, request, content, record, started):
+        # Runs as the server iterates the body, so the queries it makes land in the same record
+        token = start_request(record)
+        try:
+            with instrument_queries():
+                yield from content
+        finally:
+            finish_request(token)
+            self._record(request, record, time.perf_counter() - started)
+
+    def _record(self, request, record, total):
+        match = getattr(request, "resolver_match", None)
+        # Never the raw path: unknown URLs must not grow the table without bound
+        url_name = (match.view_name if match and match.url_name else None) or "<unresolved>"
+        suspects = record.suspected_n_plus_one(self.threshold)
+        for shape, count in suspects:
+            logger.warning(f"Suspected N+1 in {url_name}: {count}x {shape[:300]}")
+        get_request_stats().add(url_name, record, total, suspects)
@@ -0,0 +1,49 @@
+from django.db import migrations
+
+# The policies that used to live in ai_chatbot.KNOWLEDGE_BASE
+POLICIES = [
+    (
+        'leave_policy',
+        'Leave Policy',
+        "Our company's official leave policy states that all full-time employees are entitled to 20 days of annual paid leave. Sick leave is granted for up to 10 days per year with a doctor's note. Maternity leave is 12 weeks, and paternity leave is 2 weeks. All leave requests must be submitted through the HRMS portal at least one week in advance for annual leave.",
+    ),
+    (
+        'payroll_information',
+        'Payroll Information',
+        'Salaries are processed on the 25th of each month and are paid out on the 28th. Payslips are available for download in the HRMS portal on the 27th. For any payroll discrepancies, please contact the HR department by emailing hr@company.com. Bonuses are typically paid out in the December payroll cycle.',
+    ),
+    (
+        'attendance_policy',
+        'Attendance Policy',
+        'Employees are expected to mark their attendance daily through the HRMS portal upon starting their workday. The standard work hours are from 9:00 AM to 5:30 PM, with a 30-minute lunch break. Remote employees must also mark their attendance online. Failure to mark attendance for three consecutive days without notification may be considered an unauthorized absence.',
+    ),
+    (
+        'expense_reports',
+        'Expense Reports',
+        "To submit an expense report, employees must use the 'Expenses' section of the HRMS portal. All claims must be accompanied by a valid digital receipt. Reimbursements for approved expenses are processed within 5 business days and are paid with the next salary cycle.",
+    ),
+]
+
+
+def seed_policies(apps, schema_editor):
+    PolicyDocument = apps.get_model("employees", "PolicyDocument")
+    KnowledgeBaseVersion = apps.get_model("employees", "KnowledgeBaseVersion")
+    for key, title, body in POLICIES:
+        PolicyDocument.objects.get_or_create(key=key, defaults={"title": title, "body": body, "revision": 1})
+    KnowledgeBaseVersion.objects.update_or_create(pk=1, defaults={"version": 1})
+
+
+def remove_policies(apps, schema_editor):
+    PolicyDocument = apps.get_model("employees", "PolicyDocument")
+    PolicyDocument.objects.filter(key__in=[key for key, _, _ in POLICIES]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0006_policydocument'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_policies, remove_policies),
+    ]
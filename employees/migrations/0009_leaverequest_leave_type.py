@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0008_leave_console_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='leaverequest',
+            name='leave_type',
+            field=models.CharField(choices=[('Annual', 'Annual Leave'), ('Sick', 'Sick Leave'), ('Unpaid', 'Unpaid Leave')], default='Annual', max_length=10),
+        ),
+    ]
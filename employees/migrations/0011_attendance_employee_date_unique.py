@@ -0,0 +1,45 @@
+from django.db import migrations, models
+from django.db.models import Count, F, Min
+
+
+def delete_duplicate_attendance(apps, schema_editor):
+    """
+    Keeps the first row of every (employee, date) marked more than once and
+    deletes the rest, taking them back out of the attendance rollups too.
+    """
+    Attendance = apps.get_model("employees", "Attendance")
+    AttendanceDailySummary = apps.get_model("employees", "AttendanceDailySummary")
+    AttendanceMonthlySummary = apps.get_model("employees", "AttendanceMonthlySummary")
+
+    duplicated = list(
+        Attendance.objects.values("employee_id", "date")
+        .annotate(n=Count("id"), keep=Min("id"))
+        .filter(n__gt=1)
+        .values_list("employee_id", "date", "keep")
+    )
+    for employee_id, day, keep in duplicated:
+        extra = Attendance.objects.filter(employee_id=employee_id, date=day).exclude(id=keep)
+        for department, status in extra.values_list("employee__department", "status"):
+            daily_field, monthly_field = ("present", "present_days") if status == "Present" else ("absent", "absent_days")
+            AttendanceDailySummary.objects.filter(
+                date=day, department=department or "", **{f"{daily_field}__gt": 0}
+            ).update(**{daily_field: F(daily_field) - 1})
+            AttendanceMonthlySummary.objects.filter(
+                employee_id=employee_id, month=day.replace(day=1), **{f"{monthly_field}__gt": 0}
+            ).update(**{monthly_field: F(monthly_field) - 1})
+        extra.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0010_attendance_summaries'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_attendance, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='attendance',
+            constraint=models.UniqueConstraint(fields=('employee', 'date'), name='attendance_employee_date_uniq'),
+        ),
+    ]
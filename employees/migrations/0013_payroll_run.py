@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0012_attendance_clock_sessions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayrollAdjustment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('kind', models.CharField(choices=[('Bonus', 'Bonus'), ('Deduction', 'Deduction')], max_length=10)),
+                ('amount', models.FloatField()),
+                ('note', models.CharField(blank=True, max_length=200)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='payroll',
+            index=models.Index(fields=['month', 'employee'], name='payroll_month_emp_idx'),
+        ),
+        migrations.AddField(
+            model_name='payrolladjustment',
+            name='employee',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='payroll_adjustments', to='employees.employeeprofile'),
+        ),
+        migrations.AddIndex(
+            model_name='payrolladjustment',
+            index=models.Index(fields=['month', 'employee'], name='payroll_adjust_month_emp_idx'),
+        ),
+    ]
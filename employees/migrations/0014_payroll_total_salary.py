@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:57
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0013_payroll_run'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='payroll',
+            name='total_salary',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.expressions.CombinedExpression(django.db.models.expressions.CombinedExpression(models.F('base_salary'), '+', models.F('bonus')), '-', models.F('deductions')), output_field=models.FloatField()),
+        ),
+        migrations.AddIndex(
+            model_name='payroll',
+            index=models.Index(fields=['month', '-total_salary'], name='payroll_month_total_idx'),
+        ),
+    ]
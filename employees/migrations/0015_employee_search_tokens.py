@@ -0,0 +1,54 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:08
+
+import re
+import unicodedata
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of the tokenizer in employees/directory.py as it was when the
+# table was added, so later changes to it cannot change what this migration does
+_split_re = re.compile(r"[^0-9a-z]+")
+
+
+def tokens_for(username, first_name, last_name, email, department):
+    text = " ".join([username, first_name, last_name, email, department or ""])
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode().lower()
+    return {word[:100] for word in _split_re.split(text) if word}
+
+
+def index_existing_employees(apps, schema_editor):
+    EmployeeProfile = apps.get_model("employees", "EmployeeProfile")
+    EmployeeSearchToken = apps.get_model("employees", "EmployeeSearchToken")
+    rows = EmployeeProfile.objects.order_by("id").values_list(
+        "id", "user__username", "user__first_name", "user__last_name", "user__email", "department"
+    )
+    batch = []
+    for employee_id, *fields in rows.iterator(chunk_size=2000):
+        batch.extend(EmployeeSearchToken(employee_id=employee_id, token=token) for token in tokens_for(*fields))
+        if len(batch) >= 2000:
+            EmployeeSearchToken.objects.bulk_create(batch)
+            batch = []
+    EmployeeSearchToken.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0014_payroll_total_salary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmployeeSearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=100)),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='employees.employeeprofile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['token', 'employee'], name='employee_search_token_idx')],
+            },
+        ),
+        migrations.RunPython(index_existing_employees, migrations.RunPython.noop),
+    ]
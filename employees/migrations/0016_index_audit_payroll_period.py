@@ -0,0 +1,151 @@
+import logging
+from datetime import datetime
+
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+# Payroll.month used to be free text; payroll runs wrote "YYYY-MM", older
+# rows may have been typed in by hand.
+MONTH_FORMATS = ("%Y-%m", "%Y-%m-%d", "%Y/%m", "%m/%Y", "%B %Y", "%b %Y")
+
+
+def _parse_pay_period(value):
+    text = (value or "").strip()
+    for fmt in MONTH_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().replace(day=1)
+        except ValueError:
+            continue
+    return None
+
+
+def _month_periods(Payroll):
+    """{month text: first day of the period} for every distinct value in the table."""
+    values = Payroll.objects.order_by().values_list("month", flat=True).distinct()
+    return {value: _parse_pay_period(value) for value in values}
+
+
+def check_and_dedupe_pay_periods(apps, schema_editor):
+    """
+    Runs before any schema change: MySQL commits DDL as it goes, so failing
+    after it would leave the table half migrated and the re-run would trip
+    over the indexes and column already changed.
+
+    Refuses values that are not a month, then keeps only the newest row of
+    any (employee, period) that was paid twice, e.g. as "2024-01" and
+    "Jan 2024", so the unique constraint can be added. Every row removed is
+    logged as a warning with its amounts.
+    """
+    Payroll = apps.get_model("employees", "Payroll")
+
+    periods = _month_periods(Payroll)
+    unparseable = [value for value, period in periods.items() if period is None]
+    if unparseable:
+        raise ValueError(
+            "Payroll.month values that are not a month (use YYYY-MM), fix them and migrate again: "
+            + ", ".join(repr(value) for value in unparseable[:20])
+        )
+
+    # One employee's rows at a time, oldest first, so a later row replaces an earlier one
+    rows = Payroll.objects.order_by("employee_id", "id").values_list("employee_id", "id", "month")
+    current, newest, removed = None, {}, []
+    for employee_id, row_id, month in rows.iterator(chunk_size=2000):
+        if employee_id != current:
+            current, newest = employee_id, {}
+        period = periods[month]
+        if period in newest:
+            removed.append(newest[period])
+        newest[period] = row_id
+
+    for start in range(0, len(removed), 500):
+        duplicates = Payroll.objects.filter(id__in=removed[start:start + 500])
+        # Logged in full so a payslip dropped here can be put back by hand
+        for row in duplicates.values("id", "employee_id", "month", "base_salary", "bonus", "deductions"):
+            logger.warning(f"Removing duplicate payroll row: {row}")
+        duplicates.delete()
+
+
+def convert_pay_periods(apps, schema_editor):
+    """Fills the new date column from the old text one, one UPDATE per distinct value."""
+    Payroll = apps.get_model("employees", "Payroll")
+    for value, period in _month_periods(Payroll).items():
+        Payroll.objects.filter(month=value).update(period=period)
+
+
+def restore_month_labels(apps, schema_editor):
+    Payroll = apps.get_model("employees", "Payroll")
+    for period in list(Payroll.objects.order_by().values_list("period", flat=True).distinct()):
+        Payroll.objects.filter(period=period).update(month=f"{period:%Y-%m}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0015_employee_search_tokens'),
+    ]
+
+    operations = [
+        # Payroll: "YYYY-MM" text -> first day of the pay period, one row per employee and period.
+        # Everything that can refuse the data comes before the first schema change.
+        migrations.RunPython(check_and_dedupe_pay_periods, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='payroll',
+            name='payroll_month_emp_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='payroll',
+            name='payroll_month_total_idx',
+        ),
+        # Nullable first, so migrating backwards can re-add the column before refilling it
+        migrations.AlterField(
+            model_name='payroll',
+            name='month',
+            field=models.CharField(max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='payroll',
+            name='period',
+            field=models.DateField(null=True),
+        ),
+        migrations.RunPython(convert_pay_periods, restore_month_labels),
+        migrations.RemoveField(
+            model_name='payroll',
+            name='month',
+        ),
+        migrations.RenameField(
+            model_name='payroll',
+            old_name='period',
+            new_name='month',
+        ),
+        migrations.AlterField(
+            model_name='payroll',
+            name='month',
+            field=models.DateField(),
+        ),
+        migrations.AddIndex(
+            model_name='payroll',
+            index=models.Index(fields=['month', '-total_salary'], name='payroll_month_total_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='payroll',
+            constraint=models.UniqueConstraint(fields=('employee', 'month'), name='payroll_employee_month_uniq'),
+        ),
+        # Indexes for the filters and orderings the views, admin and reports use
+        migrations.AddIndex(
+            model_name='attendancemonthlysummary',
+            index=models.Index(fields=['month'], name='attendance_monthly_month_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='employeeprofile',
+            index=models.Index(fields=['department'], name='employee_department_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['employee', 'start_date'], name='leave_emp_start_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['employee', '-created_at'], name='leave_emp_created_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:25
+
+import datetime
+import django.db.models.expressions
+from django.db import migrations, models
+
+# Frozen copy of employees.models.MAX_LEAVE_DAYS
+MAX_LEAVE_DAYS = 120
+
+
+def check_leave_lengths(apps, schema_editor):
+    """Names the requests the constraint would reject instead of failing on the first one."""
+    LeaveRequest = apps.get_model("employees", "LeaveRequest")
+    invalid = [
+        leave for leave in LeaveRequest.objects.only("id", "start_date", "end_date").iterator()
+        if not 0 <= (leave.end_date - leave.start_date).days < MAX_LEAVE_DAYS
+    ]
+    if invalid:
+        raise ValueError(
+            f"Leave requests that end before they start or cover more than {MAX_LEAVE_DAYS} days, "
+            "split or fix them and migrate again: "
+            + ", ".join(f"#{leave.id} ({leave.start_date} to {leave.end_date})" for leave in invalid[:20])
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0016_index_audit_payroll_period'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_leave_lengths, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='leaverequest',
+            constraint=models.CheckConstraint(condition=models.Q(('end_date__gte', models.F('start_date')), ('end_date__lt', django.db.models.expressions.CombinedExpression(models.F('start_date'), '+', models.Value(datetime.timedelta(days=120))))), name='leave_length_bounded'),
+        ),
+    ]
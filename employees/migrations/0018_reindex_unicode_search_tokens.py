@@ -0,0 +1,47 @@
+import re
+import unicodedata
+
+from django.db import migrations
+
+# Frozen copy of the tokenizer in employees/directory.py: case-folded words
+# with accents removed, letters of non-Latin scripts kept
+_split_re = re.compile(r"[\W_]+")
+
+
+def tokens_for(username, first_name, last_name, email, department):
+    text = " ".join([username, first_name, last_name, email, department or ""])
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return {word[:100] for word in _split_re.split(text) if word}
+
+
+def reindex_non_ascii_employees(apps, schema_editor):
+    """
+    Tokens only change for text that is not plain ASCII (names in other
+    scripts used to get no tokens at all), so only those employees are redone.
+    """
+    EmployeeProfile = apps.get_model("employees", "EmployeeProfile")
+    EmployeeSearchToken = apps.get_model("employees", "EmployeeSearchToken")
+    rows = EmployeeProfile.objects.order_by("id").values_list(
+        "id", "user__username", "user__first_name", "user__last_name", "user__email", "department"
+    )
+    tokens = {}
+    for employee_id, *fields in rows.iterator(chunk_size=2000):
+        if not all((field or "").isascii() for field in fields):
+            tokens[employee_id] = tokens_for(*fields)
+    EmployeeSearchToken.objects.filter(employee_id__in=list(tokens)).delete()
+    EmployeeSearchToken.objects.bulk_create(
+        [EmployeeSearchToken(employee_id=employee_id, token=token) for employee_id, words in tokens.items() for token in words],
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('employees', '0017_leave_length_bounded'),
+    ]
+
+    operations = [
+        migrations.RunPython(reindex_non_ascii_employees, migrations.RunPython.noop),
+    ]
@@ -1,7 +1,18 @@
+from datetime import timedelta
+
+from django.core.exceptions import ValidationError
 from django.db import models
 from users.models import CustomUser
 from django.utils import timezone
 
+# Longest single leave request the database accepts (LEAVE_MAX_DAYS can only
+# lower it). Bounding leave length is what keeps interval lookups cheap: a
+# request overlapping [start, end] must have started within MAX_LEAVE_DAYS
+# before `start`, so every query is a short range scan on the
+# (status, start_date) / (start_date, end_date) indexes instead of a scan of
+# the whole leave history. See employees.leave_ledger.overlapping.
+MAX_LEAVE_DAYS = 120
+
 
 class EmployeeProfile(models.Model):
     user = models.OneToOneField(CustomUser, on_delete=models.CASCADE)  # no default
@@ -9,29 +20,152 @@ class EmployeeProfile(models.Model):
     salary = models.FloatField(default=0.0)
     performance_score = models.FloatField(default=0)
 
+    class Meta:
+        indexes = [
+            # Department filters: admin list_filter, reports, exports, leave coverage
+            models.Index(fields=['department'], name='employee_department_idx'),
+        ]
+
     def __str__(self):
         return self.user.username
 
+
+class EmployeeSearchToken(models.Model):
+    """
+    One normalized word of an employee's username, name, email or department
+    (see employees.directory). Prefix searches become index range scans on
+    (token, employee) instead of icontains scans over the joined tables.
+    """
+    employee = models.ForeignKey(EmployeeProfile, on_delete=models.CASCADE, related_name='search_tokens')
+    token = models.CharField(max_length=100)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['token', 'employee'], name='employee_search_token_idx'),
+        ]
+
+    def __str__(self):
+        return self.token
+
 class Attendance(models.Model):
+    STATUS_CHOICES = [('Present', 'Present'), ('Absent', 'Absent')]
+
     employee = models.ForeignKey(EmployeeProfile, on_delete=models.CASCADE, related_name='attendance_records')  # no default
     date = models.DateField(auto_now_add=True)
-    status = models.CharField(max_length=10, choices=[('Present', 'Present'), ('Absent', 'Absent')])
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES)
+    # Clock-in/out for the day live on the day's row: [[start, end], ...] in
+    # seconds since midnight, end is null while clocked in
+    sessions = models.JSONField(default=list, blank=True)
+    check_in = models.TimeField(null=True, blank=True)   # first clock-in
+    check_out = models.TimeField(null=True, blank=True)  # last clock-out
+    worked_seconds = models.PositiveIntegerField(default=0)  # closed sessions only
+
+    class Meta:
+        indexes = [
+            # Keyset pagination of the attendance report walks (date, id) newest first
+            models.Index(fields=['-date', '-id'], name='attendance_date_id_idx'),
+            models.Index(fields=['employee', '-date', '-id'], name='attendance_emp_date_id_idx'),
+            models.Index(fields=['status', '-date', '-id'], name='attendance_status_date_idx'),
+        ]
+        constraints = [
+            # One mark per employee per day, enforced by the database rather than a check-then-insert
+            models.UniqueConstraint(fields=['employee', 'date'], name='attendance_employee_date_uniq'),
+        ]
+
+    @property
+    def is_clocked_in(self):
+        return bool(self.sessions) and self.sessions[-1][1] is None
+
+    @property
+    def worked_hours(self):
+        return round(self.worked_seconds / 3600, 2)
 
     def __str__(self):
         return f"{self.employee.user.username} - {self.date} - {self.status}"
 
+
+# Attendance rollups, kept up to date by mark_attendance and rebuilt or
+# reconciled by `manage.py rebuild_attendance_summaries`
+
+class AttendanceDailySummary(models.Model):
+    date = models.DateField()
+    department = models.CharField(max_length=100, blank=True, default="")
+    present = models.PositiveIntegerField(default=0)
+    absent = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'department'], name='attendance_daily_date_dept_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.department or '-'}: {self.present} present / {self.absent} absent"
+
+
+class AttendanceMonthlySummary(models.Model):
+    employee = models.ForeignKey(EmployeeProfile, on_delete=models.CASCADE, related_name='attendance_months')
+    month = models.DateField()  # first day of the month
+    present_days = models.PositiveIntegerField(default=0)
+    absent_days = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['employee', 'month'], name='attendance_monthly_emp_month_uniq'),
+        ]
+        indexes = [
+            # The payroll run reads one month for everybody
+            models.Index(fields=['month'], name='attendance_monthly_month_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee.user.username} - {self.month:%Y-%m}"
+
 class Payroll(models.Model):
     employee = models.ForeignKey(EmployeeProfile, on_delete=models.CASCADE)  # no default
-    month = models.CharField(max_length=20)
+    month = models.DateField()  # first day of the pay period
     base_salary = models.FloatField()
     bonus = models.FloatField(default=0)
     deductions = models.FloatField(default=0)
+    # Computed and stored by the database, so it can be sorted, filtered, indexed and aggregated
+    total_salary = models.GeneratedField(
+        expression=models.F("base_salary") + models.F("bonus") - models.F("deductions"),
+        output_field=models.FloatField(),
+        db_persist=True,
+    )
 
-    def total_salary(self):
-        return self.base_salary + self.bonus - self.deductions
+    class Meta:
+        constraints = [
+            # One payslip per employee per pay period; also serves an employee's payroll history
+            models.UniqueConstraint(fields=['employee', 'month'], name='payroll_employee_month_uniq'),
+        ]
+        indexes = [
+            # A whole month at a time (payroll runs, reports), and "top earners this month"
+            # from the first rows of the index
+            models.Index(fields=['month', '-total_salary'], name='payroll_month_total_idx'),
+        ]
 
     def __str__(self):
-        return f"{self.employee.user.username} - {self.month}"
+        return f"{self.employee.user.username} - {self.month:%Y-%m}"
+
+
+class PayrollAdjustment(models.Model):
+    """A one-off bonus or deduction picked up by the payroll run for its month."""
+    KIND_CHOICES = [("Bonus", "Bonus"), ("Deduction", "Deduction")]
+
+    employee = models.ForeignKey(EmployeeProfile, on_delete=models.CASCADE, related_name="payroll_adjustments")
+    month = models.DateField()  # first day of the month
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    amount = models.FloatField()
+    note = models.CharField(max_length=200, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['month', 'employee'], name='payroll_adjust_month_emp_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee.user.username} - {self.month:%Y-%m} {self.kind} {self.amount}"
 
 
 
@@ -43,13 +177,141 @@ class LeaveRequest(models.Model):
         ("Approved", "Approved"),
         ("Rejected", "Rejected"),
     ]
+    LEAVE_TYPE_CHOICES = [
+        ("Annual", "Annual Leave"),
+        ("Sick", "Sick Leave"),
+        ("Unpaid", "Unpaid Leave"),
+    ]
 
     employee = models.ForeignKey(EmployeeProfile, on_delete=models.CASCADE, related_name="leave_requests")
+    leave_type = models.CharField(max_length=10, choices=LEAVE_TYPE_CHOICES, default="Annual")
     start_date = models.DateField()
     end_date = models.DateField()
     reason = models.TextField()
     status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="Pending")
     created_at = models.DateTimeField(default=timezone.now)
 
+    class Meta:
+        indexes = [
+            # Leave console: pending queue by start date, who is off today / this week
+            models.Index(fields=['status', 'start_date'], name='leave_status_start_idx'),
+            models.Index(fields=['start_date', 'end_date'], name='leave_start_end_idx'),
+            # One employee's requests: balance and overlap checks, newest first on "My leave"
+            models.Index(fields=['employee', 'start_date'], name='leave_emp_start_idx'),
+            models.Index(fields=['employee', '-created_at'], name='leave_emp_created_idx'),
+        ]
+        constraints = [
+            # overlapping() relies on every request ending within MAX_LEAVE_DAYS of its start
+            models.CheckConstraint(
+                condition=models.Q(end_date__gte=models.F("start_date"))
+                & models.Q(end_date__lt=models.F("start_date") + timedelta(days=MAX_LEAVE_DAYS)),
+                name="leave_length_bounded",
+            ),
+        ]
+
+    def clean(self):
+        super().clean()
+        if self.start_date is None or self.end_date is None:
+            return
+        if self.end_date < self.start_date:
+            raise ValidationError("Start date must be on or before the end date.")
+        if self.days_requested > MAX_LEAVE_DAYS:
+            raise ValidationError(
+                f"A single leave request can cover at most {MAX_LEAVE_DAYS} days; this one covers {self.days_requested}."
+            )
+
+    @property
+    def days_requested(self):
+        return (self.end_date - self.start_date).days + 1
+
     def __str__(self):
         return f"{self.employee.user.username} - {self.status} ({self.start_date} to {self.end_date})"
+
+
+#Background jobs (run by `manage.py run_jobs`)
+
+class BackgroundJob(models.Model):
+    STATUS_CHOICES = [
+        ("Queued", "Queued"),
+        ("Running", "Running"),
+        ("Done", "Done"),
+        ("Failed", "Failed"),
+    ]
+
+    kind = models.CharField(max_length=50)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="Queued")
+    payload = models.JSONField(default=dict, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(CustomUser, on_delete=models.SET_NULL, null=True, blank=True, related_name="background_jobs")
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Workers claim the oldest queued job first
+            models.Index(fields=['status', 'id'], name='backgroundjob_status_id_idx'),
+        ]
+
+    @property
+    def is_finished(self):
+        return self.status in ("Done", "Failed")
+
+    def __str__(self):
+        return f"{self.kind} #{self.id} ({self.status})"
+
+
+class JobAttachment(models.Model):
+    # Uploaded files the job needs; deleted once the job has finished
+    job = models.ForeignKey(BackgroundJob, on_delete=models.CASCADE, related_name="attachments")
+    name = models.CharField(max_length=255)
+    data = models.BinaryField()
+
+    def __str__(self):
+        return f"{self.name} (job #{self.job_id})"
+
+
+#HR assistant knowledge base
+
+class PolicyDocument(models.Model):
+    key = models.SlugField(max_length=100, unique=True)
+    title = models.CharField(max_length=200)
+    body = models.TextField()
+    is_active = models.BooleanField(default=True)
+    revision = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def save(self, *args, **kwargs):
+        # Lets the retrieval index re-embed only the documents whose revision moved. Bumped in the
+        # UPDATE itself, so two admins saving the same document at once move it twice.
+        if self._state.adding:
+            self.revision = 1
+            super().save(*args, **kwargs)
+            return
+        if kwargs.get("update_fields") is not None:
+            kwargs["update_fields"] = {*kwargs["update_fields"], "revision"}
+        self.revision = models.F("revision") + 1
+        super().save(*args, **kwargs)
+        self.refresh_from_db(fields=["revision"])
+
+    def __str__(self):
+        return self.title
+
+
+class KnowledgeBaseVersion(models.Model):
+    # Single row, bumped on every policy change; workers compare it to decide whether to resync
+    version = models.PositiveBigIntegerField(default=0)
+
+    @classmethod
+    def current(cls):
+        return cls.objects.filter(pk=1).values_list("version", flat=True).first() or 0
+
+    @classmethod
+    def bump(cls):
+        if not cls.objects.filter(pk=1).update(version=models.F("version") + 1):
+            cls.objects.get_or_create(pk=1, defaults={"version": 1})
+
+    def __str__(self):
+        return f"Knowledge base v{self.version}"
@@ -0,0 +1,121 @@
+import base64
+from datetime import date
+
+from django.db.models import Q
+
+
+# -------------------
+# Keyset (cursor) pagination
+# -------------------
+# Pages are addressed by the (date, id) of the row on their edge instead of an
+# OFFSET, so the database can seek straight into the (date, id) index and every
+# page costs the same no matter how deep into the history the user scrolls.
+
+def encode_cursor(row_date, row_id):
+    raw = f"{row_date.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token):
+    """Returns (date, id) for a cursor token, or None if the token is invalid."""
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        raw_date, raw_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return date.fromisoformat(raw_date), int(raw_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+class KeysetPage:
+    def __init__(self, rows, next_cursor=None, previous_cursor=None):
+        self.rows = rows
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __bool__(self):
+        return bool(self.rows)
+
+
+def keyset_paginate(queryset, page_size, after=None, before=None, date_field="date"):
+    """
+    Returns one KeysetPage of `queryset` ordered newest first by (date_field, id).
+
+    `after` continues past the last row of the previous page, `before` walks
+    back towards the newest rows. Both are tokens produced by encode_cursor.
+    At most page_size + 1 rows are read from the database.
+    """
+    after_key = decode_cursor(after)
+    before_key = decode_cursor(before)
+
+    if before_key:
+        row_date, row_id = before_key
+        queryset = queryset.filter(
+            Q(**{f"{date_field}__gt": row_date}) | Q(**{date_field: row_date, "id__gt": row_id})
+        ).order_by(date_field, "id")
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size][::-1]
+        has_previous, has_next = has_more, True
+    else:
+        if after_key:
+            row_date, row_id = after_key
+            queryset = queryset.filter(
+                Q(**{f"{date_field}__lt": row_date}) | Q(**{date_field: row_date, "id__lt": row_id})
+            )
+        queryset = queryset.order_by(f"-{date_field}", "-id")
+        rows = list(queryset[:page_size + 1])
+        has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        has_previous = after_key is not None
+
+    if not rows:
+        return KeysetPage([])
+
+    first, last = rows[0], rows[-1]
+    return KeysetPage(
+        rows,
+        next_cursor=encode_cursor(getattr(last, date_field), last.id) if has_next else None,
+        previous_cursor=encode_cursor(getattr(first, date_field), first.id) if has_previous else None,
+    )
+
+
+def iter_keyset_chunks(queryset, fields, order_field, chunk_size):
+    """
+    Yields `queryset.values_list(*fields)` rows oldest first by (order_field, id),
+    reading chunk_size rows per query and seeking past the last (order_field, id)
+    seen. Unlike QuerySet.iterator() this keeps memory flat on MySQL too, whose
+    driver otherwise buffers the whole result set on the client.
+    """
+    queryset = queryset.order_by(order_field, "id")
+    last_key = None
+    while True:
+        chunk = queryset
+        if last_key is not None:
+            last_value, last_id = last_key
+            # The redundant >= lets the database seek into the index instead of scanning from the start
+            chunk = chunk.filter(
+                Q(**{f"{order_field}__gte": last_value}),
+                Q(**{f"{order_field}__gt": last_value}) | Q(**{order_field: last_value, "id__gt": last_id}),
+            )
+        rows = list(chunk.values_list(*fields, order_field, "id")[:chunk_size])
+        for row in rows:
+            yield row[:-2]
+        if len(rows) < chunk_size:
+            return
+        last_key = rows[-1][-2:]
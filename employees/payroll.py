@@ -0,0 +1,205 @@
+import calendar
+import logging
+from datetime import date
+
+import numpy as np
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Avg, Count, F, Max, Min, Q, Sum, Value, Window
+from django.db.models.functions import Ceil, Coalesce, RowNumber
+
+from .leave_ledger import overlapping
+from .models import AttendanceMonthlySummary, EmployeeProfile, LeaveRequest, Payroll, PayrollAdjustment
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 2000
+
+
+class PayrollError(Exception):
+    """Raised with a message that is safe to show in the admin or on the command line."""
+
+
+def month_label(month):
+    """How a pay period is shown and typed, e.g. '2026-10'."""
+    return f"{month:%Y-%m}"
+
+
+def parse_month(value):
+    """Accepts 'YYYY-MM' and returns the first day of that month."""
+    try:
+        year, month = (int(part) for part in value.split("-"))
+        return date(year, month, 1)
+    except (ValueError, TypeError):
+        raise PayrollError(f"'{value}' is not a month; use YYYY-MM.")
+
+
+def _positions(ids, employee_ids):
+    """Row of each employee_id in the sorted `ids` array, and a mask of the ones found."""
+    employee_ids = np.asarray(employee_ids, dtype=np.int64)
+    rows = np.searchsorted(ids, employee_ids)
+    found = rows < len(ids)
+    found[found] = ids[rows[found]] == employee_ids[found]
+    return rows, found
+
+
+def _accumulate(target, ids, employee_ids, values):
+    rows, found = _positions(ids, employee_ids)
+    np.add.at(target, rows[found], np.asarray(values, dtype=np.float64)[found])
+
+
+def compute_payroll(month, employee_ids=None):
+    """
+    Loads everything a month's payroll depends on with one query per source
+    and computes every employee's pay as whole-array NumPy operations.
+
+    Unpaid leave and days marked absent are docked at the daily rate
+    (monthly salary / days in the month); deductions never take pay below
+    zero. Returns (ids, base, bonus, deductions) arrays sorted by employee id.
+    """
+    first = month
+    last = date(month.year, month.month, calendar.monthrange(month.year, month.month)[1])
+    days_in_month = last.day
+
+    profiles = EmployeeProfile.objects.order_by("id")
+    if employee_ids is not None:
+        profiles = profiles.filter(id__in=employee_ids)
+    rows = list(profiles.values_list("id", "salary"))
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    base = np.array([row[1] or 0.0 for row in rows], dtype=np.float64)
+
+    bonus = np.zeros(len(ids))
+    adjustment_deductions = np.zeros(len(ids))
+    adjustments = list(PayrollAdjustment.objects.filter(month=first).values_list("employee_id", "kind", "amount"))
+    if adjustments:
+        adj_ids, kinds, amounts = (np.array(column) for column in zip(*adjustments))
+        is_bonus = kinds == "Bonus"
+        _accumulate(bonus, ids, adj_ids[is_bonus], amounts[is_bonus])
+        _accumulate(adjustment_deductions, ids, adj_ids[~is_bonus], amounts[~is_bonus])
+
+    unpaid_days = np.zeros(len(ids))
+    leaves = list(
+        overlapping(LeaveRequest.objects.filter(status="Approved", leave_type="Unpaid"), first, last)
+        .values_list("employee_id", "start_date", "end_date")
+    )
+    if leaves:
+        leave_ids = [row[0] for row in leaves]
+        starts = np.array([row[1].toordinal() for row in leaves])
+        ends = np.array([row[2].toordinal() for row in leaves])
+        # Only the days of each request that fall inside this month
+        days = np.minimum(ends, last.toordinal()) - np.maximum(starts, first.toordinal()) + 1
+        _accumulate(unpaid_days, ids, leave_ids, np.clip(days, 0, None))
+
+    absent_days = np.zeros(len(ids))
+    absences = list(
+        AttendanceMonthlySummary.objects.filter(month=first, absent_days__gt=0).values_list("employee_id", "absent_days")
+    )
+    if absences:
+        _accumulate(absent_days, ids, [row[0] for row in absences], [row[1] for row in absences])
+
+    daily_rate = base / days_in_month
+    deductions = adjustment_deductions + daily_rate * (unpaid_days + absent_days)
+    deductions = np.minimum(deductions, base + bonus)
+    return ids, np.round(base, 2), np.round(bonus, 2), np.round(deductions, 2)
+
+
+def run_payroll(month, employee_ids=None, replace=False, batch_size=None):
+    """
+    Computes and stores the payroll for `month` (first day of the month) in
+    one transaction, inserting Payroll rows with bulk_create in chunks.
+    Refuses to run twice for the same employees unless replace=True, which
+    deletes their existing rows for the month first.
+    """
+    batch_size = batch_size or getattr(settings, "PAYROLL_BATCH_SIZE", DEFAULT_BATCH_SIZE)
+    label = month_label(month)
+    ids, base, bonus, deductions = compute_payroll(month, employee_ids)
+
+    try:
+        with transaction.atomic():
+            existing = Payroll.objects.filter(month=month)
+            if employee_ids is not None:
+                existing = existing.filter(employee_id__in=ids.tolist())
+            if existing.exists():
+                if not replace:
+                    raise PayrollError(f"Payroll for {label} has already been run; re-run it with replace to overwrite.")
+                existing.delete()
+
+            for start in range(0, len(ids), batch_size):
+                stop = start + batch_size
+                Payroll.objects.bulk_create([
+                    Payroll(employee_id=employee_id, month=month, base_salary=b, bonus=x, deductions=d)
+                    for employee_id, b, x, d in zip(
+                        ids[start:stop].tolist(), base[start:stop].tolist(),
+                        bonus[start:stop].tolist(), deductions[start:stop].tolist(),
+                    )
+                ])
+    except IntegrityError:
+        # The (employee, month) unique constraint: another run for the same month committed first
+        raise PayrollError(f"Payroll for {label} was being run at the same time; check it and re-run with replace if needed.")
+
+    net = base + bonus - deductions
+    summary = {
+        "month": label,
+        "employees": int(len(ids)),
+        "gross": round(float((base + bonus).sum()), 2),
+        "deductions": round(float(deductions.sum()), 2),
+        "net": round(float(net.sum()), 2),
+    }
+    logger.info(f"Payroll for {label}: {summary['employees']} employees, net {summary['net']}.")
+    return summary
+
+
+# -------------------
+# Reports
+# -------------------
+REPORT_PERCENTILES = (50, 90)
+
+
+def department_report(month, percentiles=REPORT_PERCENTILES):
+    """
+    Per-department payroll figures for `month` (first day of the month).
+    Count, sum, mean, min and max come from one GROUP BY query. The
+    percentiles (nearest rank) come from one window-function query that
+    returns only the ranked rows asked for, never the whole payroll.
+    """
+    payroll = Payroll.objects.filter(month=month).annotate(
+        department=Coalesce(F("employee__department"), Value(""))
+    )
+    report = {
+        row["department"]: {
+            "department": row["department"],
+            "employees": row["employees"],
+            "total": round(row["total"], 2),
+            "mean": round(row["mean"], 2),
+            "min": row["min"],
+            "max": row["max"],
+        }
+        for row in payroll.values("department").annotate(
+            employees=Count("id"), total=Sum("total_salary"), mean=Avg("total_salary"),
+            min=Min("total_salary"), max=Max("total_salary"),
+        ).order_by("department")
+    }
+
+    if percentiles:
+        ranked = payroll.annotate(
+            rank=Window(RowNumber(), partition_by=[F("department")], order_by=[F("total_salary").asc(), F("id").asc()]),
+            size=Window(Count("id"), partition_by=[F("department")]),
+        )
+        wanted = Q()
+        for p in percentiles:
+            wanted |= Q(rank=Ceil(F("size") * p / 100.0))
+        for department, rank, size, total in ranked.filter(wanted).values_list("department", "rank", "size", "total_salary"):
+            for p in percentiles:
+                if rank == max(int(np.ceil(size * p / 100.0)), 1):
+                    report[department][f"p{p}"] = total
+    return list(report.values())
+
+
+def top_earners(month, limit=50):
+    """The `limit` highest totals for the month, read off the (month, -total_salary) index."""
+    return (
+        Payroll.objects.filter(month=month)
+        .select_related("employee__user")
+        .order_by("-total_salary", "id")[:limit]
+    )
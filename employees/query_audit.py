@@ -0,0 +1,128 @@
+import json
+import re
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import Count
+from django.utils import timezone
+
+from .directory import matching
+from .leave_ledger import overlapping
+from .models import (
+    Attendance, AttendanceDailySummary, AttendanceMonthlySummary, BackgroundJob, EmployeeProfile, LeaveRequest,
+    Payroll, PayrollAdjustment,
+)
+from .payroll import top_earners
+
+_sqlite_scan_re = re.compile(r"\bSCAN (\S+)(.*)")
+_postgres_scan_re = re.compile(r"Seq Scan on (\S+)")
+
+
+def _sample_arguments():
+    """Realistic parameters for the hot queries, taken from the data itself."""
+    today = timezone.localdate()
+    profile = EmployeeProfile.objects.order_by("id").values("id", "user_id", "department").first() or {}
+    department = (
+        EmployeeProfile.objects.exclude(department=None).values_list("department", flat=True).first() or "Engineering"
+    )
+    return {
+        "today": today,
+        "month": today.replace(day=1),
+        "employee_id": profile.get("id", 0),
+        "user_id": profile.get("user_id", 0),
+        "department": profile.get("department") or department,
+    }
+
+
+def hot_queries():
+    """
+    (name, queryset) for the queries behind the busiest pages and jobs, built
+    the way the views build them. Aggregates are explained as the queryset
+    they aggregate over.
+    """
+    args = _sample_arguments()
+    today, month = args["today"], args["month"]
+    week_ago = today - timedelta(days=6)
+    return [
+        ("dashboard: pending leave", LeaveRequest.objects.filter(status="Pending").select_related("employee__user")[:5]),
+        ("dashboard: on leave today",
+         overlapping(LeaveRequest.objects.filter(status="Approved"), today, today).values("employee").distinct()),
+        ("dashboard: present today", AttendanceDailySummary.objects.filter(date=today)),
+        ("dashboard: attendance chart", AttendanceDailySummary.objects.filter(date__gte=week_ago, date__lte=today)),
+        ("dashboard: recent attendance",
+         Attendance.objects.filter(employee_id=args["employee_id"]).order_by("-date", "-id")[:7]),
+        ("attendance: mark / clock", Attendance.objects.filter(employee_id=args["employee_id"], date=today)),
+        ("attendance report: all, first page",
+         Attendance.objects.select_related("employee__user").order_by("-date", "-id")[:26]),
+        ("attendance report: department",
+         Attendance.objects.filter(employee__department=args["department"], date__gte=week_ago)
+         .order_by("-date", "-id")[:26]),
+        ("attendance report: status",
+         Attendance.objects.filter(status="Absent", date__gte=week_ago).order_by("-date", "-id")[:26]),
+        ("leave: my requests", LeaveRequest.objects.filter(employee__user_id=args["user_id"]).order_by("-created_at")),
+        ("leave: balance / overlap check",
+         overlapping(LeaveRequest.objects.filter(employee_id=args["employee_id"], status__in=["Pending", "Approved"]),
+                     month, today)),
+        ("leave: manage queue", LeaveRequest.objects.filter(status="Pending").order_by("start_date", "id")[:50]),
+        ("leave: department coverage",
+         overlapping(LeaveRequest.objects.filter(status="Approved", employee__department=args["department"]),
+                     month, today)),
+        ("employees: by department", EmployeeProfile.objects.filter(department=args["department"])),
+        ("employees: directory search",
+         matching("jo").order_by("user__username").values("id", "user__username")[:10]),
+        ("payroll: month run", Payroll.objects.filter(month=month, employee_id__in=[args["employee_id"]])),
+        ("payroll: top earners", top_earners(month, 50)),
+        ("payroll: department report",
+         Payroll.objects.filter(month=month).values("employee__department").annotate(n=Count("id"))),
+        ("payroll: employee history", Payroll.objects.filter(employee_id=args["employee_id"]).order_by("-month")),
+        ("payroll: absences for the month",
+         AttendanceMonthlySummary.objects.filter(month=month, absent_days__gt=0)),
+        ("payroll: adjustments for the month", PayrollAdjustment.objects.filter(month=month)),
+        ("jobs: claim next", BackgroundJob.objects.filter(status="Queued").order_by("id").values_list("id")[:10]),
+    ]
+
+
+def _walk(node):
+    if isinstance(node, dict):
+        yield node
+        for value in node.values():
+            yield from _walk(value)
+    elif isinstance(node, list):
+        for value in node:
+            yield from _walk(value)
+
+
+def explain(queryset):
+    """
+    Returns (plan text, tables read with a full table scan, notes) for
+    `queryset` on the current database. Full scans of an index (reading an
+    index in order, usually for ORDER BY ... LIMIT) are only noted.
+    """
+    full_scans, notes = [], []
+    if connection.vendor == "mysql":
+        plan = queryset.explain(format="json")
+        for node in _walk(json.loads(plan)):
+            access = node.get("access_type")
+            if access == "ALL":
+                full_scans.append(node.get("table_name", "?"))
+            elif access == "index":
+                notes.append(f"full index scan of {node.get('table_name', '?')} ({node.get('key')})")
+            if node.get("using_filesort"):
+                notes.append("filesort")
+            if node.get("using_temporary_table"):
+                notes.append("temporary table")
+    else:
+        plan = queryset.explain()
+        for line in plan.splitlines():
+            if connection.vendor == "sqlite":
+                match = _sqlite_scan_re.search(line)
+                if match and match.group(1) != "CONSTANT":
+                    if "USING" in match.group(2):
+                        notes.append(f"full index scan of {match.group(1)}{match.group(2)}")
+                    else:
+                        full_scans.append(match.group(1))
+                if "TEMP B-TREE" in line:
+                    notes.append(line.split("USE ", 1)[-1].strip().lower())
+            else:
+                full_scans.extend(_postgres_scan_re.findall(line))
+    return plan, full_scans, notes
@@ -0,0 +1,176 @@
+import contextvars
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+import numpy as np
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import DjangoTemplates, Template
+
+DEFAULT_WINDOW = 1000
+DEFAULT_NPLUSONE_THRESHOLD = 5
+PERCENTILES = (50, 90, 99)
+METRICS = ("queries", "db_ms", "template_ms", "total_ms")
+
+_number_re = re.compile(r"\b\d+\b")
+
+
+def query_shape(sql):
+    """
+    Queries that differ only in literals share a shape. Django passes
+    parameters separately, so usually the SQL is already the shape; this
+    also folds the literal numbers of e.g. a LIMIT or an IN list size.
+    """
+    return _number_re.sub("?", sql)
+
+
+class RequestRecord:
+    """What one request did; lives in a ContextVar for the duration of the request."""
+
+    __slots__ = ("queries", "db_seconds", "template_seconds", "shapes")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+        self.shapes = Counter()
+
+    def suspected_n_plus_one(self, threshold):
+        """(shape, count) of every query shape run at least `threshold` times."""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+
+_current = contextvars.ContextVar("request_metrics_record", default=None)
+
+
+def current_record():
+    return _current.get()
+
+
+def start_request(record=None):
+    """Makes `record` (a new one by default) the current request's; returns the token for finish_request()."""
+    return _current.set(RequestRecord() if record is None else record)
+
+
+def finish_request(token):
+    _current.reset(token)
+
+
+def record_query(execute, sql, params, many, context):
+    """connection.execute_wrapper() hook: counts and times every query of the request."""
+    record = _current.get()
+    if record is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record.db_seconds += time.perf_counter() - started
+        record.queries += 1
+        record.shapes[query_shape(sql)] += 1
+
+
+@contextmanager
+def instrument_queries():
+    """Routes every query on every database connection of this thread through record_query()."""
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(record_query))
+        yield
+
+
+# -------------------
+# Template timing
+# -------------------
+class TimedTemplate(Template):
+    def render(self, context=None, request=None):
+        record = _current.get()
+        if record is None:
+            return super().render(context, request)
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            record.template_seconds += time.perf_counter() - started
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """The Django template backend, timing each top-level render() into the current request's record."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        template = super().get_template(template_name)
+        return TimedTemplate(template.template, self)
+
+
+# -------------------
+# Rolling statistics
+# -------------------
+class _Window:
+    """The last `size` samples of every metric for one URL name, in a ring buffer."""
+
+    def __init__(self, size):
+        self.samples = np.zeros((size, len(METRICS)), dtype=np.float64)
+        self.filled = 0
+        self.position = 0
+        self.requests = 0
+        self.n_plus_one = 0
+
+    def add(self, values, n_plus_one):
+        self.samples[self.position] = values
+        self.position = (self.position + 1) % len(self.samples)
+        self.filled = min(self.filled + 1, len(self.samples))
+        self.requests += 1
+        self.n_plus_one += bool(n_plus_one)
+
+    def summary(self):
+        samples = self.samples[:self.filled]
+        points = np.percentile(samples, PERCENTILES, axis=0)
+        return {
+            "requests": self.requests,
+            "window": self.filled,
+            "suspected_n_plus_one": self.n_plus_one,
+            **{
+                metric: {f"p{p}": round(float(points[row, column]), 2) for row, p in enumerate(PERCENTILES)}
+                for column, metric in enumerate(METRICS)
+            },
+        }
+
+
+class RequestStats:
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self._lock = threading.Lock()
+        self._windows = {}
+
+    def add(self, url_name, record, total_seconds, n_plus_one):
+        values = (record.queries, record.db_seconds * 1000, record.template_seconds * 1000, total_seconds * 1000)
+        with self._lock:
+            window = self._windows.get(url_name)
+            if window is None:
+                window = self._windows[url_name] = _Window(self.window)
+            window.add(values, n_plus_one)
+
+    def summary(self):
+        with self._lock:
+            return {url_name: window.summary() for url_name, window in sorted(self._windows.items())}
+
+
+# --- One collector per worker process ---
+
+_stats = None
+_stats_lock = threading.Lock()
+
+
+def get_request_stats():
+    global _stats
+    if _stats is None:
+        with _stats_lock:
+            if _stats is None:
+                _stats = RequestStats(window=getattr(settings, "REQUEST_METRICS_WINDOW", DEFAULT_WINDOW))
+    return _stats
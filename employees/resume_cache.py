@@ -0,0 +1,80 @@
+import hashlib
+import io
+import re
+
+import numpy as np
+from django.core.cache import caches
+from django.core.cache.backends.base import InvalidCacheBackendError
+
+from .utils import extract_text_from_pdf
+
+CACHE_ALIAS = "resume_screening"
+
+_whitespace_re = re.compile(r"\s+")
+
+
+# -------------------
+# Content-addressed cache for resume screening
+# -------------------
+# Everything is keyed by a SHA-256 of the content, never by filename or upload
+# id, so the same CV uploaded twice (or screened against a new role) reuses
+# the extracted text and its embedding. Eviction and the size cap come from
+# the cache alias: LocMemCache evicts least-recently-used entries past
+# MAX_ENTRIES, FileBasedCache keeps them on local disk.
+
+def _cache():
+    try:
+        return caches[CACHE_ALIAS]
+    except InvalidCacheBackendError:
+        return caches["default"]
+
+
+def file_digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def normalize_job_description(text):
+    return _whitespace_re.sub(" ", text or "").strip()
+
+
+def job_description_digest(text):
+    return hashlib.sha256(normalize_job_description(text).encode()).hexdigest()
+
+
+def _embedding_namespace(backend):
+    # Vectors from different models are not comparable, so they never share keys
+    return f"{type(backend).__name__}:{getattr(backend, 'model_name', '')}"
+
+
+def get_resume_text(data, digest=None):
+    """Extracted text for the PDF bytes in `data`, parsing the PDF only on a cache miss."""
+    digest = digest or file_digest(data)
+    key = f"text:{digest}"
+    cache = _cache()
+    text = cache.get(key)
+    if text is None:
+        text = extract_text_from_pdf(io.BytesIO(data))
+        cache.set(key, text)
+    return text
+
+
+def get_embeddings(backend, kind, digests, texts):
+    """
+    Returns a (len(texts), dim) matrix of embeddings for `texts`, looking each
+    one up by its digest first and embedding only the misses in one batch.
+    """
+    cache = _cache()
+    namespace = _embedding_namespace(backend)
+    keys = [f"emb:{kind}:{namespace}:{digest}" for digest in digests]
+    found = cache.get_many(keys)
+
+    missing = [i for i, key in enumerate(keys) if key not in found]
+    if missing:
+        vectors = backend.embed([texts[i] for i in missing])
+        fresh = {keys[i]: vectors[row] for row, i in enumerate(missing)}
+        cache.set_many(fresh)
+        found.update(fresh)
+
+    if not keys:
+        return np.zeros((0, backend.dimension or 0), dtype=np.float32)
+    return np.vstack([found[key] for key in keys])
@@ -0,0 +1,197 @@
+import logging
+import os
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+
+from django.conf import settings
+
+from .ai import build_result, score_resumes
+from .jobs import JobError, enqueue
+from .resume_cache import file_digest, get_resume_text
+from .utils import PDFTooLargeError, check_pdf_size
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+
+class ScreeningError(Exception):
+    """Raised when an upload cannot be screened at all (as opposed to one bad file in a batch)."""
+
+
+def _max_files():
+    return getattr(settings, "RESUME_BATCH_MAX_FILES", 50)
+
+
+def _zip_members(archive):
+    """The files of a zip worth listing, from its central directory: nothing is decompressed."""
+    for info in archive.infolist():
+        member = os.path.basename(info.filename)
+        if info.is_dir() or not member or info.filename.startswith("__MACOSX/"):
+            continue
+        yield member, info
+
+
+def expand_uploads(uploaded_files):
+    """
+    Flattens the uploaded PDFs and zip archives into a list of (name, pdf_bytes | None, error).
+    A zip contributes one entry per PDF inside it. Files that can't be read are
+    kept with an error message so they still show up in the results.
+    The batch is counted from the zip directories before any member is read,
+    so an archive of thousands of files is refused without decompressing it.
+    """
+    with ExitStack() as stack:
+        # (name, upload | (archive, info) to read, error)
+        sources = []
+        for upload in uploaded_files:
+            name = os.path.basename(upload.name)
+            if name.lower().endswith(".zip"):
+                try:
+                    archive = stack.enter_context(zipfile.ZipFile(upload))
+                except zipfile.BadZipFile:
+                    sources.append((name, None, "Could not open the zip archive."))
+                    continue
+                for member, info in _zip_members(archive):
+                    if not member.lower().endswith(".pdf"):
+                        sources.append((member, None, "Skipped: not a PDF file."))
+                        continue
+                    try:
+                        # Checked against the declared size before anything is decompressed
+                        check_pdf_size(info.file_size)
+                    except PDFTooLargeError as e:
+                        sources.append((member, None, str(e)))
+                        continue
+                    sources.append((member, (archive, info), None))
+            elif name.lower().endswith(".pdf"):
+                try:
+                    check_pdf_size(upload.size)
+                except PDFTooLargeError as e:
+                    sources.append((name, None, str(e)))
+                    continue
+                sources.append((name, upload, None))
+            else:
+                sources.append((name, None, "Skipped: only PDF and zip files are supported."))
+
+        if len(sources) > _max_files():
+            raise ScreeningError(f"Too many files: at most {_max_files()} resumes can be screened at once.")
+
+        entries = []
+        for name, source, error in sources:
+            if isinstance(source, tuple):
+                archive, info = source
+                try:
+                    entries.append((name, archive.read(info), None))
+                except (zipfile.BadZipFile, NotImplementedError, RuntimeError):
+                    entries.append((name, None, "Could not extract the file from the zip archive."))
+            elif source is not None:
+                entries.append((name, source.read(), None))
+            else:
+                entries.append((name, None, error))
+        return entries
+
+
+def _extract(entry):
+    name, data, error = entry
+    if error:
+        return name, None, None, error
+    digest = file_digest(data)
+    try:
+        text = get_resume_text(data, digest)
+    except PDFTooLargeError as e:
+        return name, None, None, str(e)
+    except Exception as e:
+        logger.warning(f"Could not read {name}: {e}")
+        return name, None, None, "Could not read text from this PDF."
+    if not text.strip():
+        return name, None, None, "No text found in this PDF (it may be a scanned image)."
+    return name, text, digest, None
+
+
+def rank_entries(job_description, entries):
+    """
+    Ranks expanded upload entries (see expand_uploads) against one job description.
+
+    PDF text is extracted on a thread pool (or read from the content cache),
+    then the job description and all readable resumes are scored together;
+    only embeddings missing from the cache are computed, in one batch.
+    Returns a list of {"name", "score", "error"} dicts, best match first and
+    failed files last.
+    """
+    workers = getattr(settings, "RESUME_SCREENING_WORKERS", 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        extracted = list(pool.map(_extract, entries))
+
+    readable = [(name, text, digest) for name, text, digest, error in extracted if error is None]
+    scores = score_resumes(
+        job_description,
+        [text for _, text, _ in readable],
+        [digest for _, _, digest in readable],
+    )
+
+    results = [{"name": name, "score": score, "error": None} for (name, _, _), score in zip(readable, scores)]
+    results.sort(key=lambda row: row["score"], reverse=True)
+    results += [{"name": name, "score": None, "error": error} for name, _, _, error in extracted if error]
+    return results
+
+
+def screen_resumes(job_description, uploaded_files):
+    """Synchronous screening of uploaded files, see rank_entries."""
+    entries = expand_uploads(uploaded_files)
+    if not entries:
+        raise ScreeningError("Please upload at least one PDF resume.")
+    return rank_entries(job_description, entries)
+
+
+# -------------------
+# Background screening
+# -------------------
+
+def enqueue_screening(user, job_description, uploaded_files):
+    """
+    Validates the upload and queues it as a background job. Only the cheap work
+    (unpacking zips, size checks) happens in the request; PDF parsing and
+    scoring run in a `run_jobs` worker.
+    """
+    single = len(uploaded_files) == 1 and uploaded_files[0].name.lower().endswith(".pdf")
+    if single:
+        # A lone oversized PDF is rejected outright rather than queued just to fail
+        check_pdf_size(uploaded_files[0].size)
+
+    entries = expand_uploads(uploaded_files)
+    if not entries:
+        raise ScreeningError("Please upload at least one PDF resume.")
+
+    return enqueue(
+        "resume_screening",
+        {
+            "job_description": job_description,
+            "single": single,
+            "skipped": [[name, error] for name, data, error in entries if error],
+        },
+        user=user,
+        attachments=[(name, data) for name, data, error in entries if not error],
+    )
+
+
+def run_screening_job(job):
+    entries = [(attachment.name, bytes(attachment.data), None) for attachment in job.attachments.order_by("id")]
+    entries += [(name, None, error) for name, error in job.payload.get("skipped", [])]
+    results = rank_entries(job.payload["job_description"], entries)
+
+    if job.payload.get("single"):
+        row = results[0]
+        if row["error"]:
+            raise JobError(row["error"])
+        return {"analysis": build_result(row["score"])}
+    return {"ranking": results}
+
+
+def job_context(job):
+    """Template context for the screening page showing `job`."""
+    if job.status == "Failed":
+        return {"error": job.error, "job": job}
+    if job.status == "Done":
+        if "analysis" in job.result:
+            return {"result": job.result["analysis"], "job": job}
+        return {"batch_results": job.result["ranking"], "job": job}
+    return {"job": job}
@@ -0,0 +1,57 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.models import CustomUser
+
+from . import dashboard_cache, directory
+from .models import Attendance, EmployeeProfile, KnowledgeBaseVersion, LeaveRequest, PolicyDocument
+
+
+@receiver(post_save, sender=PolicyDocument)
+@receiver(post_delete, sender=PolicyDocument)
+def bump_knowledge_base_version(sender, **kwargs):
+    KnowledgeBaseVersion.bump()
+
+
+# -------------------
+# Dashboard cache invalidation
+# -------------------
+@receiver(post_save, sender=LeaveRequest)
+@receiver(post_delete, sender=LeaveRequest)
+def invalidate_leave_fragments(sender, instance, **kwargs):
+    dashboard_cache.invalidate_on_commit(dashboard_cache.LEAVE, dashboard_cache.employee_tag(instance.employee_id))
+
+
+@receiver(post_save, sender=Attendance)
+@receiver(post_delete, sender=Attendance)
+def invalidate_attendance_fragments(sender, instance, update_fields=None, **kwargs):
+    tags = [dashboard_cache.employee_tag(instance.employee_id)]
+    # Clocking in and out only touches the employee's own row; the headcounts read the status
+    if update_fields is None or "status" in update_fields:
+        tags.append(dashboard_cache.ATTENDANCE)
+    dashboard_cache.invalidate_on_commit(*tags)
+
+
+@receiver(post_save, sender=EmployeeProfile)
+@receiver(post_delete, sender=EmployeeProfile)
+def invalidate_profile_fragments(sender, instance, **kwargs):
+    dashboard_cache.invalidate_on_commit(dashboard_cache.PROFILES, dashboard_cache.employee_tag(instance.id))
+
+
+# -------------------
+# Directory search tokens
+# -------------------
+@receiver(post_save, sender=EmployeeProfile)
+def reindex_employee(sender, instance, raw=False, **kwargs):
+    if not raw:
+        directory.reindex([instance.id])
+
+
+@receiver(post_save, sender=CustomUser)
+def reindex_user(sender, instance, created=False, raw=False, **kwargs):
+    # A new user's profile is created (and indexed) by its own save
+    if raw or created:
+        return
+    profile_id = EmployeeProfile.objects.filter(user=instance).values_list("id", flat=True).first()
+    if profile_id is not None:
+        directory.reindex([profile_id])
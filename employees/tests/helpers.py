@@ -0,0 +1,14 @@
+from users.models import CustomUser
+
+
+def make_user(username, role="Employee"):
+    return CustomUser.objects.create_user(username=username, password="pw", role=role)
+
+
+def make_employee(username, department=None, role="Employee"):
+    """A user and the EmployeeProfile the users app creates for it on save."""
+    profile = make_user(username, role=role).employeeprofile
+    if department:
+        profile.department = department
+        profile.save()
+    return profile
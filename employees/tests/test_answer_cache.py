@@ -0,0 +1,76 @@
+from unittest import mock
+
+import numpy as np
+from django.test import TestCase
+
+from employees import answer_cache
+from employees.answer_cache import AnswerCache, normalize_question
+from employees.models import KnowledgeBaseVersion, PolicyDocument
+
+
+def _unit(*values):
+    vector = np.array(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class AnswerCacheTests(TestCase):
+    def test_questions_match_after_normalizing(self):
+        cache = AnswerCache()
+        cache.put("How many SICK days?", "Ten.", version=1)
+
+        self.assertEqual(normalize_question("  How many SICK  days?! "), "how many sick days")
+        self.assertEqual(cache.get("how many sick days", version=1), "Ten.")
+        self.assertIsNone(cache.get("how many annual days", version=1))
+
+    def test_new_knowledge_base_version_empties_the_cache(self):
+        cache = AnswerCache()
+        cache.put("sick days", "Ten.", version=1, vector=_unit(1, 0))
+
+        self.assertIsNone(cache.get("sick days", version=2))
+        self.assertIsNone(cache.get_similar(_unit(1, 0), version=2))
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_policy_edit_moves_the_version(self):
+        policy = PolicyDocument.objects.create(key="sick", title="Sick leave", body="Ten days a year.")
+        before = KnowledgeBaseVersion.current()
+
+        policy.body = "Twelve days a year."
+        policy.save()
+        self.assertEqual(KnowledgeBaseVersion.current(), before + 1)
+        policy.delete()
+        self.assertEqual(KnowledgeBaseVersion.current(), before + 2)
+
+    def test_entries_expire(self):
+        cache = AnswerCache(ttl=60)
+        with mock.patch.object(answer_cache.time, "monotonic", return_value=1000.0):
+            cache.put("sick days", "Ten.", version=1, vector=_unit(1, 0))
+        with mock.patch.object(answer_cache.time, "monotonic", return_value=1059.0):
+            self.assertEqual(cache.get("sick days", version=1), "Ten.")
+        with mock.patch.object(answer_cache.time, "monotonic", return_value=1061.0):
+            self.assertIsNone(cache.get_similar(_unit(1, 0), version=1))
+            self.assertIsNone(cache.get("sick days", version=1))
+
+        self.assertEqual(cache.stats()["entries"], 0)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = AnswerCache(max_entries=2)
+        cache.put("one", "1", version=1, vector=_unit(1, 0, 0))
+        cache.put("two", "2", version=1, vector=_unit(0, 1, 0))
+        cache.get("one", version=1)
+        cache.put("three", "3", version=1, vector=_unit(0, 0, 1))
+
+        self.assertIsNone(cache.get("two", version=1))
+        self.assertEqual(cache.get("one", version=1), "1")
+        # The evicted entry's embedding slot was reused, not matched
+        self.assertIsNone(cache.get_similar(_unit(0, 1, 0), version=1))
+        self.assertEqual(cache.get_similar(_unit(0, 0.1, 1), version=1), "3")
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_reworded_question_matches_by_embedding(self):
+        cache = AnswerCache(similarity=0.9)
+        cache.put("how many sick days do i get", "Ten.", version=1, vector=_unit(1, 0.1))
+
+        self.assertEqual(cache.get_similar(_unit(1, 0.15), version=1), "Ten.")
+        self.assertIsNone(cache.get_similar(_unit(0.2, 1), version=1))
+        stats = cache.stats()
+        self.assertEqual((stats["similar_hits"], stats["misses"], stats["hit_ratio"]), (1, 1, 0.5))
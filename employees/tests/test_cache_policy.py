@@ -0,0 +1,45 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from .helpers import make_employee
+
+
+class CachePolicyMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        make_employee("ana")
+
+    def test_anonymous_home_is_shared_and_revalidated(self):
+        response = self.client.get(reverse("home"))
+
+        self.assertEqual(response["Cache-Control"], "public, max-age=300")
+        self.assertIn("Cookie", response["Vary"])
+        self.assertNotIn("Set-Cookie", str(response.cookies))
+        repeat = self.client.get(reverse("home"), HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(repeat.status_code, 304)
+
+    def test_logged_in_pages_are_never_stored(self):
+        self.client.login(username="ana", password="pw")
+        response = self.client.get(reverse("home"))
+
+        self.assertEqual(response["Cache-Control"], "private, no-store")
+        self.assertNotIn("ETag", response)
+
+    def test_home_after_logout_is_not_shared(self):
+        # Carries the one-off "logged out" message and the cookies that clear the session and the messages
+        self.client.login(username="ana", password="pw")
+        response = self.client.get(reverse("logout"), follow=True)
+
+        self.assertEqual(response.redirect_chain[-1][0], reverse("home"))
+        self.assertContains(response, "successfully logged out")
+        self.assertEqual(response["Cache-Control"], "private, no-store")
+        self.assertNotIn("ETag", response)
+
+    def test_readiness_is_never_stored(self):
+        self.assertEqual(self.client.get(reverse("readiness"))["Cache-Control"], "no-store")
+
+    @override_settings(CACHE_POLICY_RULES=[], CACHE_POLICY_DEFAULT="private, max-age=60")
+    def test_default_when_no_rule_matches(self):
+        response = self.client.get(reverse("home"))
+        self.assertEqual(response["Cache-Control"], "private, max-age=60")
+        self.assertNotIn("ETag", response)
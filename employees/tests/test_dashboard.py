@@ -0,0 +1,44 @@
+from unittest import mock
+
+from django.test import TestCase
+from django.urls import reverse
+
+from employees import dashboard_cache
+from employees.models import Attendance
+
+from .helpers import make_employee
+
+
+class EmployeeDashboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = make_employee("ana", department="Ops")
+
+    def setUp(self):
+        self.client.login(username="ana", password="pw")
+
+    def test_clock_state_is_read_live(self):
+        self.assertFalse(self.client.get(reverse("dashboard")).context["is_clocked_in"])
+
+        # As if the clock-in were handled by another process, whose invalidation never reaches this one's cache
+        with mock.patch.object(dashboard_cache, "invalidate"):
+            self.client.post(reverse("clock_in"))
+
+        response = self.client.get(reverse("dashboard"))
+        self.assertTrue(response.context["is_clocked_in"])
+        self.assertEqual([record.status for record in response.context["recent_records"]], ["Present"])
+
+    def employee_misses(self):
+        return dashboard_cache.stats()["fragments"].get("employee", {}).get("misses", 0)
+
+    def test_overview_is_cached_until_attendance_changes(self):
+        self.client.get(reverse("dashboard"))
+        misses = self.employee_misses()
+
+        self.client.get(reverse("dashboard"))
+        self.assertEqual(self.employee_misses(), misses)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Attendance.objects.create(employee=self.employee, status="Present")
+        self.client.get(reverse("dashboard"))
+        self.assertEqual(self.employee_misses(), misses + 1)
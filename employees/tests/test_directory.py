@@ -0,0 +1,98 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from employees.directory import directory_page, matching, normalize_words, typeahead
+from users.models import CustomUser
+
+from .helpers import make_employee
+
+
+def _person(username, first_name="", last_name="", department=None):
+    user = CustomUser.objects.create_user(
+        username=username, password="pw", role="Employee", first_name=first_name, last_name=last_name
+    )
+    profile = user.employeeprofile
+    if department:
+        profile.department = department
+        profile.save()
+    return profile
+
+
+class DirectorySearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.john = _person("jsmith", "John", "Smith", department="Engineering")
+        cls.jose = _person("jobrien", "José", "O'Brien", department="Sales")
+        cls.wang = _person("wang", "小明", "王")
+        cls.amy = _person("amy", "Amy", "Jones", department="Engineering")
+
+    def found(self, query):
+        return set(matching(query).values_list("user__username", flat=True))
+
+    def test_normalize_words(self):
+        self.assertEqual(normalize_words("José O'Brien"), ["jose", "o", "brien"])
+        self.assertEqual(normalize_words("王小明"), ["王小明"])
+
+    def test_every_term_must_match_a_prefix(self):
+        self.assertEqual(self.found("jo smi"), {"jsmith"})
+        self.assertEqual(self.found("JOSE"), {"jobrien"})
+        self.assertEqual(self.found("engin"), {"jsmith", "amy"})
+        self.assertEqual(self.found("engin jones"), {"amy"})
+        self.assertEqual(self.found("王"), {"wang"})
+
+    def test_query_without_terms_matches_nobody(self):
+        self.assertEqual(self.found("j"), set())
+        self.assertEqual(self.found("- ."), set())
+        self.assertEqual(typeahead("j"), [])
+
+    def test_index_follows_edits(self):
+        self.john.department = "Finance"
+        self.john.save()
+        self.john.user.last_name = "Smythe"
+        self.john.user.save()
+
+        self.assertEqual(self.found("fin smy"), {"jsmith"})
+        self.assertEqual(self.found("engin"), {"amy"})
+
+    def test_typeahead(self):
+        self.assertEqual(
+            typeahead("jo", limit=1),  # amy Jones, jobrien and jsmith; the first by username
+            [{"id": self.amy.id, "username": "amy", "name": "Amy Jones", "department": "Engineering"}],
+        )
+        self.assertEqual(
+            typeahead("jose"),
+            [{"id": self.jose.id, "username": "jobrien", "name": "José O'Brien", "department": "Sales"}],
+        )
+
+    def test_directory_pages_by_username(self):
+        first = directory_page(page_size=2)
+        self.assertEqual([row.user.username for row in first], ["amy", "jobrien"])
+        self.assertEqual((first.has_previous, first.has_next), (False, True))
+
+        second = directory_page(page_size=2, after=first.next_cursor)
+        self.assertEqual([row.user.username for row in second], ["jsmith", "wang"])
+        self.assertFalse(second.has_next)
+
+        back = directory_page(page_size=2, before=second.previous_cursor)
+        self.assertEqual([row.user.username for row in back], ["amy", "jobrien"])
+        self.assertEqual([row.user.username for row in directory_page("eng", page_size=1)], ["amy"])
+
+
+class DirectoryViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        make_employee("boss", role="Manager")
+        make_employee("ana")
+
+    def test_search_endpoint(self):
+        self.client.login(username="boss", password="pw")
+
+        response = self.client.get(reverse("employee_search"), {"q": "an", "limit": "-5"})
+
+        self.assertEqual([row["username"] for row in response.json()["results"]], ["ana"])
+        self.assertEqual(self.client.get(reverse("employee_search"), {"limit": "many"}).status_code, 400)
+
+    def test_employees_cannot_browse_the_directory(self):
+        self.client.login(username="ana", password="pw")
+
+        self.assertEqual(self.client.get(reverse("employee_list")).status_code, 403)
@@ -0,0 +1,90 @@
+import csv
+import io
+import zipfile
+from datetime import date
+from unittest import mock
+
+from django.http import StreamingHttpResponse
+from django.test import TestCase
+from django.urls import reverse
+
+from employees import exports
+from employees.models import Attendance, LeaveRequest
+
+from .helpers import make_employee, make_user
+
+FORMULA = '=HYPERLINK("http://example.com","Click")'
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        make_employee("boss", role="Manager")
+        make_user("rec", role="Recruiter")
+        cls.ana = make_employee("ana", department="Engineering")
+        ben = make_employee("ben", department="Sales")
+        for employee, reason in ((cls.ana, FORMULA), (ben, "-1 day off")):
+            LeaveRequest.objects.create(
+                employee=employee, start_date=date(2025, 3, 3), end_date=date(2025, 3, 5), reason=reason
+            )
+        for n, day in enumerate(range(1, 6)):
+            row = Attendance.objects.create(employee=cls.ana if n % 2 else ben, status="Present")
+            Attendance.objects.filter(id=row.id).update(date=date(2025, 3, day))
+
+    def _csv(self, response):
+        self.assertIsInstance(response, StreamingHttpResponse)
+        return list(csv.reader(io.StringIO(b"".join(response.streaming_content).decode())))
+
+    def test_leave_csv_escapes_formulas(self):
+        self.client.login(username="boss", password="pw")
+
+        rows = self._csv(self.client.get(reverse("export_data", args=["leave"])))
+
+        self.assertEqual(rows[0][0], "Employee")
+        self.assertEqual(sorted(row[7] for row in rows[1:]), ["'-1 day off", "'" + FORMULA])
+        self.assertEqual(rows[1][6], "3")
+
+    def test_leave_xlsx_escapes_formulas(self):
+        self.client.login(username="boss", password="pw")
+
+        response = self.client.get(reverse("export_data", args=["leave"]), {"format": "xlsx"})
+
+        self.assertTrue(response["Content-Disposition"].startswith("attachment"))
+        with zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content))) as workbook:
+            sheet = workbook.read("xl/worksheets/sheet1.xml").decode()
+        self.assertNotIn("<f>", sheet)
+        self.assertIn("'=HYPERLINK(", sheet)
+
+    def test_csv_is_streamed_in_chunks(self):
+        self.client.login(username="boss", password="pw")
+        with mock.patch.object(exports, "CHUNK_SIZE", 2):
+            with self.assertNumQueries(2):  # session and user; no rows are read before the body is
+                response = self.client.get(reverse("export_data", args=["attendance"]), {"status": "Present"})
+            with self.assertNumQueries(3):  # rows 1-2, 3-4, 5
+                rows = self._csv(response)
+
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(sorted(row[0] for row in rows[1:]), [f"2025-03-0{day}" for day in range(1, 6)])
+
+    def test_employees_export_only_their_own_rows(self):
+        self.client.login(username="ana", password="pw")
+
+        attendance = self._csv(self.client.get(reverse("export_data", args=["attendance"])))
+        leave = self._csv(self.client.get(reverse("export_data", args=["leave"])))
+
+        self.assertEqual({row[1] for row in attendance[1:]}, {"ana"})
+        self.assertEqual([row[0] for row in leave[1:]], ["ana"])
+        self.assertEqual(self.client.get(reverse("export_data", args=["payroll"])).status_code, 403)
+
+    def test_users_without_a_profile_are_refused(self):
+        self.client.login(username="rec", password="pw")
+
+        for dataset in ("attendance", "leave", "payroll"):
+            with self.subTest(dataset=dataset):
+                self.assertEqual(self.client.get(reverse("export_data", args=[dataset])).status_code, 403)
+
+    def test_bad_parameters(self):
+        self.client.login(username="boss", password="pw")
+
+        self.assertEqual(self.client.get(reverse("export_data", args=["leave"]), {"format": "pdf"}).status_code, 400)
+        self.assertEqual(self.client.get(reverse("export_data", args=["salaries"])).status_code, 404)
@@ -0,0 +1,63 @@
+import io
+
+from django.test import TestCase
+
+from employees.importer import EmployeeImportError, import_employees
+from employees.models import EmployeeProfile
+from users.models import CustomUser
+
+
+class ImportEmployeesTests(TestCase):
+    def run_import(self, text, **kwargs):
+        return import_employees(io.StringIO(text), processes=0, **kwargs)
+
+    def test_creates_users_profiles_and_reports_bad_rows(self):
+        CustomUser.objects.create_user(username="taken", password="pw", role="Admin")
+        result = self.run_import(
+            "username,email,role,department,salary,password\n"
+            "ana,ana@example.com,Employee,Ops,1000,secret-1\n"
+            "bob,,Manager,,,\n"
+            "cleo,cleo@example.com,Admin,,,\n"
+            "ANA,,,,,\n"
+            "taken,,,,,\n"
+            "dan,not-an-email,,,,\n"
+            "eve,,,,lots,\n"
+            ",,,,,\n",
+            batch_size=2,
+        )
+
+        self.assertEqual((result["created"], result["rows"]), (3, 8))
+        self.assertEqual([line for line, _ in result["errors"]], [5, 6, 7, 8, 9])
+        self.assertIn("more than once", result["errors"][0][1])
+        self.assertIn("already exists", result["errors"][1][1])
+
+        ana = EmployeeProfile.objects.select_related("user").get(user__username="ana")
+        self.assertEqual((ana.department, ana.salary), ("Ops", 1000.0))
+        self.assertTrue(ana.user.check_password("secret-1"))
+        self.assertFalse(CustomUser.objects.get(username="bob").has_usable_password())
+        self.assertTrue(EmployeeProfile.objects.filter(user__username="bob").exists())
+        self.assertFalse(EmployeeProfile.objects.filter(user__username="cleo").exists())
+
+    def test_existing_usernames_match_in_any_case(self):
+        CustomUser.objects.create_user(username="Taken", password="pw", role="Admin")
+
+        result = self.run_import("username\ntaken\nTAKEN\nfresh\n")
+
+        self.assertEqual(result["created"], 1)
+        self.assertEqual([line for line, _ in result["errors"]], [2, 3])
+        self.assertIn("already exists", result["errors"][0][1])
+        self.assertFalse(CustomUser.objects.filter(username="taken").exists())
+
+    def test_dry_run_writes_nothing(self):
+        result = self.run_import("username\nana\nbob\n", dry_run=True)
+
+        self.assertEqual(result["created"], 2)
+        self.assertFalse(CustomUser.objects.filter(username__in=["ana", "bob"]).exists())
+
+    def test_rejects_files_with_wrong_columns(self):
+        with self.assertRaisesMessage(EmployeeImportError, "Missing column(s): username"):
+            self.run_import("email\nana@example.com\n")
+        with self.assertRaisesMessage(EmployeeImportError, "Unknown column(s): nickname"):
+            self.run_import("username,nickname\nana,a\n")
+        with self.assertRaisesMessage(EmployeeImportError, "empty"):
+            self.run_import("")
@@ -0,0 +1,108 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from employees import jobs
+from employees.jobs import JobError, claim_next_job, enqueue, execute, requeue_stale_jobs, run_worker
+from employees.models import BackgroundJob, JobAttachment
+
+from .helpers import make_user
+
+HANDLERS = {
+    "resume_screening": "employees.tests.test_jobs.echo_attachments",
+    "employee_import": "employees.tests.test_jobs.refuse",
+}
+
+
+def echo_attachments(job):
+    return {"files": sorted(job.attachments.values_list("name", flat=True)), **job.payload}
+
+
+def refuse(job):
+    if job.payload.get("crash"):
+        raise RuntimeError("database password is hunter2")
+    raise JobError("The file has no username column.")
+
+
+@mock.patch.dict(jobs.JOB_HANDLERS, HANDLERS)
+class BackgroundJobTests(TestCase):
+    def test_claims_the_oldest_queued_job_once(self):
+        first = enqueue("resume_screening", {"n": 1})
+        second = enqueue("resume_screening", {"n": 2})
+
+        claimed = claim_next_job()
+        self.assertEqual((claimed.id, claimed.status, claimed.attempts), (first.id, "Running", 1))
+        self.assertIsNotNone(claimed.started_at)
+        self.assertEqual(claim_next_job().id, second.id)
+        self.assertIsNone(claim_next_job())
+
+    def test_execute_stores_the_result_and_drops_the_files(self):
+        enqueue("resume_screening", {"role": "dev"}, attachments=[("b.pdf", b"%PDF"), ("a.pdf", b"%PDF")])
+
+        job = execute(claim_next_job())
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result), ("Done", {"files": ["a.pdf", "b.pdf"], "role": "dev"}))
+        self.assertTrue(job.is_finished)
+        self.assertFalse(JobAttachment.objects.exists())
+
+    def test_failures_show_only_safe_messages(self):
+        enqueue("employee_import", {})
+        enqueue("employee_import", {"crash": True})
+
+        with self.assertLogs("employees.jobs", "ERROR"):
+            self.assertEqual(run_worker(once=True), 2)
+
+        errors = list(BackgroundJob.objects.order_by("id").values_list("status", "error"))
+        self.assertEqual(errors[0], ("Failed", "The file has no username column."))
+        self.assertEqual(errors[1][0], "Failed")
+        self.assertNotIn("hunter2", errors[1][1])
+
+    @override_settings(JOBS_MAX_ATTEMPTS=2)
+    def test_stale_jobs_are_retried_then_failed(self):
+        retried = enqueue("resume_screening", {}, attachments=[("a.pdf", b"%PDF")])
+        given_up = enqueue("resume_screening", {}, attachments=[("b.pdf", b"%PDF")])
+        fresh = enqueue("resume_screening", {})
+        for _ in range(3):
+            claim_next_job()
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        BackgroundJob.objects.filter(id__in=[retried.id, given_up.id]).update(started_at=an_hour_ago)
+        BackgroundJob.objects.filter(id=given_up.id).update(attempts=2)
+
+        with self.assertLogs("employees.jobs", "ERROR"):
+            self.assertEqual(requeue_stale_jobs(600), (1, 1))
+
+        statuses = dict(BackgroundJob.objects.values_list("id", "status"))
+        self.assertEqual(
+            (statuses[retried.id], statuses[given_up.id], statuses[fresh.id]), ("Queued", "Failed", "Running")
+        )
+        self.assertIn("2 attempts", BackgroundJob.objects.get(id=given_up.id).error)
+        self.assertEqual(list(JobAttachment.objects.values_list("name", flat=True)), ["a.pdf"])
+        # Retried: claimed again, with the attempt counted
+        self.assertEqual((claim_next_job().id, BackgroundJob.objects.get(id=retried.id).attempts), (retried.id, 2))
+
+    @override_settings(JOBS_RUN_INLINE=True)
+    def test_inline_jobs_run_before_enqueue_returns(self):
+        job = enqueue("resume_screening", {"n": 1})
+
+        self.assertEqual((job.status, job.attempts), ("Done", 1))
+
+    def test_unknown_kind_is_refused(self):
+        with self.assertRaises(ValueError):
+            enqueue("payroll", {})
+
+
+class ResumeJobStatusTests(TestCase):
+    def test_only_the_owner_sees_a_job(self):
+        owner = make_user("rec", role="Recruiter")
+        make_user("rec2", role="Recruiter")
+        job = BackgroundJob.objects.create(kind="resume_screening", created_by=owner)
+
+        self.client.login(username="rec2", password="pw")
+        self.assertEqual(self.client.get(reverse("resume_job_status", args=[job.id])).status_code, 404)
+        self.client.login(username="rec", password="pw")
+        response = self.client.get(reverse("resume_job_status", args=[job.id]))
+        self.assertEqual(response.json(), {"id": job.id, "status": "Queued", "finished": False, "error": ""})
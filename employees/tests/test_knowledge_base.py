@@ -0,0 +1,39 @@
+from unittest import mock
+
+from django.test import TestCase
+
+from employees.embeddings import HashingBackend
+from employees.knowledge_base import KnowledgeIndex
+from employees.models import PolicyDocument
+
+
+class PolicyRevisionTests(TestCase):
+    def test_every_save_moves_the_revision(self):
+        policy = PolicyDocument.objects.create(key="leave", title="Leave", body="Annual leave is 20 days.")
+        self.assertEqual(policy.revision, 1)
+
+        # Two admins editing the same document: neither save may be lost
+        first, second = PolicyDocument.objects.get(pk=policy.pk), PolicyDocument.objects.get(pk=policy.pk)
+        first.body = "Annual leave is 22 days."
+        first.save()
+        second.title = "Leave policy"
+        second.save(update_fields=["title"])
+
+        self.assertEqual((first.revision, second.revision), (2, 3))
+        policy.refresh_from_db()
+        self.assertEqual(policy.revision, 3)
+
+    def test_sync_re_embeds_only_changed_documents(self):
+        # Alongside the policies the migrations seed
+        PolicyDocument.objects.create(key="leave", title="Leave", body="Annual leave is 20 days.")
+        remote = PolicyDocument.objects.create(key="remote", title="Remote", body="Work from home twice a week.")
+        index = KnowledgeIndex(HashingBackend())
+        index.sync()
+
+        remote.body = "Work from home three times a week."
+        remote.save()
+        with mock.patch.object(index.backend, "embed", wraps=index.backend.embed) as embed:
+            self.assertTrue(index.sync())
+
+        embed.assert_called_once_with(["Work from home three times a week."])
+        self.assertEqual((index.revisions["leave"], index.revisions["remote"]), (1, 2))
@@ -0,0 +1,102 @@
+from datetime import date, timedelta
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.test import TestCase, override_settings
+
+from employees.leave_ledger import department_coverage, leave_balance, overlapping, validate_leave_request
+from employees.models import MAX_LEAVE_DAYS, LeaveRequest
+
+from .helpers import make_employee
+
+
+class OverlappingLeaveTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = make_employee("ana")
+
+    def leave(self, start, end):
+        return LeaveRequest.objects.create(employee=self.employee, start_date=start, end_date=end, reason="-")
+
+    def matches(self, start, end):
+        return set(overlapping(LeaveRequest.objects.all(), start, end))
+
+    def test_shared_days(self):
+        week = self.leave(date(2025, 3, 3), date(2025, 3, 7))
+        day = self.leave(date(2025, 3, 10), date(2025, 3, 10))
+
+        self.assertEqual(self.matches(date(2025, 3, 7), date(2025, 3, 10)), {week, day})
+        self.assertEqual(self.matches(date(2025, 3, 1), date(2025, 3, 3)), {week})
+        self.assertEqual(self.matches(date(2025, 3, 8), date(2025, 3, 9)), set())
+        self.assertEqual(self.matches(date(2025, 3, 11), date(2025, 3, 31)), set())
+
+    def test_longest_allowed_leave_is_found_on_its_last_day(self):
+        start = date(2025, 1, 1)
+        longest = self.leave(start, start + timedelta(days=MAX_LEAVE_DAYS - 1))
+        last_day = longest.end_date
+
+        self.assertEqual(self.matches(last_day, last_day), {longest})
+        self.assertEqual(self.matches(last_day + timedelta(days=1), last_day + timedelta(days=1)), set())
+
+    def test_database_refuses_longer_or_backwards_requests(self):
+        start = date(2025, 1, 1)
+        for end in (start + timedelta(days=MAX_LEAVE_DAYS), start - timedelta(days=1)):
+            with self.subTest(end=end), self.assertRaises(IntegrityError), transaction.atomic():
+                self.leave(start, end)
+
+
+@override_settings(LEAVE_ENTITLEMENTS={"Annual": 10, "Sick": 5})
+class LeaveBalanceTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = make_employee("ana", department="Ops")
+
+    def leave(self, start, end, status="Approved", leave_type="Annual", employee=None):
+        return LeaveRequest.objects.create(
+            employee=employee or self.employee, leave_type=leave_type, status=status,
+            start_date=start, end_date=end, reason="-",
+        )
+
+    def test_balance_counts_days_in_the_year_only(self):
+        self.leave(date(2024, 12, 30), date(2025, 1, 2))  # 2 days in each year
+        self.leave(date(2025, 3, 3), date(2025, 3, 5), status="Pending")
+        self.leave(date(2025, 4, 1), date(2025, 4, 9), status="Rejected")
+        self.leave(date(2025, 5, 1), date(2025, 5, 1), leave_type="Unpaid")
+
+        balance = leave_balance(self.employee, 2025)
+
+        self.assertEqual(
+            {key: balance["Annual"][key] for key in ("used", "pending", "remaining")},
+            {"used": 2, "pending": 3, "remaining": 5},
+        )
+        self.assertEqual((balance["Unpaid"]["used"], balance["Unpaid"]["remaining"]), (1, None))
+        self.assertEqual(leave_balance(self.employee, 2024)["Annual"]["used"], 2)
+
+    def test_validation(self):
+        pending = self.leave(date(2025, 3, 3), date(2025, 3, 7), status="Pending")
+
+        with self.assertRaisesMessage(ValidationError, "overlap your pending leave"):
+            validate_leave_request(self.employee, "Annual", date(2025, 3, 7), date(2025, 3, 8))
+        # Editing a request does not clash with itself
+        validate_leave_request(self.employee, "Annual", date(2025, 3, 4), date(2025, 3, 8), exclude_id=pending.id)
+        with self.assertRaisesMessage(ValidationError, "only 5 remain"):
+            validate_leave_request(self.employee, "Annual", date(2025, 6, 2), date(2025, 6, 7))
+        with self.assertRaisesMessage(ValidationError, f"at most {MAX_LEAVE_DAYS} days"):
+            start = date(2025, 6, 1)
+            validate_leave_request(self.employee, "Unpaid", start, start + timedelta(days=MAX_LEAVE_DAYS))
+        validate_leave_request(self.employee, "Unpaid", date(2025, 6, 2), date(2025, 6, 30))
+
+    def test_department_coverage_counts_each_person_once(self):
+        ben = make_employee("ben", department="Ops")
+        self.leave(date(2025, 3, 3), date(2025, 3, 5))
+        self.leave(date(2025, 3, 5), date(2025, 3, 6), leave_type="Sick")
+        self.leave(date(2025, 3, 4), date(2025, 3, 4), employee=ben)
+        self.leave(date(2025, 3, 6), date(2025, 3, 6), status="Pending", employee=ben)
+
+        coverage = dict(department_coverage("Ops", date(2025, 3, 2), date(2025, 3, 7)))
+
+        self.assertEqual(list(coverage.values()), [0, 1, 2, 1, 1, 0])
+        self.assertEqual(
+            dict(department_coverage("Ops", date(2025, 3, 6), date(2025, 3, 6), include_pending=True)),
+            {date(2025, 3, 6): 2},
+        )
@@ -0,0 +1,113 @@
+import json
+from datetime import date
+
+from django.test import TestCase
+from django.urls import reverse
+
+from employees.models import LeaveRequest
+
+from .helpers import make_employee
+
+
+def _leave(employee, status="Pending"):
+    return LeaveRequest.objects.create(
+        employee=employee, start_date=date(2025, 3, 3), end_date=date(2025, 3, 4), reason="Trip", status=status
+    )
+
+
+class BulkLeaveStatusTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        make_employee("boss", role="Manager")
+        cls.employee = make_employee("ana")
+
+    def setUp(self):
+        self.client.login(username="boss", password="pw")
+
+    def _post(self, body):
+        return self.client.post(reverse("bulk_update_leave_status"), body, content_type="application/json")
+
+    def test_only_pending_requests_are_decided(self):
+        pending, rejected = _leave(self.employee), _leave(self.employee, status="Rejected")
+
+        response = self._post({"ids": [pending.id, rejected.id, 999999], "status": "Approved"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["updated"], 1)
+        self.assertEqual(
+            response.json()["results"],
+            {str(pending.id): "updated", str(rejected.id): "already_rejected", "999999": "not_found"},
+        )
+        pending.refresh_from_db()
+        rejected.refresh_from_db()
+        self.assertEqual((pending.status, rejected.status), ("Approved", "Rejected"))
+
+    def test_form_post_redirects_to_the_console(self):
+        leave = _leave(self.employee)
+
+        response = self.client.post(reverse("bulk_update_leave_status"), {"ids": [leave.id], "status": "Rejected"})
+
+        self.assertRedirects(response, reverse("manage_leave_requests"), fetch_redirect_response=False)
+        leave.refresh_from_db()
+        self.assertEqual(leave.status, "Rejected")
+
+    def test_body_that_is_not_an_object_is_refused(self):
+        leave = _leave(self.employee)
+
+        for body in ([leave.id], "Approved", None):
+            with self.subTest(body=body):
+                self.assertEqual(self._post(json.dumps(body)).status_code, 400)
+        self.assertEqual(self._post({"ids": ["x"], "status": "Approved"}).status_code, 400)
+        self.assertEqual(self._post({"ids": [leave.id], "status": "Pending"}).status_code, 400)
+        leave.refresh_from_db()
+        self.assertEqual(leave.status, "Pending")
+
+    def test_employees_cannot_decide(self):
+        leave = _leave(self.employee)
+        self.client.login(username="ana", password="pw")
+
+        self.assertEqual(self._post({"ids": [leave.id], "status": "Approved"}).status_code, 403)
+
+
+class SingleLeaveStatusTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        make_employee("boss", role="Manager")
+        cls.employee = make_employee("ana")
+
+    def setUp(self):
+        self.client.login(username="boss", password="pw")
+
+    def test_get_changes_nothing(self):
+        leave = _leave(self.employee)
+
+        response = self.client.get(reverse("update_leave_status", args=[leave.id, "Approved"]))
+
+        self.assertEqual(response.status_code, 405)
+        leave.refresh_from_db()
+        self.assertEqual(leave.status, "Pending")
+
+    def test_post_decides_a_pending_request(self):
+        leave = _leave(self.employee)
+
+        response = self.client.post(reverse("update_leave_status", args=[leave.id, "Approved"]))
+
+        self.assertRedirects(response, reverse("manage_leave_requests"), fetch_redirect_response=False)
+        leave.refresh_from_db()
+        self.assertEqual(leave.status, "Approved")
+
+    def test_decided_request_is_not_reversed(self):
+        leave = _leave(self.employee, status="Rejected")
+
+        self.client.post(reverse("update_leave_status", args=[leave.id, "Approved"]))
+
+        leave.refresh_from_db()
+        self.assertEqual(leave.status, "Rejected")
+
+    def test_unknown_status_and_request(self):
+        leave = _leave(self.employee)
+
+        self.client.post(reverse("update_leave_status", args=[leave.id, "Pending"]))
+        leave.refresh_from_db()
+        self.assertEqual(leave.status, "Pending")
+        self.assertEqual(self.client.post(reverse("update_leave_status", args=[999999, "Approved"])).status_code, 404)
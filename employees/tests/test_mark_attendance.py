@@ -0,0 +1,56 @@
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from employees.models import Attendance, AttendanceDailySummary, AttendanceMonthlySummary, EmployeeProfile
+from employees.time_tracking import mark_present
+
+from .helpers import make_employee
+
+
+class MarkPresentTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = make_employee("ana", department="Ops")
+
+    def test_second_mark_is_a_no_op(self):
+        self.assertTrue(mark_present(self.employee.id, "Ops"))
+        self.assertFalse(mark_present(self.employee.id, "Ops"))
+
+        self.assertEqual(Attendance.objects.filter(employee=self.employee).count(), 1)
+        # Counted in the rollups once
+        self.assertEqual(AttendanceDailySummary.objects.get(department="Ops").present, 1)
+        self.assertEqual(AttendanceMonthlySummary.objects.get(employee=self.employee).present_days, 1)
+
+    def test_view_reports_the_second_mark(self):
+        self.client.login(username="ana", password="pw")
+
+        self.assertContains(self.client.get(reverse("mark_attendance")), "marked successfully")
+        self.assertContains(self.client.get(reverse("mark_attendance")), "already marked")
+        self.assertEqual(Attendance.objects.filter(employee=self.employee).count(), 1)
+
+
+# Commits for real, so SQLite checks the foreign key as MySQL does on the INSERT
+class StaleProfileTests(TransactionTestCase):
+    def setUp(self):
+        self.employee = make_employee("ana", department="Ops")
+
+    def test_deleted_profile_raises(self):
+        employee_id = self.employee.id
+        self.employee.delete()
+
+        with self.assertRaises(EmployeeProfile.DoesNotExist):
+            mark_present(employee_id, "Ops")
+        self.assertFalse(Attendance.objects.exists())
+
+    def test_view_forgets_a_stale_profile(self):
+        self.client.login(username="ana", password="pw")
+        session = self.client.session
+        session["employee_profile"] = [self.employee.id + 1000, "Ops"]
+        session.save()
+
+        response = self.client.get(reverse("mark_attendance"))
+
+        self.assertRedirects(response, reverse("mark_attendance"), fetch_redirect_response=False)
+        self.assertNotIn("employee_profile", self.client.session)
+        self.assertContains(self.client.get(reverse("mark_attendance")), "marked successfully")
+        self.assertEqual(self.client.session["employee_profile"], [self.employee.id, "Ops"])
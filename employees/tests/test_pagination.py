@@ -0,0 +1,50 @@
+from datetime import date
+
+from django.test import TestCase
+
+from employees.models import Attendance
+from employees.pagination import decode_cursor, encode_cursor, iter_keyset_chunks, keyset_paginate
+
+from .helpers import make_employee
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        employees = [make_employee(f"emp{i}", department="Ops") for i in range(7)]
+        # Several rows share a date, so the id tiebreak decides their order
+        dates = [date(2025, 5, 1), date(2025, 5, 1), date(2025, 5, 2), date(2025, 5, 2), date(2025, 5, 2),
+                 date(2025, 5, 3), date(2025, 5, 4)]
+        for employee, day in zip(employees, dates):
+            record = Attendance.objects.create(employee=employee, status="Present")
+            Attendance.objects.filter(id=record.id).update(date=day)  # date is auto_now_add
+        cls.newest_first = list(Attendance.objects.order_by("-date", "-id").values_list("id", flat=True))
+
+    def test_cursor_round_trip(self):
+        self.assertEqual(decode_cursor(encode_cursor(date(2025, 5, 1), 42)), (date(2025, 5, 1), 42))
+        self.assertIsNone(decode_cursor("not a cursor"))
+        self.assertIsNone(decode_cursor(""))
+
+    def test_walks_forward_and_back(self):
+        pages, cursor = [], None
+        while True:
+            page = keyset_paginate(Attendance.objects.all(), 3, after=cursor)
+            pages.append([record.id for record in page])
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+
+        self.assertEqual(pages, [self.newest_first[:3], self.newest_first[3:6], self.newest_first[6:]])
+        self.assertFalse(keyset_paginate(Attendance.objects.all(), 3).has_previous)
+
+        back = keyset_paginate(Attendance.objects.all(), 3, before=page.previous_cursor)
+        self.assertEqual([record.id for record in back], self.newest_first[3:6])
+        self.assertTrue(back.has_next)
+
+    def test_invalid_cursor_starts_from_the_newest_rows(self):
+        page = keyset_paginate(Attendance.objects.all(), 3, after="garbage")
+        self.assertEqual([record.id for record in page], self.newest_first[:3])
+
+    def test_chunks_cover_every_row_once(self):
+        rows = list(iter_keyset_chunks(Attendance.objects.all(), ("id",), "date", chunk_size=2))
+        self.assertEqual([row[0] for row in rows], self.newest_first[::-1])
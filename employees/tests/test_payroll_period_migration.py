@@ -0,0 +1,79 @@
+import importlib
+from datetime import date
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TestCase, TransactionTestCase
+
+payroll_period_migration = importlib.import_module("employees.migrations.0016_index_audit_payroll_period")
+
+
+class PayPeriodParsingTests(TestCase):
+    def test_accepted_formats(self):
+        parse = payroll_period_migration._parse_pay_period
+        for value in ("2024-03", "2024-03-17", "2024/03", "03/2024", "March 2024", "Mar 2024", "  2024-03 "):
+            with self.subTest(value=value):
+                self.assertEqual(parse(value), date(2024, 3, 1))
+
+    def test_rejected_values(self):
+        parse = payroll_period_migration._parse_pay_period
+        for value in ("", None, "2024-13", "next month", "2024"):
+            with self.subTest(value=value):
+                self.assertIsNone(parse(value))
+
+
+class PayPeriodMigrationTests(TransactionTestCase):
+    before = [("employees", "0015_employee_search_tokens")]
+    after = [("employees", "0016_index_audit_payroll_period")]
+
+    def setUp(self):
+        self.executor = MigrationExecutor(connection)
+        self.executor.migrate(self.before)
+        self.executor.loader.build_graph()
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_converts_months_and_keeps_newest_duplicate(self):
+        apps = self.executor.loader.project_state(self.before).apps
+        User = apps.get_model("users", "CustomUser")
+        EmployeeProfile = apps.get_model("employees", "EmployeeProfile")
+        Payroll = apps.get_model("employees", "Payroll")
+        first = EmployeeProfile.objects.create(user=User.objects.create(username="ana"))
+        second = EmployeeProfile.objects.create(user=User.objects.create(username="ben"))
+        Payroll.objects.create(employee=first, month="2024-01", base_salary=100)
+        newest = Payroll.objects.create(employee=first, month="Jan 2024", base_salary=110)
+        Payroll.objects.create(employee=first, month="2024/02", base_salary=120)
+        Payroll.objects.create(employee=second, month="01/2024", base_salary=200)
+
+        with self.assertLogs("employees.migrations", "WARNING") as logs:
+            self.executor.migrate(self.after)
+
+        self.assertEqual(len(logs.records), 1)
+        self.assertIn("base_salary': 100.0", logs.output[0])
+        Payroll = MigrationExecutor(connection).loader.project_state(self.after).apps.get_model("employees", "Payroll")
+        self.assertEqual(
+            sorted(Payroll.objects.values_list("employee_id", "month", "base_salary")),
+            [(first.id, date(2024, 1, 1), 110), (first.id, date(2024, 2, 1), 120), (second.id, date(2024, 1, 1), 200)],
+        )
+        self.assertTrue(Payroll.objects.filter(id=newest.id).exists())
+
+    def test_refuses_unparseable_months(self):
+        apps = self.executor.loader.project_state(self.before).apps
+        employee = apps.get_model("employees", "EmployeeProfile").objects.create(
+            user=apps.get_model("users", "CustomUser").objects.create(username="ana")
+        )
+        Payroll = apps.get_model("employees", "Payroll")
+        Payroll.objects.create(employee=employee, month="sometime", base_salary=1)
+
+        with self.assertRaisesMessage(ValueError, "'sometime'"):
+            self.executor.migrate(self.after)
+
+        # Refused before any DDL, which MySQL would not have rolled back
+        with connection.cursor() as cursor:
+            columns = {column.name for column in connection.introspection.get_table_description(cursor, "employees_payroll")}
+            indexes = connection.introspection.get_constraints(cursor, "employees_payroll")
+        self.assertNotIn("period", columns)
+        self.assertIn("payroll_month_emp_idx", indexes)
+        Payroll.objects.all().delete()  # so tearDown can migrate forward again
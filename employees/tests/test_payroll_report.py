@@ -0,0 +1,68 @@
+from datetime import date
+
+from django.test import TestCase
+from django.urls import reverse
+
+from employees.models import Payroll
+from employees.payroll import department_report, top_earners
+
+from .helpers import make_employee, make_user
+
+MONTH = date(2025, 3, 1)
+
+
+class PayrollReportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        make_user("boss", role="Admin")
+        for n, total in enumerate([400, 100, 300, 200], start=1):
+            employee = make_employee(f"eng{n}", department="Engineering")
+            # total_salary is computed by the database: base + bonus - deductions
+            Payroll.objects.create(employee=employee, month=MONTH, base_salary=total, bonus=50, deductions=50)
+        sales = make_employee("sal1", department="Sales")
+        Payroll.objects.create(employee=sales, month=MONTH, base_salary=1000, bonus=0, deductions=250)
+        # Another month, left out of every figure
+        Payroll.objects.create(employee=sales, month=date(2025, 2, 1), base_salary=9999)
+
+    def test_department_figures(self):
+        report = {row["department"]: row for row in department_report(MONTH)}
+
+        self.assertEqual(
+            report["Engineering"],
+            {"department": "Engineering", "employees": 4, "total": 1000, "mean": 250, "min": 100, "max": 400,
+             "p50": 200, "p90": 400},
+        )
+        self.assertEqual(report["Sales"]["employees"], 1)
+        self.assertEqual((report["Sales"]["total"], report["Sales"]["p50"], report["Sales"]["p90"]), (750, 750, 750))
+
+    def test_top_earners_are_ordered_by_total(self):
+        self.assertEqual(
+            [(row.employee.user.username, row.total_salary) for row in top_earners(MONTH, 3)],
+            [("sal1", 750), ("eng1", 400), ("eng3", 300)],
+        )
+
+    def test_report_view(self):
+        self.client.login(username="boss", password="pw")
+
+        response = self.client.get(reverse("payroll_report"), {"month": "2025-03", "top": "2"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["month"], "2025-03")
+        self.assertEqual([row["employee"] for row in response.json()["top"]], ["sal1", "eng1"])
+
+    def test_top_is_clamped(self):
+        self.client.login(username="boss", password="pw")
+
+        for top in ("-1", "0"):
+            with self.subTest(top=top):
+                response = self.client.get(reverse("payroll_report"), {"month": "2025-03", "top": top})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.json()["top"]), 1)
+        self.assertEqual(self.client.get(reverse("payroll_report"), {"top": "many"}).status_code, 400)
+        self.assertEqual(self.client.get(reverse("payroll_report"), {"month": "March"}).status_code, 400)
+
+    def test_admin_only(self):
+        make_employee("ana")
+        self.client.login(username="ana", password="pw")
+
+        self.assertEqual(self.client.get(reverse("payroll_report")).status_code, 403)
@@ -0,0 +1,81 @@
+from datetime import date
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from employees.models import AttendanceMonthlySummary, LeaveRequest, Payroll, PayrollAdjustment
+from employees.payroll import PayrollError, run_payroll
+
+from .helpers import make_employee
+
+APRIL = date(2025, 4, 1)  # 30 days
+
+
+def _with_salary(username, salary):
+    profile = make_employee(username)
+    profile.salary = salary
+    profile.save()
+    return profile
+
+
+class RunPayrollTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.ana = _with_salary("ana", 3000)  # 100 a day
+        cls.ben = _with_salary("ben", 600)
+        for kind, amount in (("Bonus", 200), ("Bonus", 50), ("Deduction", 100)):
+            PayrollAdjustment.objects.create(employee=cls.ana, month=APRIL, kind=kind, amount=amount)
+        PayrollAdjustment.objects.create(employee=cls.ana, month=date(2025, 3, 1), kind="Bonus", amount=999)
+        PayrollAdjustment.objects.create(employee=cls.ben, month=APRIL, kind="Deduction", amount=5000)
+        # Two of its days fall in April
+        LeaveRequest.objects.create(
+            employee=cls.ana, leave_type="Unpaid", status="Approved",
+            start_date=date(2025, 3, 30), end_date=date(2025, 4, 2), reason="Move",
+        )
+        for leave_type, status in (("Unpaid", "Pending"), ("Annual", "Approved")):
+            LeaveRequest.objects.create(
+                employee=cls.ana, leave_type=leave_type, status=status,
+                start_date=date(2025, 4, 10), end_date=date(2025, 4, 11), reason="Rest",
+            )
+        AttendanceMonthlySummary.objects.create(employee=cls.ana, month=APRIL, present_days=20, absent_days=1)
+
+    def _payslips(self):
+        return {
+            row.employee_id: (row.base_salary, row.bonus, row.deductions, row.total_salary)
+            for row in Payroll.objects.filter(month=APRIL)
+        }
+
+    def test_adjustments_unpaid_leave_and_absences(self):
+        summary = run_payroll(APRIL, batch_size=1)
+
+        payslips = self._payslips()
+        # Deduction 100, plus 2 unpaid leave days and 1 absent day at 100 a day
+        self.assertEqual(payslips[self.ana.id], (3000, 250, 400, 2850))
+        # Deductions never take pay below zero
+        self.assertEqual(payslips[self.ben.id], (600, 0, 600, 0))
+        self.assertEqual(summary["employees"], 2)
+        self.assertEqual((summary["gross"], summary["deductions"], summary["net"]), (3850, 1000, 2850))
+
+    def test_refuses_to_run_twice_unless_replacing(self):
+        run_payroll(APRIL)
+        PayrollAdjustment.objects.create(employee=self.ben, month=APRIL, kind="Bonus", amount=1000)
+
+        with self.assertRaises(PayrollError):
+            run_payroll(APRIL)
+        run_payroll(APRIL, replace=True)
+
+        self.assertEqual(Payroll.objects.filter(month=APRIL).count(), 2)
+        self.assertEqual(self._payslips()[self.ben.id], (600, 1000, 1600, 0))
+
+    def test_selected_employees_only(self):
+        run_payroll(APRIL, employee_ids=[self.ben.id])
+
+        self.assertEqual(list(self._payslips()), [self.ben.id])
+
+    def test_command(self):
+        call_command("run_payroll", month="2025-04", stdout=StringIO())
+
+        self.assertEqual(len(self._payslips()), 2)
+        with self.assertRaises(CommandError):
+            call_command("run_payroll", month="April")
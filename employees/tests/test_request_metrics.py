@@ -0,0 +1,49 @@
+from datetime import date
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from employees import exports, request_metrics
+from employees.models import Attendance
+
+from .helpers import make_employee
+
+
+class RequestMetricsMiddlewareTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        make_employee("boss", role="Manager")
+        ana = make_employee("ana")
+        for day in range(1, 6):
+            row = Attendance.objects.create(employee=ana, status="Present")
+            Attendance.objects.filter(id=row.id).update(date=date(2025, 3, day))
+
+    def setUp(self):
+        patcher = mock.patch.object(request_metrics, "_stats", request_metrics.RequestStats(window=10))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client.login(username="boss", password="pw")
+
+    def _summary(self):
+        return request_metrics.get_request_stats().summary()
+
+    @override_settings(DEBUG=True)
+    def test_page_is_recorded_with_server_timing(self):
+        response = self.client.get(reverse("attendance_report"))
+
+        self.assertIn('queries"', response["Server-Timing"])
+        self.assertEqual(self._summary()["attendance_report"]["requests"], 1)
+
+    def test_streamed_export_is_recorded_once_the_body_is_sent(self):
+        with mock.patch.object(exports, "CHUNK_SIZE", 2):
+            response = self.client.get(reverse("export_data", args=["attendance"]))
+            self.assertNotIn("export_data", self._summary())
+
+            b"".join(response.streaming_content)
+            response.close()
+
+        summary = self._summary()["export_data"]
+        self.assertEqual(summary["requests"], 1)
+        # Session and user, then the rows in three chunks
+        self.assertEqual(summary["queries"]["p50"], 5)
@@ -0,0 +1,100 @@
+from datetime import date, datetime, time, timedelta
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from employees import time_tracking
+from employees.models import Attendance
+from employees.time_tracking import ClockError, clock_in, clock_out, clock_record, today_status
+
+from .helpers import make_employee
+
+# Attendance.date is auto_now_add (the server's date), so "now" is a time on that day
+TODAY = date.today()
+YESTERDAY = TODAY - timedelta(days=1)
+
+
+def _at(hour, minute=0):
+    return timezone.make_aware(datetime.combine(TODAY, time(hour, minute)))
+
+
+class ClockTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.employee = make_employee("ana", department="Ops")
+
+    def at(self, hour, minute=0):
+        return mock.patch.object(time_tracking.timezone, "localtime", return_value=_at(hour, minute))
+
+    def clock_in(self):
+        return clock_in(self.employee.id, "Ops")
+
+    def clock_out(self):
+        return clock_out(self.employee.id, "Ops")
+
+    def open_yesterday(self, hour):
+        """Yesterday's row, clocked in at `hour` and never clocked out."""
+        row = Attendance.objects.create(employee=self.employee, status="Present")
+        Attendance.objects.filter(id=row.id).update(
+            date=YESTERDAY, sessions=[[hour * 3600, None]], check_in=time(hour)
+        )
+        return Attendance.objects.get(id=row.id)
+
+    def test_sessions_add_up_over_the_day(self):
+        with self.at(9):
+            self.clock_in()
+        with self.at(12, 30):
+            self.clock_out()
+        with self.at(13):
+            self.clock_in()
+            with self.assertRaisesMessage(ClockError, "clocked in since 13:00"):
+                self.clock_in()
+        with self.at(14):
+            record = self.clock_out()
+            with self.assertRaisesMessage(ClockError, "not clocked in"):
+                self.clock_out()
+
+        self.assertEqual(record.sessions, [[9 * 3600, 12 * 3600 + 1800], [13 * 3600, 14 * 3600]])
+        self.assertEqual((record.worked_seconds, record.check_in, record.check_out), (16200, time(9), time(14)))
+        self.assertEqual(Attendance.objects.get(id=record.id).status, "Present")
+
+    def test_night_shift_is_split_at_midnight(self):
+        earlier = self.open_yesterday(22)
+
+        with self.at(1):
+            self.assertEqual(today_status(clock_record([earlier]))["worked_today_seconds"], 3600)
+            with self.assertRaisesMessage(ClockError, "clocked in since"):
+                self.clock_in()
+        with self.at(2):
+            today = self.clock_out()
+
+        earlier.refresh_from_db()
+        self.assertEqual((earlier.sessions, earlier.worked_seconds), ([[22 * 3600, 24 * 3600]], 7200))
+        self.assertEqual(earlier.check_out, time(23, 59, 59))
+        self.assertEqual(today.date, TODAY)
+        self.assertEqual((today.sessions, today.worked_seconds, today.check_in), ([[0, 7200]], 7200, time(0)))
+
+    def test_forgotten_session_is_closed_with_no_time(self):
+        earlier = self.open_yesterday(8)
+
+        with self.at(10):  # 26 hours later
+            with self.assertRaisesMessage(ClockError, "never clocked out"):
+                self.clock_out()
+            earlier.refresh_from_db()
+            self.assertEqual((earlier.sessions, earlier.worked_seconds), ([[8 * 3600, 8 * 3600]], 0))
+            self.assertFalse(today_status(clock_record([earlier]))["is_clocked_in"])
+
+            record = self.clock_in()
+
+        self.assertEqual((record.date, record.sessions), (TODAY, [[10 * 3600, None]]))
+
+    def test_clock_in_closes_a_forgotten_session(self):
+        earlier = self.open_yesterday(8)
+
+        with self.at(10):
+            self.clock_in()
+
+        earlier.refresh_from_db()
+        self.assertFalse(earlier.is_clocked_in)
+        self.assertEqual(earlier.worked_seconds, 0)
@@ -0,0 +1,224 @@
+from datetime import time, timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .attendance_summary import record_attendance
+from .models import Attendance, EmployeeProfile
+
+
+SECONDS_PER_DAY = 24 * 3600
+# A session open longer than this was forgotten rather than worked
+DEFAULT_MAX_SESSION_HOURS = 16
+
+
+class ClockError(Exception):
+    """Raised with a message that is safe to show to the employee."""
+
+
+def _seconds(moment):
+    return moment.hour * 3600 + moment.minute * 60 + moment.second
+
+
+def _as_time(seconds):
+    return time(seconds // 3600, seconds % 3600 // 60, seconds % 60)
+
+
+def mark_present(employee_id, department):
+    """
+    Creates today's Present row with a single INSERT and counts it in the
+    rollups. Returns False if the employee had already been marked: the
+    (employee, date) unique constraint rejects the second row. Raises
+    EmployeeProfile.DoesNotExist if the INSERT failed because the profile
+    is gone (a stale id remembered in the session).
+    """
+    try:
+        with transaction.atomic():
+            record = Attendance.objects.create(employee_id=employee_id, status="Present")
+            record_attendance(employee_id, department, record.date, record.status)
+        return True
+    except IntegrityError:
+        # The same error covers the unique constraint and the foreign key
+        if EmployeeProfile.objects.filter(id=employee_id).first() is None:
+            raise EmployeeProfile.DoesNotExist(f"No employee profile with id {employee_id}.")
+        return False
+
+
+def _todays_row(employee_id, today):
+    # The unique (employee, date) index makes this a single-row lookup
+    return Attendance.objects.select_for_update().get(employee_id=employee_id, date=today)
+
+
+def _open_earlier_row(employee_id, today):
+    """
+    The last row before today if its session was never closed, else None.
+    Newest first on the (employee, date) index, so this reads one row.
+    """
+    record = (
+        Attendance.objects.select_for_update().filter(employee_id=employee_id, date__lte=today).order_by("-date").first()
+    )
+    if record is None or record.date == today or not record.is_clocked_in:
+        return None
+    return record
+
+
+def _max_session_seconds():
+    return getattr(settings, "ATTENDANCE_MAX_SESSION_HOURS", DEFAULT_MAX_SESSION_HOURS) * 3600
+
+
+def _elapsed_seconds(record, now):
+    """How long the open session of `record` has been running at `now`, across midnight."""
+    return (now.date() - record.date).days * SECONDS_PER_DAY + _seconds(now) - record.sessions[-1][0]
+
+
+def _carries_over(record, now):
+    """
+    True if `record` is an earlier day's row whose session is still being
+    worked (e.g. a night shift). One open for longer than
+    ATTENDANCE_MAX_SESSION_HOURS was forgotten, not worked.
+    """
+    return (
+        record is not None and record.is_clocked_in and record.date < now.date()
+        and _elapsed_seconds(record, now) <= _max_session_seconds()
+    )
+
+
+def _close_session(record, end):
+    """Closes the open session of `record` at `end` seconds after its midnight, at most 24:00."""
+    start = record.sessions[-1][0]
+    end = max(end, start)
+    record.sessions[-1][1] = end
+    record.worked_seconds += end - start
+    record.check_out = _as_time(min(end, SECONDS_PER_DAY - 1))
+    record.save(update_fields=["sessions", "worked_seconds", "check_out"])
+
+
+def _close_forgotten(record):
+    # Closed where it started: no time is counted that nobody can vouch for
+    _close_session(record, record.sessions[-1][0])
+
+
+def clock_in(employee_id, department):
+    """
+    Opens a work session on today's row, marking the employee present first
+    if needed. A forgotten session on an earlier day is closed first.
+    """
+    now = timezone.localtime()
+    with transaction.atomic():
+        earlier = _open_earlier_row(employee_id, now.date())
+        if earlier is not None and not _carries_over(earlier, now):
+            _close_forgotten(earlier)
+            earlier = None
+    if earlier is not None:
+        raise ClockError(
+            f"You have been clocked in since {earlier.date:%b %d} {_as_time(earlier.sessions[-1][0]):%H:%M}."
+        )
+
+    mark_present(employee_id, department)
+    with transaction.atomic():
+        record = _todays_row(employee_id, now.date())
+        if record.is_clocked_in:
+            raise ClockError(f"You have been clocked in since {_as_time(record.sessions[-1][0]):%H:%M}.")
+        record.sessions.append([_seconds(now), None])
+        if record.check_in is None:
+            record.check_in = now.time().replace(microsecond=0)
+        record.save(update_fields=["sessions", "check_in"])
+    return record
+
+
+def clock_out(employee_id, department):
+    """
+    Closes the open session and adds it to the day's worked time. A session
+    opened before midnight is split there: the earlier day's row gets the
+    time up to midnight and today's row, marked present if needed, the rest.
+    """
+    now = timezone.localtime()
+    with transaction.atomic():
+        earlier = _open_earlier_row(employee_id, now.date())
+        if earlier is None:
+            try:
+                record = _todays_row(employee_id, now.date())
+            except Attendance.DoesNotExist:
+                record = None
+            if record is None or not record.is_clocked_in:
+                raise ClockError("You are not clocked in.")
+            _close_session(record, _seconds(now))
+            return record
+
+        if _carries_over(earlier, now):
+            _close_session(earlier, SECONDS_PER_DAY)
+            mark_present(employee_id, department)
+            record = _todays_row(employee_id, now.date())
+            record.sessions.append([0, None])
+            if record.check_in is None:
+                record.check_in = time(0)
+            record.save(update_fields=["sessions", "check_in"])
+            _close_session(record, _seconds(now))
+            return record
+
+        _close_forgotten(earlier)
+    # Raised once the forgotten session is committed closed
+    raise ClockError(
+        f"Your session from {earlier.date:%b %d} was never clocked out, so it has been closed with no time "
+        "counted. Ask your manager to correct it."
+    )
+
+
+def open_session_seconds(record, now=None):
+    """Seconds worked so far in the session that is still open, 0 when clocked out."""
+    if record is None or not record.is_clocked_in:
+        return 0
+    now = now or timezone.localtime()
+    if record.date != now.date() and not _carries_over(record, now):
+        return 0
+    return max(_elapsed_seconds(record, now), 0)
+
+
+def clock_record(records, now=None):
+    """
+    The row the dashboard shows the clock for, from the newest-first
+    `records`: today's, or an earlier day's whose session is still open.
+    """
+    now = now or timezone.localtime()
+    todays = next((record for record in records[:1] if record.date == now.date()), None)
+    earlier = next((record for record in records if record.date < now.date()), None)
+    if _carries_over(earlier, now):
+        return earlier
+    return todays
+
+
+def today_status(record, now=None):
+    """Dashboard state from the row clock_record() picked alone: no scan of earlier days."""
+    now = now or timezone.localtime()
+    clocked_in = record is not None and record.is_clocked_in
+    if record is not None and record.date != now.date():
+        # Clocked in since before midnight: only the time after it counts for today
+        worked_today = min(open_session_seconds(record, now), _seconds(now))
+    else:
+        worked_today = (record.worked_seconds if record else 0) + open_session_seconds(record, now)
+    return {
+        "is_clocked_in": clocked_in,
+        "clock_in_time": _as_time(record.sessions[-1][0]) if clocked_in else None,
+        "worked_today_seconds": worked_today,
+    }
+
+
+def week_records(employee_id, today=None):
+    """This week's rows, Monday to `today`, from one range query on the (employee, date) index."""
+    today = today or timezone.localdate()
+    monday = today - timedelta(days=today.weekday())
+    return list(Attendance.objects.filter(employee_id=employee_id, date__gte=monday, date__lte=today).only(
+        "date", "sessions", "worked_seconds"
+    ))
+
+
+def hours_worked(records, now=None):
+    """Hours in `records`; a session still open today counts up to now."""
+    now = now or timezone.localtime()
+    return round(sum(record.worked_seconds + open_session_seconds(record, now) for record in records) / 3600, 2)
+
+
+def weekly_hours(employee_id, today=None):
+    """Hours worked Monday to `today`."""
+    return hours_worked(week_records(employee_id, today))
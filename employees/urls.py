@@ -4,20 +4,34 @@ from . import views
 urlpatterns = [
     path('', views.home, name='home'),
     path('dashboard/', views.dashboard, name='dashboard'),
+    path('dashboard/cache-stats/', views.dashboard_cache_stats, name='dashboard_cache_stats'),
+    path('metrics/requests/', views.request_metrics, name='request_metrics'),
+    path('health/ready/', views.readiness, name='readiness'),
     path('employees/', views.employee_list, name='employee_list'),
     path('employees/add/', views.add_employee, name='add_employee'),
+    path('employees/import/', views.import_employees_view, name='import_employees'),
+    path('employees/search/', views.employee_search, name='employee_search'),
     path('employees/edit/<int:id>/', views.edit_employee, name='edit_employee'),
     path('employees/delete/<int:id>/', views.delete_employee, name='delete_employee'),
     path('attendance/mark/', views.mark_attendance, name='mark_attendance'),
+    path('attendance/clock-in/', views.clock_in_view, name='clock_in'),
+    path('attendance/clock-out/', views.clock_out_view, name='clock_out'),
     path('attendance/report/', views.attendance_report, name='attendance_report'),
     
     path('resume/screening/', views.resume_screening, name='resume_screening'),
+    path('resume/jobs/<int:job_id>/status/', views.resume_job_status, name='resume_job_status'),
     path("chatbot/", views.hr_assistant_view, name="hr_chatbot"),
+    path("chatbot/cache-stats/", views.hr_assistant_cache_stats, name="hr_chatbot_cache_stats"),
      
     path("leave/apply/", views.apply_leave, name="apply_leave"),
     path("leave/my/", views.my_leave_requests, name="my_leave_requests"),
+    path("leave/withdraw/<int:leave_id>/", views.withdraw_leave, name="withdraw_leave"),
+    path("leave/coverage/", views.leave_coverage, name="leave_coverage"),
     path("leave/manage/", views.manage_leave_requests, name="manage_leave_requests"),
     path("leave/update/<int:leave_id>/<str:status>/", views.update_leave_status, name="update_leave_status"),
+    path("leave/bulk-update/", views.bulk_update_leave_status, name="bulk_update_leave_status"),
+    path("payroll/report/", views.payroll_report, name="payroll_report"),
+    path("exports/<str:dataset>/", views.export_data, name="export_data"),
     
     
 
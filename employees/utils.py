@@ -1,8 +1,113 @@
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
 import PyPDF2
 
-def extract_text_from_pdf(file):
+# Defaults used when the matching RESUME_* setting is not configured
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024
+DEFAULT_MAX_PAGES = 30
+DEFAULT_MAX_CHARS = 20000
+DEFAULT_PARALLEL_PAGE_THRESHOLD = 16
+PAGES_PER_TASK = 4
+
+
+class PDFTooLargeError(ValueError):
+    pass
+
+
+def _setting(name, default):
+    # Imported lazily: this module also runs inside spawned extraction processes
+    from django.conf import settings
+    return getattr(settings, name, default)
+
+
+def check_pdf_size(size, max_bytes=None):
+    max_bytes = max_bytes or _setting("RESUME_MAX_BYTES", DEFAULT_MAX_BYTES)
+    if size > max_bytes:
+        raise PDFTooLargeError(
+            f"This PDF is {size // 1024} KB; resumes larger than {max_bytes // 1024} KB are not accepted."
+        )
+
+
+def iter_pdf_pages(file, max_pages=None):
+    """Yields the text of each page in turn, stopping after max_pages."""
     reader = PyPDF2.PdfReader(file)
-    text = ""
-    for page in reader.pages:
-        text += page.extract_text() or ""
-    return text
+    for number, page in enumerate(reader.pages):
+        if max_pages is not None and number >= max_pages:
+            break
+        yield page.extract_text() or ""
+
+
+def _extract_page_range(data, start, stop):
+    # Runs in a worker process: re-open the document and read only its share of pages
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    return [(reader.pages[i].extract_text() or "") for i in range(start, stop)]
+
+
+_process_pool = None
+
+
+def _get_process_pool(processes):
+    global _process_pool
+    if _process_pool is None:
+        # spawn, not fork: the web worker may already be running threads
+        _process_pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+    return _process_pool
+
+
+def _iter_pages_parallel(data, page_count, processes):
+    pool = _get_process_pool(processes)
+    futures = [
+        pool.submit(_extract_page_range, data, start, min(start + PAGES_PER_TASK, page_count))
+        for start in range(0, page_count, PAGES_PER_TASK)
+    ]
+    try:
+        for future in futures:
+            yield from future.result()
+    finally:
+        # Early exit: drop the page ranges nobody is going to read
+        for future in futures:
+            future.cancel()
+
+
+def extract_text_from_pdf(file, max_pages=None, max_bytes=None, max_chars=None):
+    """
+    Extracts the text of a PDF, reading pages one at a time and joining them once.
+
+    Only the first max_pages pages are read, files over max_bytes are rejected
+    with PDFTooLargeError, and extraction stops as soon as max_chars of text
+    have been collected, which is already more than the scorer looks at.
+    Long documents are split across a process pool when RESUME_PDF_PROCESSES
+    is set.
+    """
+    max_pages = max_pages or _setting("RESUME_MAX_PAGES", DEFAULT_MAX_PAGES)
+    max_chars = max_chars or _setting("RESUME_TEXT_MAX_CHARS", DEFAULT_MAX_CHARS)
+
+    file.seek(0, io.SEEK_END)
+    check_pdf_size(file.tell(), max_bytes)
+    file.seek(0)
+
+    processes = _setting("RESUME_PDF_PROCESSES", 0)
+    pages = None
+    if processes:
+        data = file.read()
+        page_count = min(len(PyPDF2.PdfReader(io.BytesIO(data)).pages), max_pages)
+        if page_count >= _setting("RESUME_PARALLEL_PAGE_THRESHOLD", DEFAULT_PARALLEL_PAGE_THRESHOLD):
+            pages = _iter_pages_parallel(data, page_count, processes)
+        else:
+            file = io.BytesIO(data)
+    if pages is None:
+        pages = iter_pdf_pages(file, max_pages)
+
+    parts = []
+    collected = 0
+    try:
+        for text in pages:
+            parts.append(text)
+            collected += len(text)
+            if collected >= max_chars:
+                break
+    finally:
+        pages.close()
+    return "".join(parts)[:max_chars]
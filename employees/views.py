@@ -1,14 +1,22 @@
 from django.utils.timezone import now
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponseForbidden
-from .models import EmployeeProfile, Attendance, Payroll
-from .forms import EmployeeForm, ResumeUploadForm
-from .utils import extract_text_from_pdf
-from .ai import analyze_resume
-from datetime import date  
+from django.http import Http404, HttpResponseForbidden, JsonResponse
+from django.urls import reverse
+from .models import EmployeeProfile, Attendance, Payroll, BackgroundJob
+from .forms import EmployeeForm, ResumeUploadForm, AttendanceFilterForm, EmployeeImportForm
+from .importer import enqueue_import
+from .pagination import keyset_paginate
+from .utils import PDFTooLargeError
+from .screening import enqueue_screening, job_context, ScreeningError
+from datetime import date, timedelta
+from django.db import transaction
+from django.db.models import Count, Q
+from django.views.decorators.http import require_POST
 from django.contrib import messages
 from .ai_chatbot import ask_question
+from .answer_cache import get_answer_cache
+from .warmup import model_status
 import json
 # -------------------
 # Role-based decorator
@@ -28,37 +36,149 @@ def role_required(allowed_roles=[]):
 # -------------------
 def home(request):
     return render(request, 'home.html')
+
+
+def readiness(request):
+    # Used by the load balancer / platform health check, so no login required
+    status = model_status()
+    return JsonResponse(status, status=200 if status["ready"] else 503)
 from .models import EmployeeProfile, LeaveRequest
+from .attendance_summary import attendance_rate, daily_presence, present_on, record_attendance
+from .leave_ledger import leave_balance, overlapping
+from .exports import attendance_rows, csv_response, leave_rows, payroll_rows, xlsx_response
+from .payroll import PayrollError, department_report, month_label, parse_month, top_earners
+from .time_tracking import (
+    ClockError, clock_in, clock_out, clock_record, hours_worked, mark_present, today_status,
+)
+from . import dashboard_cache
+from .request_metrics import get_request_stats
+from .directory import DEFAULT_TYPEAHEAD_LIMIT, MAX_TYPEAHEAD_LIMIT, directory_page, search_terms, typeahead
+
+def _workforce_stats(today):
+    # A few rollup rows and two indexed counts instead of aggregating raw attendance
+    return {
+        "total_employees": EmployeeProfile.objects.count(),
+        "present_today": present_on(today),
+        "on_leave_today": overlapping(LeaveRequest.objects.filter(status="Approved"), today, today)
+        .aggregate(n=Count("employee", distinct=True))["n"],
+        "pending_requests_count": LeaveRequest.objects.filter(status="Pending").count(),
+    }
+
+
+def _cached_workforce_stats(today):
+    return dashboard_cache.cached_fragment(
+        "workforce", [today],
+        [dashboard_cache.LEAVE, dashboard_cache.ATTENDANCE, dashboard_cache.PROFILES],
+        lambda: _workforce_stats(today),
+    )
+
+
+def _cached_pending_leaves(role):
+    return dashboard_cache.cached_fragment(
+        "pending_leaves", [role], [dashboard_cache.LEAVE, dashboard_cache.PROFILES],
+        lambda: list(LeaveRequest.objects.filter(status="Pending").select_related("employee__user")[:5]),
+    )
+
+
+def _attendance_chart(today):
+    week = [today - timedelta(days=offset) for offset in range(6, -1, -1)]
+    presence = daily_presence(week[0], today)
+    return {
+        "labels": [day.strftime("%a") for day in week],
+        "present": [presence.get(day, 0) for day in week],
+    }
+
+
+def _employee_overview(employee_id, today):
+    profile = EmployeeProfile.objects.select_related("user").get(id=employee_id)
+    annual = leave_balance(profile, today.year)["Annual"]
+    return {
+        "profile": profile,
+        "attendance_rate": attendance_rate(profile, today.year),
+        "leave_taken": annual["used"],
+        "leave_remaining": annual["remaining"],
+    }
+
+
+def _employee_attendance(employee_id, today):
+    """
+    The clock and this week's hours, read live on every visit rather than
+    from the dashboard cache, so a clock-in shows straight away whichever
+    process served it. One seek on the (employee, date, id) index: the
+    seven newest rows hold today's, a session carried over from yesterday
+    and every day of this week.
+    """
+    recent_records = list(Attendance.objects.filter(employee_id=employee_id).order_by("-date", "-id")[:7])
+    monday = today - timedelta(days=today.weekday())
+    this_week = [record for record in recent_records if monday <= record.date <= today]
+    return {
+        "recent_records": recent_records,
+        "hours_this_week": hours_worked(this_week),
+        **today_status(clock_record(recent_records)),
+    }
+
 
 @login_required
 def dashboard(request):
+    # Everything but an employee's own attendance comes from the dashboard cache; see employees/signals.py
     role = request.user.role
+    today = now().date()
 
     if role == 'Admin':
         # show all pending leave requests
-        pending_leaves = LeaveRequest.objects.filter(status="Pending")[:5]
+        pending_leaves = _cached_pending_leaves(role)
         return render(request, 'employees/dashboards/admin_dash.html', {
-            "pending_leaves": pending_leaves
+            "pending_leaves": pending_leaves,
+            "pending_requests": pending_leaves,
+            **_cached_workforce_stats(today),
         })
 
     elif role == 'Manager':
         # show only pending requests for manager’s department/team (basic: all pending)
-        pending_leaves = LeaveRequest.objects.filter(status="Pending")[:5]
         return render(request, 'employees/dashboards/manager_dash.html', {
-            "pending_leaves": pending_leaves
+            "pending_leaves": _cached_pending_leaves(role),
+            "attendance_chart": dashboard_cache.cached_fragment(
+                "attendance_chart", [today], [dashboard_cache.ATTENDANCE], lambda: _attendance_chart(today),
+            ),
+            **_cached_workforce_stats(today),
         })
 
     elif role == 'Recruiter':
         return render(request, 'employees/dashboards/recruiter_dash.html')
 
     else:  # Employee
+        employee = _session_employee(request)
+        if employee is None:
+            return redirect('employee_list')
+        employee_id, department = employee
         try:
-            profile = EmployeeProfile.objects.get(user=request.user)
-            return render(request, 'employees/dashboards/employee_dash.html', {
-                "profile": profile
-            })
+            overview = dashboard_cache.cached_fragment(
+                "employee", [department or "", employee_id, today], [dashboard_cache.employee_tag(employee_id)],
+                lambda: _employee_overview(employee_id, today),
+            )
         except EmployeeProfile.DoesNotExist:
+            # The profile was deleted after it was remembered in the session
+            request.session.pop("employee_profile", None)
             return redirect('employee_list')
+        return render(request, 'employees/dashboards/employee_dash.html', {
+            **overview,
+            **_employee_attendance(employee_id, today),
+            "today": today,
+        })
+
+
+@login_required
+@role_required(['Admin'])
+def dashboard_cache_stats(request):
+    # Counters are per worker process
+    return JsonResponse(dashboard_cache.stats())
+
+
+@login_required
+@role_required(['Admin'])
+def request_metrics(request):
+    # Rolling percentiles per URL name, for this worker process
+    return JsonResponse(get_request_stats().summary())
 
 
 # -------------------
@@ -67,8 +187,25 @@ def dashboard(request):
 @login_required
 @role_required(['Admin', 'Manager'])
 def employee_list(request):
-    employees = EmployeeProfile.objects.all()
-    return render(request, "employees/employee_list.html", {"employees": employees})
+    query = request.GET.get("q", "").strip()
+    page = directory_page(query, after=request.GET.get("after"), before=request.GET.get("before"))
+    return render(request, "employees/employee_list.html", {
+        "employees": page,
+        "page": page,
+        "query": query,
+        "query_too_short": bool(query) and not search_terms(query),
+    })
+
+
+@login_required
+@role_required(['Admin', 'Manager'])
+def employee_search(request):
+    # Typeahead for the directory search box
+    try:
+        limit = min(int(request.GET.get("limit", DEFAULT_TYPEAHEAD_LIMIT)), MAX_TYPEAHEAD_LIMIT)
+    except ValueError:
+        return JsonResponse({"error": "limit must be a number."}, status=400)
+    return JsonResponse({"results": typeahead(request.GET.get("q", ""), max(limit, 1))})
 
 @login_required
 @role_required(['Admin', 'Manager'])
@@ -82,6 +219,24 @@ def add_employee(request):
         form = EmployeeForm()
     return render(request, "employees/employee_form.html", {"form": form})
 
+@login_required
+@role_required(['Admin'])
+def import_employees_view(request):
+    # The rows are validated and inserted by a `run_jobs` worker; the page reloads until it is done
+    if request.method == "POST":
+        form = EmployeeImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            job = enqueue_import(request.user, form.cleaned_data["file"])
+            return redirect(f"{reverse('import_employees')}?job={job.id}")
+    else:
+        form = EmployeeImportForm()
+
+    job = None
+    job_id = request.GET.get("job")
+    if job_id and job_id.isdigit():
+        job = get_object_or_404(BackgroundJob, id=job_id, kind="employee_import", created_by=request.user)
+    return render(request, "employees/import_employees.html", {"form": form, "job": job})
+
 @login_required
 @role_required(['Admin', 'Manager'])
 def edit_employee(request, id):
@@ -105,20 +260,40 @@ def delete_employee(request, id):
 # -------------------
 # ATTENDANCE
 # -------------------
+def _session_employee(request):
+    """
+    (employee id, department) of the logged-in employee, looked up once per
+    login and then kept in the session so marking attendance needs no SELECT.
+    """
+    cached = request.session.get("employee_profile")
+    if cached is None:
+        profile = EmployeeProfile.objects.filter(user=request.user).values("id", "department").first()
+        if profile is None:
+            return None
+        cached = request.session["employee_profile"] = [profile["id"], profile["department"]]
+    return cached
+
+
 @login_required
 @role_required(['Employee'])
 def mark_attendance(request):
     if request.user.role != "Employee":
         return HttpResponseForbidden("Only employees can mark attendance.")
 
-    emp_profile = EmployeeProfile.objects.get(user=request.user)
-    today = now().date()
-
-    # Check if already marked
-    already_marked = Attendance.objects.filter(employee=emp_profile, date=today).exists()
-
-    if not already_marked:
-        Attendance.objects.create(employee=emp_profile, status="Present")
+    employee = _session_employee(request)
+    if employee is None:
+        return HttpResponseForbidden("No employee profile is linked to this account.")
+    employee_id, department = employee
+
+    # A single INSERT; the (employee, date) unique constraint turns a second
+    # mark, even a simultaneous double-click, into a no-op instead of a duplicate row
+    try:
+        marked = mark_present(employee_id, department)
+    except EmployeeProfile.DoesNotExist:
+        # The profile was deleted after it was remembered in the session; look it up again
+        request.session.pop("employee_profile", None)
+        return redirect("mark_attendance")
+    if marked:
         status_message = "✅ Attendance marked successfully for today!"
     else:
         status_message = "⚠️ You have already marked attendance today."
@@ -126,82 +301,121 @@ def mark_attendance(request):
     # Render to the new confirmation page
     return render(request, "employees/attendance_mark.html", {"message": status_message})
 
-        
 
 @login_required
-def attendance_report(request):
+@role_required(['Employee'])
+@require_POST
+def clock_in_view(request):
+    employee = _session_employee(request)
+    if employee is None:
+        return HttpResponseForbidden("No employee profile is linked to this account.")
+    try:
+        clock_in(*employee)
+        messages.success(request, "You are clocked in.")
+    except ClockError as e:
+        messages.warning(request, str(e))
+    except EmployeeProfile.DoesNotExist:
+        # The profile was deleted after it was remembered in the session
+        request.session.pop("employee_profile", None)
+        messages.warning(request, "Your employee profile has changed, please clock in again.")
+    return redirect("dashboard")
+
+
+@login_required
+@role_required(['Employee'])
+@require_POST
+def clock_out_view(request):
+    employee = _session_employee(request)
+    if employee is None:
+        return HttpResponseForbidden("No employee profile is linked to this account.")
+    try:
+        record = clock_out(*employee)
+        messages.success(request, f"You are clocked out. {record.worked_hours} hours worked today.")
+    except ClockError as e:
+        messages.warning(request, str(e))
+    return redirect("dashboard")
+
+
+ATTENDANCE_PAGE_SIZE = 50
+
+def _filtered_attendance(request, filters):
+    """Attendance the user may see, narrowed by the report filters; shared by the report and its export."""
     if request.user.role in ['Admin', 'Manager']:
-        records = Attendance.objects.select_related('employee','employee__user').all().order_by('-date')
+        records = Attendance.objects.select_related('employee','employee__user')
+        if filters.get("department"):
+            records = records.filter(employee__department=filters["department"])
     else:
         emp_pro = EmployeeProfile.objects.get(user=request.user)
-        records = Attendance.objects.filter(employee=emp_pro).order_by('-date') 
-    return render(request, "employees/attendance_report.html", {"records": records})
+        records = Attendance.objects.filter(employee=emp_pro)
+
+    if filters.get("start_date"):
+        records = records.filter(date__gte=filters["start_date"])
+    if filters.get("end_date"):
+        records = records.filter(date__lte=filters["end_date"])
+    if filters.get("status"):
+        records = records.filter(status=filters["status"])
+    return records
+
+
+@login_required
+def attendance_report(request):
+    filter_form = AttendanceFilterForm(request.GET or None)
+    filters = filter_form.cleaned_data if filter_form.is_valid() else {}
+    records = _filtered_attendance(request, filters)
+
+    page = keyset_paginate(
+        records,
+        ATTENDANCE_PAGE_SIZE,
+        after=request.GET.get("after"),
+        before=request.GET.get("before"),
+    )
+    return render(request, "employees/attendance_report.html", {
+        "records": page,
+        "page": page,
+        "filter_form": filter_form,
+    })
 
 
 
 # -------------------
 # AI RESUME SCREENING
 # -------------------
-# In your views.py
-import json # Make sure json is imported
-
 @login_required
 @role_required(['Recruiter'])
 def resume_screening(request):
     if request.method == 'POST':
-        resume_file = request.FILES.get('resume')
+        resume_files = request.FILES.getlist('resume')
         job_description = request.POST.get('job_description')
         
-        if not resume_file or not job_description:
+        if not resume_files or not job_description:
             return render(request, 'employees/resume_screening.html', {'error': 'Both a resume and job description are required.'})
 
+        # Parsing and scoring happen in a `run_jobs` worker; the page polls for the result
         try:
-            print("--- Step 1: Extracting text from PDF ---")
-            resume_text = extract_text_from_pdf(resume_file)
-            # Let's print the first 500 characters to confirm it worked
-            print(f"Resume Text (first 500 chars): {resume_text[:500]}")
-            
-            
-            ai_response_dict = analyze_resume(
-            resume_text=resume_text, 
-            job_description=job_description
-            )
-
-            # THIS IS THE MOST IMPORTANT PRINT STATEMENT
-            print(f"\n--- Step 3: Raw AI Response ---")
-            print(f"Response from analyze_resume: {ai_response_dict}")
-            print(f"Type of response: {type(ai_response_dict)}")
-            
-            analysis_result = None
-            if isinstance(ai_response_dict, dict):
-                analysis_result = ai_response_dict
-            elif isinstance(ai_response_dict, str) and ai_response_dict.strip():
-                # Added check to ensure string is not empty
-                try:
-                    analysis_result = json.loads(ai_response_dict)
-                except json.JSONDecodeError:
-                    print("!!! JSON DECODE ERROR: AI returned a string that is not valid JSON.")
-                    raise ValueError("AI response was a malformed string.")
-            else:
-                raise TypeError("AI response is not in a valid format (dictionary or non-empty JSON string).")
-
-            print("\n--- Step 4: Final analysis_result before rendering ---")
-            print(f"Final context['result']: {analysis_result}")
-            
-            context = {'result': analysis_result}
-            return render(request, 'employees/resume_screening.html', context)
-
-        except Exception as e:
-            # THIS IS THE SECOND MOST IMPORTANT PRINT STATEMENT
-            print(f"\n!!! --- An Exception was caught! --- !!!")
-            print(f"Error Type: {type(e)}")
-            print(f"Error Message: {e}")
-            
-            context = {'error': f'An unexpected error occurred. Please check the logs.'}
-            return render(request, 'employees/resume_screening.html', context)
+            job = enqueue_screening(request.user, job_description, resume_files)
+        except (ScreeningError, PDFTooLargeError) as e:
+            return render(request, 'employees/resume_screening.html', {'error': str(e)})
+        return redirect(f"{reverse('resume_screening')}?job={job.id}")
+
+    job_id = request.GET.get('job')
+    if job_id and job_id.isdigit():
+        job = get_object_or_404(BackgroundJob, id=job_id, kind="resume_screening", created_by=request.user)
+        return render(request, 'employees/resume_screening.html', job_context(job))
             
     return render(request, 'employees/resume_screening.html')
 
+
+@login_required
+@role_required(['Recruiter'])
+def resume_job_status(request, job_id):
+    job = get_object_or_404(BackgroundJob, id=job_id, kind="resume_screening", created_by=request.user)
+    return JsonResponse({
+        "id": job.id,
+        "status": job.status,
+        "finished": job.is_finished,
+        "error": job.error,
+    })
+
 # Don't forget your helper functions
 # def extract_text_from_pdf(pdf_file): ...
 # def analyze_resume(prompt): ...
@@ -222,10 +436,18 @@ def hr_assistant_view(request):
     return render(request, 'employees/hr_chatbot.html', context)
 
 
+@login_required
+@role_required(['Admin'])
+def hr_assistant_cache_stats(request):
+    # Counters are per worker process
+    return JsonResponse(get_answer_cache().stats())
+
+
 
 
 from .models import LeaveRequest
 from .forms import LeaveRequestForm
+from .leave_ledger import department_coverage, quarter_bounds
 from django.contrib.auth.decorators import login_required
 from django.http import HttpResponseForbidden
 
@@ -233,16 +455,20 @@ from django.http import HttpResponseForbidden
 @login_required
 @role_required(["Employee"])
 def apply_leave(request):
+    profile = get_object_or_404(EmployeeProfile, user=request.user)
     if request.method == "POST":
-        form = LeaveRequestForm(request.POST)
+        form = LeaveRequestForm(request.POST, employee=profile)
         if form.is_valid():
             leave = form.save(commit=False)
-            leave.employee = EmployeeProfile.objects.get(user=request.user)
+            leave.employee = profile
             leave.save()
             return redirect("my_leave_requests")
     else:
-        form = LeaveRequestForm()
-    return render(request, "employees/leave/apply_leave.html", {"form": form})
+        form = LeaveRequestForm(employee=profile)
+    return render(request, "employees/leave/apply_leave.html", {
+        "form": form,
+        "balance": leave_balance(profile),
+    })
 
 
 # Employee: View own leave requests
@@ -250,35 +476,290 @@ def apply_leave(request):
 @role_required(["Employee"])
 def my_leave_requests(request):
     leaves = LeaveRequest.objects.filter(employee__user=request.user).order_by("-created_at")
-    return render(request, "employees/leave/my_leave_requests.html", {"leaves": leaves})
+    counts = leaves.aggregate(
+        approved_count=Count("id", filter=Q(status="Approved")),
+        pending_count=Count("id", filter=Q(status="Pending")),
+        rejected_count=Count("id", filter=Q(status="Rejected")),
+    )
+    return render(request, "employees/leave/my_leave_requests.html", {"leaves": leaves, **counts})
+
+
+# Employee: Withdraw a request that has not been decided yet
+@login_required
+@role_required(["Employee"])
+@require_POST
+def withdraw_leave(request, leave_id):
+    leave = get_object_or_404(LeaveRequest, id=leave_id, employee__user=request.user)
+    if leave.status == "Pending":
+        leave.delete()
+        messages.success(request, "Your leave request was withdrawn.")
+    return redirect("my_leave_requests")
+
+
+# Manager/Admin: How many people in a department are off on each day
+LEAVE_COVERAGE_MAX_DAYS = 366
+
+@login_required
+@role_required(["Admin", "Manager"])
+def leave_coverage(request):
+    """
+    JSON day-by-day count of people on approved leave in one department.
+    Query string: department (required), start and end (YYYY-MM-DD, default
+    the current quarter), include_pending=1 to count pending requests too.
+    """
+    department = request.GET.get("department", "").strip()
+    if not department:
+        return JsonResponse({"error": "department is required."}, status=400)
+
+    start, end = quarter_bounds(now().date())
+    try:
+        if request.GET.get("start"):
+            start = date.fromisoformat(request.GET["start"])
+        if request.GET.get("end"):
+            end = date.fromisoformat(request.GET["end"])
+    except ValueError:
+        return JsonResponse({"error": "start and end must be dates (YYYY-MM-DD)."}, status=400)
+    if start > end:
+        return JsonResponse({"error": "start must be on or before end."}, status=400)
+    if (end - start).days >= LEAVE_COVERAGE_MAX_DAYS:
+        return JsonResponse({"error": f"At most {LEAVE_COVERAGE_MAX_DAYS} days can be requested at once."}, status=400)
+
+    coverage = department_coverage(department, start, end, include_pending=request.GET.get("include_pending") == "1")
+    return JsonResponse({
+        "department": department,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "peak": max(count for _, count in coverage),
+        "days": [{"date": day.isoformat(), "off": count} for day, count in coverage],
+    })
 
 
 # Manager/Admin: Approve/Reject leave
+LEAVE_CONSOLE_LIMIT = 50
+LEAVE_SIDEBAR_LIMIT = 10
+
 @login_required
 @role_required(["Admin", "Manager"])
 def manage_leave_requests(request):
-    leaves = LeaveRequest.objects.filter(status="Pending").order_by("-created_at")
-    return render(request, "employees/leave/manage_leave_requests.html", {"leaves": leaves})
+    today = now().date()
+    next_week = today + timedelta(days=7)
+    approved_this_week = Q(status="Approved", start_date__lte=next_week, end_date__gte=today)
+
+    # All three KPI counts in one query, limited to rows that can match one of them
+    leave_counts = LeaveRequest.objects.filter(Q(status="Pending") | approved_this_week).aggregate(
+        pending=Count("id", filter=Q(status="Pending")),
+        today=Count("id", filter=Q(status="Approved", start_date__lte=today, end_date__gte=today)),
+        upcoming=Count("id", filter=Q(status="Approved", start_date__gt=today, start_date__lte=next_week)),
+    )
+
+    leaves = LeaveRequest.objects.select_related("employee", "employee__user")
+    context = {
+        "leave_counts": leave_counts,
+        "pending_leaves": leaves.filter(status="Pending").order_by("start_date", "id")[:LEAVE_CONSOLE_LIMIT],
+        "leaves_today": leaves.filter(
+            status="Approved", start_date__lte=today, end_date__gte=today
+        ).order_by("end_date", "id")[:LEAVE_SIDEBAR_LIMIT],
+        "upcoming_leaves": leaves.filter(
+            status="Approved", start_date__gt=today, start_date__lte=next_week
+        ).order_by("start_date", "id")[:LEAVE_SIDEBAR_LIMIT],
+    }
+    return render(request, "employees/leave/manage_leave_requests.html", context)
 
 
 @login_required
 @role_required(["Admin", "Manager"])
+@require_POST
 def update_leave_status(request, leave_id, status):
     # Only Admin/Manager can approve/reject
     if request.user.role not in ["Admin", "Manager"]:
         return HttpResponseForbidden("You cannot perform this action.")
+    if status not in ("Approved", "Rejected"):
+        messages.error(request, "status must be Approved or Rejected.")
+        return redirect("manage_leave_requests")
+
+    # The bulk action's rules: only a Pending request is decided, and only once. Its days were
+    # checked for overlaps and against the balance when it was submitted and have been held since.
+    outcome = _bulk_set_leave_status([leave_id], status)[leave_id]
+    if outcome == "not_found":
+        raise Http404("No such leave request.")
+    if outcome == "updated":
+        messages.success(request, f"Leave request {status.lower()}.")
+    else:
+        messages.warning(request, f"That leave request was already {outcome.removeprefix('already_')}.")
+    return redirect("manage_leave_requests")
+
+
+LEAVE_BULK_MAX_IDS = 1000
+
+def _bulk_set_leave_status(ids, status):
+    """
+    Moves every Pending request in `ids` to `status` with a single
+    UPDATE ... WHERE id IN (...) AND status = 'Pending', inside one transaction.
+    Returns {id: outcome} for every requested id.
+    """
+    with transaction.atomic():
+        # Lock the rows so the statuses read here are the ones the UPDATE sees
+        rows = list(LeaveRequest.objects.select_for_update().filter(id__in=ids).values_list("id", "status", "employee_id"))
+        current = {leave_id: current_status for leave_id, current_status, _ in rows}
+        LeaveRequest.objects.filter(id__in=ids, status="Pending").update(status=status)
+        # update() sends no post_save, so tell the dashboard cache directly
+        changed = {employee_id for _, current_status, employee_id in rows if current_status == "Pending"}
+        if changed:
+            dashboard_cache.invalidate_on_commit(
+                dashboard_cache.LEAVE, *(dashboard_cache.employee_tag(employee_id) for employee_id in changed)
+            )
 
-    leave = get_object_or_404(LeaveRequest, id=leave_id)
-
-    if status in ["Approved", "Rejected"]:
-        leave.status = status
-        leave.save()
+    results = {}
+    for leave_id in ids:
+        if leave_id not in current:
+            results[leave_id] = "not_found"
+        elif current[leave_id] == "Pending":
+            results[leave_id] = "updated"
+        else:
+            results[leave_id] = f"already_{current[leave_id].lower()}"
+    return results
 
-    return redirect("manage_leave_requests") 
 
 @login_required
 @role_required(["Admin", "Manager"])
-def manage_leave_requests(request):
-    leaves = LeaveRequest.objects.filter(status="Pending").order_by("-created_at")
-    return render(request, "employees/leave/manage_leave_requests.html", {"leaves": leaves})
+@require_POST
+def bulk_update_leave_status(request):
+    """
+    Approves or rejects many leave requests at once. Accepts a JSON body
+    {"ids": [...], "status": "Approved"} and answers with per-id results, or
+    the console's form post (ids + status), which redirects back to the console.
+    """
+    wants_json = request.content_type == "application/json"
+    try:
+        if wants_json:
+            data = json.loads(request.body or b"{}")
+            if not isinstance(data, dict):
+                return JsonResponse({"error": 'The body must be a JSON object: {"ids": [...], "status": ...}.'}, status=400)
+            raw_ids, status = data.get("ids", []), data.get("status")
+        else:
+            raw_ids, status = request.POST.getlist("ids"), request.POST.get("status")
+        ids = list(dict.fromkeys(int(leave_id) for leave_id in raw_ids))
+    except (ValueError, TypeError):
+        return JsonResponse({"error": "ids must be a list of integers."}, status=400)
+
+    error = None
+    if status not in ("Approved", "Rejected"):
+        error = "status must be Approved or Rejected."
+    elif not ids:
+        error = "No leave requests selected."
+    elif len(ids) > LEAVE_BULK_MAX_IDS:
+        error = f"At most {LEAVE_BULK_MAX_IDS} leave requests can be updated at once."
+
+    if error:
+        if wants_json:
+            return JsonResponse({"error": error}, status=400)
+        messages.error(request, error)
+        return redirect("manage_leave_requests")
+
+    results = _bulk_set_leave_status(ids, status)
+    updated = sum(1 for outcome in results.values() if outcome == "updated")
+
+    if wants_json:
+        return JsonResponse({"status": status, "updated": updated, "results": results})
+    skipped = len(ids) - updated
+    messages.success(
+        request,
+        f"{status} {updated} leave request{'s' if updated != 1 else ''}"
+        + (f"; {skipped} skipped because they were no longer pending." if skipped else "."),
+    )
+    return redirect("manage_leave_requests")
+
+
+
+# -------------------
+# PAYROLL REPORTS
+# -------------------
+PAYROLL_TOP_MAX = 500
+
+@login_required
+@role_required(["Admin"])
+def payroll_report(request):
+    """
+    JSON payroll figures for one month (?month=YYYY-MM, default the current
+    month): per-department count, total, mean, min, max, p50 and p90, plus the
+    ?top=N (default 50) highest totals.
+    """
+    try:
+        month = parse_month(request.GET["month"]) if request.GET.get("month") else now().date().replace(day=1)
+        top = max(1, min(int(request.GET.get("top", 50)), PAYROLL_TOP_MAX))
+        earners = [
+            {"employee": row.employee.user.username, "department": row.employee.department, "total_salary": row.total_salary}
+            for row in top_earners(month, top)
+        ]
+    except (PayrollError, ValueError) as e:
+        return JsonResponse({"error": str(e) if isinstance(e, PayrollError) else "top must be an integer."}, status=400)
+
+    return JsonResponse({
+        "month": month_label(month),
+        "departments": department_report(month),
+        "top": earners,
+    })
+
+
+# -------------------
+# EXPORTS
+# -------------------
+EXPORT_FORMATS = ("csv", "xlsx")
+
+@login_required
+def export_data(request, dataset):
+    """
+    Downloads attendance, leave or payroll as ?format=csv (streamed) or xlsx.
+    Attendance takes the report's filters; leave takes status/start_date/end_date;
+    payroll (Admin only) takes month=YYYY-MM.
+    """
+    fmt = request.GET.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        return JsonResponse({"error": "format must be csv or xlsx."}, status=400)
+    role = request.user.role
+    today = now().date()
+    # Admin and Manager export everybody's attendance and leave, anyone else only their own,
+    # which a user without an employee profile (a Recruiter) does not have
+    if (
+        dataset in ("attendance", "leave")
+        and role not in ["Admin", "Manager"]
+        and not EmployeeProfile.objects.filter(user=request.user).exists()
+    ):
+        return HttpResponseForbidden("You do not have permission to access this page.")
+
+    if dataset == "attendance":
+        filter_form = AttendanceFilterForm(request.GET)
+        if not filter_form.is_valid():
+            return JsonResponse({"error": filter_form.errors}, status=400)
+        header, rows = attendance_rows(_filtered_attendance(request, filter_form.cleaned_data))
+    elif dataset == "leave":
+        leaves = LeaveRequest.objects.all()
+        if role not in ["Admin", "Manager"]:
+            leaves = leaves.filter(employee__user=request.user)
+        try:
+            if request.GET.get("start_date"):
+                leaves = leaves.filter(end_date__gte=date.fromisoformat(request.GET["start_date"]))
+            if request.GET.get("end_date"):
+                leaves = leaves.filter(start_date__lte=date.fromisoformat(request.GET["end_date"]))
+        except ValueError:
+            return JsonResponse({"error": "start_date and end_date must be dates (YYYY-MM-DD)."}, status=400)
+        if request.GET.get("status"):
+            leaves = leaves.filter(status=request.GET["status"])
+        header, rows = leave_rows(leaves)
+    elif dataset == "payroll":
+        if role != "Admin":
+            return HttpResponseForbidden("You do not have permission to access this page.")
+        payroll = Payroll.objects.all()
+        if request.GET.get("month"):
+            try:
+                payroll = payroll.filter(month=parse_month(request.GET["month"]))
+            except PayrollError as e:
+                return JsonResponse({"error": str(e)}, status=400)
+        header, rows = payroll_rows(payroll)
+    else:
+        return JsonResponse({"error": f"Unknown export: {dataset}."}, status=404)
 
+    filename = f"{dataset}-{today:%Y%m%d}"
+    if fmt == "xlsx":
+        return xlsx_response(filename, header, rows)
+    return csv_response(filename, header, rows)
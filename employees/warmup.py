@@ -0,0 +1,68 @@
+import logging
+
+from django.conf import settings
+
+from . import ai_chatbot, knowledge_base
+from .embeddings import get_embedding_backend
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+_warmed_up = False
+
+
+def load_models():
+    """
+    Loads the embedding and QA model weights without running them.
+
+    Safe to call in the gunicorn master before workers are forked (see
+    gunicorn.conf.py): the weights are then shared copy-on-write by every
+    worker instead of being loaded once per worker.
+    """
+    get_embedding_backend().load()
+    if ai_chatbot.qa_pipeline is None:
+        ai_chatbot._initialize_pipeline()
+
+
+def warm_up_models():
+    """
+    Runs one inference through each model and loads the knowledge-base index,
+    so the first real question after a deploy does not pay for it.
+    Runs in each worker, after the fork.
+    """
+    global _warmed_up
+    load_models()
+    try:
+        get_embedding_backend().embed(["warm up"])
+        if ai_chatbot.qa_pipeline is not None:
+            ai_chatbot.qa_pipeline(question="When are salaries paid?", context="Salaries are paid on the 28th.")
+        knowledge_base.get_index()
+        _warmed_up = True
+        logger.info("✅ AI models warmed up.")
+    except Exception as e:
+        logger.error(f"⚠️ Model warm-up failed: {e}")
+
+
+def model_status():
+    backend = get_embedding_backend()
+    index = knowledge_base._index
+    status = {
+        "preload": getattr(settings, "AI_PRELOAD_MODELS", False),
+        "embedding_model": {
+            "backend": type(backend).__name__,
+            "loaded": backend.is_loaded,
+        },
+        "qa_model": {
+            "name": ai_chatbot.MODEL_NAME,
+            "loaded": ai_chatbot.qa_pipeline is not None,
+        },
+        "knowledge_base": {
+            "loaded": index is not None,
+            "passages": len(index) if index is not None else 0,
+            "version": index.version if index is not None else None,
+        },
+        "warmed_up": _warmed_up,
+    }
+    # Without preload the models load lazily on first use, so the worker is always ready
+    status["ready"] = _warmed_up or not status["preload"]
+    return status
@@ -0,0 +1,36 @@
+# Gunicorn configuration (see Procfile)
+#
+# With AI_PRELOAD_MODELS=True the app is imported in the master process and the
+# embedding and QA model weights are loaded there, before the workers are
+# forked. Workers then share those read-only weights copy-on-write, so adding
+# workers does not add another copy of the models to RSS. Each worker runs a
+# short warm-up inference after it boots.
+#
+# Threaded workers keep sending heartbeats to the master while a request
+# thread streams a long response (CSV exports), so big downloads are not
+# killed by the worker timeout the way they would be under sync workers.
+import gc
+
+from decouple import config
+
+preload_app = config("AI_PRELOAD_MODELS", default=False, cast=bool)
+worker_class = config("GUNICORN_WORKER_CLASS", default="gthread")
+threads = config("GUNICORN_THREADS", default=4, cast=int)
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from employees.warmup import load_models
+
+    load_models()
+    # Keep the garbage collector from touching (and so copying) the preloaded objects in every worker
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    if not preload_app:
+        return
+    from employees.warmup import warm_up_models
+
+    warm_up_models()